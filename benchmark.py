@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Lookup latency benchmark over the CLI, per query path.
+
+Queries come from the word lists in test_expected_results.py plus a
+seeded sample of the database, grouped by the path they take through
+query.Query:
+
+- en:        English glosses (pivot through definitions)
+- ja:        kana readings (Japanese direct)
+- pinyin via en fallback:
+             tone-marked or numbered pinyin. Latin letters without kana
+             or hanzi are detected as English, so its timings include
+             the gloss match that finds nothing (and, without tone
+             marks, the romaji lookup) before the pinyin lookup
+- ambiguous: kanji/hanzi headwords (both languages searched)
+
+Common words are answered from hot_results (see data/hot_results.py)
+instead of being looked up, so these paths run on `dict --no-hot`. A
+separate hot bucket times a sample of hot_results keys with the table in
+use.
+
+Each query is timed as one round trip on a single long-lived `dict --jsonl`
+process (see dict_client.py), after one untimed warm-up pass. Reports
+p50/p95/p99 and throughput per path. --save writes the results as a JSON
+baseline, and --baseline compares against one, exiting 1 when p50 or p95 of
+any path is more than --threshold slower.
+
+Usage:
+    python3 benchmark.py --save bench_baseline.json
+    python3 benchmark.py --baseline bench_baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dict_client import DICT_CLI, DictProcess
+from test_expected_results import CHINESE_TESTS, ENGLISH_TESTS, JAPANESE_TESTS
+
+DATABASE = Path(__file__).parent / "data/dictionary.db"
+
+# Bucket of pinyin queries, which reach the Chinese lookup only after the
+# English pass fails (see the module docstring)
+PINYIN = 'pinyin via en fallback'
+
+# Percentiles gated against the baseline (p99 is too noisy on short runs)
+GATED = ('p50', 'p95')
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def list_queries():
+    """Queries from the expected-results word lists, by path."""
+    return {
+        'en': [test['input'] for test in ENGLISH_TESTS],
+        'ja': [test['expected_reading'] for test in JAPANESE_TESTS],
+        PINYIN: [test['expected_pinyin'] for test in CHINESE_TESTS],
+        'ambiguous': [test['input'] for test in JAPANESE_TESTS + CHINESE_TESTS],
+    }
+
+
+def _sample(cursor, sql, count, rng):
+    """count values of sql's first column, picked with rng."""
+    cursor.execute(sql)
+    values = sorted({row[0] for row in cursor.fetchall() if row[0]})
+    return rng.sample(values, min(count, len(values)))
+
+
+def sample_queries(db_path, count, seed):
+    """Seeded sample of count queries per path from the database, plus
+    count hot_results keys as 'hot' (none before hot_results existed)."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+    queries = {
+        'en': _sample(cursor, '''
+            SELECT text FROM glosses
+            WHERE text NOT LIKE '%(%' AND text NOT LIKE '%;%' AND LENGTH(text) < 20
+        ''', count, rng),
+        'ja': _sample(cursor, 'SELECT reading FROM japanese_words WHERE is_common = 1', count, rng),
+        PINYIN: _sample(cursor, 'SELECT pinyin FROM chinese_words WHERE is_common = 1', count, rng),
+        'ambiguous': _sample(cursor, '''
+            SELECT simplified FROM chinese_words WHERE is_common = 1
+            UNION
+            SELECT headword FROM japanese_words
+            WHERE is_common = 1 AND headword = script_key
+        ''', count, rng),
+    }
+    try:
+        queries['hot'] = _sample(cursor, 'SELECT query_key FROM hot_results', count, rng)
+    except sqlite3.OperationalError:
+        queries['hot'] = []
+    conn.close()
+    return queries
+
+
+def run(process, queries):
+    """Time every query; returns {path: {count, errors, p50, p95, p99, mean, qps}} in ms."""
+    for words in queries.values():
+        for word in words:
+            process.query(word)
+
+    results = {}
+    for path, words in queries.items():
+        timings = []
+        errors = 0
+        started = time.perf_counter()
+        for word in words:
+            start = time.perf_counter()
+            response = process.query(word)
+            timings.append((time.perf_counter() - start) * 1000)
+            errors += response is None
+        elapsed = time.perf_counter() - started
+        if not timings:
+            continue
+        results[path] = {
+            'count': len(timings),
+            'errors': errors,
+            'p50': percentile(timings, 50),
+            'p95': percentile(timings, 95),
+            'p99': percentile(timings, 99),
+            'mean': statistics.mean(timings),
+            'qps': len(timings) / elapsed,
+        }
+    return results
+
+
+def print_results(results, baseline=None):
+    header = f"  {'path':<24}{'n':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'qps':>10}"
+    print(header + ('   vs baseline (p50/p95)' if baseline else ''))
+    for path, stats in results.items():
+        line = (f"  {path:<24}{stats['count']:>6}{stats['errors']:>5}{stats['p50']:>10.2f}"
+                f"{stats['p95']:>10.2f}{stats['p99']:>10.2f}{stats['qps']:>10.0f}")
+        if baseline and path in baseline:
+            deltas = [f"{(stats[key] / baseline[path][key] - 1) * 100:+.0f}%" for key in GATED]
+            line += '   ' + ' / '.join(deltas)
+        print(line)
+
+
+def regressions(results, baseline, threshold):
+    """(path, percentile, before, after) for every gated percentile past threshold."""
+    found = []
+    for path, stats in results.items():
+        for key in GATED:
+            if path in baseline and stats[key] > baseline[path][key] * (1 + threshold):
+                found.append((path, key, baseline[path][key], stats[key]))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lookup latency per query path')
+    parser.add_argument('--db', type=Path, default=DATABASE,
+                        help=f'Database to sample queries from (default: {DATABASE})')
+    parser.add_argument('--cli', type=Path, default=DICT_CLI,
+                        help=f'dict binary (default: {DICT_CLI})')
+    parser.add_argument('--sample', type=int, default=200,
+                        help='Database queries sampled per path (default: 200, 0 = lists only)')
+    parser.add_argument('--seed', type=int, default=0, help='Sampling seed (default: 0)')
+    parser.add_argument('--save', type=Path, metavar='FILE', help='Write results as a JSON baseline')
+    parser.add_argument('--baseline', type=Path, metavar='FILE', help='Compare against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown before failing, as a fraction (default: 0.25)')
+    args = parser.parse_args()
+
+    if not args.cli.exists():
+        print(f"Error: CLI not found at {args.cli}")
+        print("Please build it first: cd cmd/dict && go build -o dict")
+        return 1
+
+    queries = list_queries()
+    if args.sample:
+        if not args.db.exists():
+            print(f"Error: Database not found: {args.db}")
+            return 1
+        for path, words in sample_queries(args.db, args.sample, args.seed).items():
+            queries.setdefault(path, []).extend(words)
+    hot = {'hot': queries.pop('hot', [])}
+
+    results = {}
+    for flags, bucket in ((['--no-hot'], queries), ([], hot)):
+        if not any(bucket.values()):
+            continue
+        process = DictProcess(args.cli, flags)
+        try:
+            results.update(run(process, bucket))
+        finally:
+            process.close()
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())['paths']
+
+    print(f"Lookup benchmark: {args.cli}")
+    print_results(results, baseline)
+
+    if args.save:
+        args.save.write_text(json.dumps({
+            'cli': str(args.cli), 'db': str(args.db), 'sample': args.sample,
+            'seed': args.seed, 'paths': results,
+        }, indent=2) + '\n')
+        print(f"\nBaseline saved to {args.save}")
+
+    if baseline:
+        found = regressions(results, baseline, args.threshold)
+        if found:
+            print(f"\n✗ Regressed more than {args.threshold * 100:.0f}%:")
+            for path, key, before, after in found:
+                print(f"  {path} {key}: {before:.2f} ms → {after:.2f} ms")
+            return 1
+        print(f"\n✓ No path regressed more than {args.threshold * 100:.0f}%")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,11 @@
 package main
 
 import (
+	"bufio"
 	"encoding/json"
 	"flag"
 	"fmt"
+	"io"
 	"os"
 	"path/filepath"
 	"strings"
@@ -51,8 +53,16 @@ var (
 
 func main() {
 	// Define flags
-	var limit int
+	var limit, after int
 	jsonOutput := flag.Bool("json", false, "Output JSON format")
+	completeMode := flag.Bool("complete", false, "Treat the word as a prefix and list completions")
+	containsMode := flag.Bool("contains", false, "List words containing every kanji/hanzi of the input")
+	radicalMode := flag.Bool("radical", false, "List words containing a character with the given radical")
+	examplesMode := flag.Bool("examples", false, "Page through every example sentence of the word's top result (-n per page)")
+	flag.IntVar(&after, "after", 0, "With --examples, the next_cursor of the previous page")
+	jsonlMode := flag.Bool("jsonl", false, "Read one word per line from stdin and write one JSON result per line")
+	verifyHot := flag.Bool("verify-hot", false, "Check every stored hot result against a live lookup and exit")
+	noHot := flag.Bool("no-hot", false, "Look every word up live, skipping precomputed hot results (for benchmarks)")
 	flag.IntVar(&limit, "limit", 5, "Maximum number of results per language (0 = unlimited)")
 	flag.IntVar(&limit, "n", 5, "Shorthand for --limit")
 
@@ -65,36 +75,112 @@ func main() {
 		fmt.Fprintf(os.Stderr, "  dict cat -n 10        # Show 10 results\n")
 		fmt.Fprintf(os.Stderr, "  dict cat --limit 1    # Show only best match (Phase 1 behavior)\n")
 		fmt.Fprintf(os.Stderr, "  dict --json cat       # JSON output\n")
+		fmt.Fprintf(os.Stderr, "  dict --complete ca    # Typeahead suggestions for a prefix\n")
+		fmt.Fprintf(os.Stderr, "  dict --contains 学    # Words containing a character\n")
+		fmt.Fprintf(os.Stderr, "  dict --radical 氵     # Words containing a character with a radical\n")
+		fmt.Fprintf(os.Stderr, "  dict --examples 猫 -n 20 --after 1234  # Next page of example sentences\n")
+		fmt.Fprintf(os.Stderr, "  dict --jsonl < words  # Batch lookups over one process\n")
+		fmt.Fprintf(os.Stderr, "  dict --verify-hot     # Check precomputed responses after a build\n")
 	}
 
 	flag.Parse()
 
 	// Get search term
 	args := flag.Args()
-	if len(args) == 0 {
+	if len(args) == 0 && !*jsonlMode && !*verifyHot {
 		flag.Usage()
 		os.Exit(1)
 	}
-	searchTerm := args[0]
+
+	// In --jsonl mode stdout carries only result lines, so a client never
+	// reads a startup error as an answer
+	var errOut io.Writer = os.Stdout
+	if *jsonlMode {
+		errOut = os.Stderr
+	}
 
 	// Find database
 	dbPath := findDatabase()
 	if dbPath == "" {
-		fmt.Println("Error: dictionary.db not found")
-		fmt.Println("Please run: cd data/sample && python3 generate_samples.py")
+		fmt.Fprintln(errOut, "Error: dictionary.db not found")
+		fmt.Fprintln(errOut, "Please run: cd data/sample && python3 generate_samples.py")
 		os.Exit(1)
 	}
 
 	// Open database
 	db, err := database.Open(dbPath)
 	if err != nil {
-		fmt.Printf("Error opening database: %v\n", err)
+		fmt.Fprintf(errOut, "Error opening database: %v\n", err)
 		os.Exit(1)
 	}
 	defer db.Close()
 
+	if *verifyHot {
+		stale, err := query.StaleHotResults(db)
+		if err != nil {
+			fmt.Printf("Error: %v\n", err)
+			os.Exit(1)
+		}
+		if len(stale) > 0 {
+			fmt.Printf("%d hot results differ from live lookups (rebuild with data/hot_results.py):\n", len(stale))
+			for _, key := range stale {
+				fmt.Printf("  %s\n", key)
+			}
+			os.Exit(1)
+		}
+		fmt.Println("✓ Hot results match live lookups")
+		return
+	}
+
 	// Query with limit
-	result, err := query.Query(db, searchTerm, limit)
+	lookup := query.Query
+	if *noHot {
+		lookup = query.Live
+	}
+	if *containsMode {
+		lookup = query.Containing
+	} else if *radicalMode {
+		lookup = query.ByRadical
+	}
+
+	if *jsonlMode {
+		if err := serveJSONL(os.Stdin, os.Stdout, func(word string) (interface{}, error) {
+			if *completeMode {
+				return db.QueryCompletions(word, limit)
+			}
+			if *examplesMode {
+				return query.Examples(db, word, after, limit)
+			}
+			return lookup(db, word, limit)
+		}); err != nil {
+			fmt.Fprintf(os.Stderr, "Error: %v\n", err)
+			os.Exit(1)
+		}
+		return
+	}
+	searchTerm := args[0]
+
+	if *completeMode {
+		completions, err := db.QueryCompletions(searchTerm, limit)
+		if err != nil {
+			fmt.Printf("Error: %v\n", err)
+			os.Exit(1)
+		}
+		outputCompletions(completions, *jsonOutput)
+		return
+	}
+
+	if *examplesMode {
+		page, err := query.Examples(db, searchTerm, after, limit)
+		if err != nil {
+			fmt.Printf("Error: %v\n", err)
+			os.Exit(1)
+		}
+		outputExamples(page, searchTerm, limit, *jsonOutput)
+		return
+	}
+
+	result, err := lookup(db, searchTerm, limit)
 	if err != nil {
 		fmt.Printf("Error: %v\n", err)
 		os.Exit(1)
@@ -134,12 +220,93 @@ func findDatabase() string {
 	return ""
 }
 
+// outputExamples prints one page of example sentences and how to get the next
+func outputExamples(page *types.ExamplePage, word string, limit int, asJSON bool) {
+	if asJSON {
+		encoder := json.NewEncoder(os.Stdout)
+		encoder.SetIndent("", "  ")
+		encoder.Encode(page)
+		return
+	}
+
+	if len(page.Examples) == 0 {
+		fmt.Println("No examples")
+		return
+	}
+	for _, ex := range page.Examples {
+		fmt.Println(ex.SourceText)
+		if ex.EnglishText != "" {
+			fmt.Printf("  %s\n", ex.EnglishText)
+		}
+	}
+	if page.NextCursor != 0 {
+		fmt.Printf("\nMore: dict --examples %s -n %d --after %d\n", word, limit, page.NextCursor)
+	}
+}
+
 func outputJSON(result *types.Response) {
 	encoder := json.NewEncoder(os.Stdout)
 	encoder.SetIndent("", "  ")
 	encoder.Encode(result)
 }
 
+// jsonlError is written in place of a result when a lookup fails, so the
+// Nth output line always answers the Nth input line
+type jsonlError struct {
+	Query string `json:"query"`
+	Error string `json:"error"`
+}
+
+// serveJSONL answers one word per input line with one compact JSON line,
+// flushing after each so a client can keep the process open and send its
+// next word as soon as the previous answer arrives. Opening the database
+// once serves any number of lookups
+func serveJSONL(in io.Reader, out io.Writer, answer func(string) (interface{}, error)) error {
+	scanner := bufio.NewScanner(in)
+	scanner.Buffer(make([]byte, 64*1024), 1024*1024)
+	writer := bufio.NewWriter(out)
+	encoder := json.NewEncoder(writer)
+
+	for scanner.Scan() {
+		word := strings.TrimSpace(scanner.Text())
+		var result interface{}
+		var err error
+		if word == "" {
+			err = fmt.Errorf("empty query")
+		} else {
+			result, err = answer(word)
+		}
+		if err != nil {
+			result = jsonlError{Query: word, Error: err.Error()}
+		}
+		if err := encoder.Encode(result); err != nil {
+			return err
+		}
+		if err := writer.Flush(); err != nil {
+			return err
+		}
+	}
+	return scanner.Err()
+}
+
+func outputCompletions(completions []types.Completion, asJSON bool) {
+	if asJSON {
+		if completions == nil {
+			completions = []types.Completion{}
+		}
+		json.NewEncoder(os.Stdout).Encode(completions)
+		return
+	}
+
+	for _, c := range completions {
+		line := c.Text
+		if c.Detail != "" {
+			line += " " + readingStyle.Render("("+c.Detail+")")
+		}
+		fmt.Printf("%s  %s\n", lipgloss.NewStyle().Foreground(lipgloss.Color("8")).Render(c.Language), line)
+	}
+}
+
 func outputPretty(result *types.Response) {
 	// Separate outputs by language
 	var jaOutputs, zhOutputs []types.LanguageOutput
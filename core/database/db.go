@@ -3,11 +3,21 @@ package database
 import (
 	"database/sql"
 	"fmt"
+	"sync"
 )
 
 // DB wraps the SQLite connection
 type DB struct {
 	conn *sql.DB
+
+	// Lazily loaded char_variants (see ScriptKey)
+	variantsOnce sync.Once
+	variants     map[rune]rune
+	variantsErr  error
+
+	// Whether hot_results exists, checked once (see HotResult)
+	hotOnce sync.Once
+	hasHot  bool
 }
 
 // Open creates a new database connection
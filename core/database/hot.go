@@ -0,0 +1,76 @@
+package database
+
+import (
+	"database/sql"
+	"strings"
+)
+
+// HotResult returns the precomputed JSON response stored for input by
+// data/hot_results.py, if any
+// Databases built before hot_results existed report a miss
+func (db *DB) HotResult(input string) (string, bool, error) {
+	if !db.hasHotResults() {
+		return "", false, nil
+	}
+
+	var payload string
+	err := db.conn.QueryRow(`SELECT payload FROM hot_results WHERE query_key = ?`, hotKey(input)).Scan(&payload)
+	if err == sql.ErrNoRows {
+		return "", false, nil
+	}
+	if err != nil {
+		return "", false, err
+	}
+
+	return payload, true, nil
+}
+
+// HotResultKeys returns every query_key stored in hot_results, in key order
+// Databases built before hot_results existed have none
+func (db *DB) HotResultKeys() ([]string, error) {
+	if !db.hasHotResults() {
+		return nil, nil
+	}
+
+	rows, err := db.conn.Query(`SELECT query_key FROM hot_results ORDER BY query_key`)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	var keys []string
+	for rows.Next() {
+		var key string
+		if err := rows.Scan(&key); err != nil {
+			return nil, err
+		}
+		keys = append(keys, key)
+	}
+
+	return keys, rows.Err()
+}
+
+// hasHotResults reports whether the database has a hot_results table,
+// checked once per DB
+func (db *DB) hasHotResults() bool {
+	db.hotOnce.Do(func() {
+		var name string
+		err := db.conn.QueryRow(
+			`SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'hot_results'`,
+		).Scan(&name)
+		db.hasHot = err == nil
+	})
+	return db.hasHot
+}
+
+// hotKey normalizes a query like hot_key in data/hot_results.py: trimmed,
+// and lowercased if ASCII (English, romaji and pinyin ignore ASCII case)
+func hotKey(input string) string {
+	input = strings.TrimSpace(input)
+	for i := 0; i < len(input); i++ {
+		if input[i] >= 0x80 {
+			return input
+		}
+	}
+	return strings.ToLower(input)
+}
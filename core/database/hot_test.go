@@ -0,0 +1,25 @@
+package database
+
+import "testing"
+
+func TestHotKey(t *testing.T) {
+	tests := []struct {
+		input    string
+		expected string
+	}{
+		{"cat", "cat"},
+		{"  Cat ", "cat"}, // Trimmed and lowercased
+		{"MĀO", "MĀO"},    // Non-ASCII is kept as typed
+		{"猫", "猫"},
+		{" ねこ\t", "ねこ"},
+		{"", ""},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			if got := hotKey(tt.input); got != tt.expected {
+				t.Errorf("hotKey(%q) = %q, want %q", tt.input, got, tt.expected)
+			}
+		})
+	}
+}
@@ -3,21 +3,127 @@ package database
 import (
 	"database/sql"
 	"fmt"
+	"strconv"
+	"strings"
+	"unicode/utf8"
 
+	"github.com/Chiarandini/trilingual-dict/core/kana"
 	"github.com/Chiarandini/trilingual-dict/core/types"
 )
 
-// QueryJapanese searches for Japanese words by headword or reading
-func (db *DB) QueryJapanese(headword, reading string) ([]types.JapaneseWord, error) {
+// QueryJapanese searches for Japanese words by any kanji or kana spelling
+// (japanese_forms), not just the primary headword and reading
+// The form is also probed hiragana-folded, so katakana and hiragana input
+// find the same words, and script-folded (see ScriptKey), so traditional or
+// simplified hanzi find the shinjitai headword (學校, 图 → 学校, 図)
+// limit: maximum number of rows to return, exact headword first, then best
+// rank_score (0 = unlimited)
+func (db *DB) QueryJapanese(form string, limit int) ([]types.JapaneseWord, error) {
+	scriptKey, err := db.ScriptKey(form)
+	if err != nil {
+		return nil, err
+	}
+
+	query := `
+		SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
+		       stroke_count
+		FROM japanese_words
+		WHERE id IN (
+			SELECT word_id FROM japanese_forms WHERE form IN (?, ?)
+			UNION
+			SELECT id FROM japanese_words WHERE script_key = ?
+		)
+		ORDER BY headword = ? DESC, rank_score DESC, id
+		LIMIT ?
+	`
+
+	rows, err := db.conn.Query(query, form, kana.ToHiragana(form), scriptKey, form, sqlLimit(limit))
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	return db.scanJapaneseWords(rows)
+}
+
+// QueryJapaneseByInflection resolves conjugated input (食べました, のんで) to
+// its dictionary form via the precomputed japanese_inflections table
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryJapaneseByInflection(surface string, limit int) ([]types.JapaneseWord, error) {
+	query := `
+		SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
+		       stroke_count
+		FROM japanese_words
+		WHERE id IN (SELECT word_id FROM japanese_inflections WHERE surface IN (?, ?))
+		ORDER BY rank_score DESC, id
+		LIMIT ?
+	`
+
+	rows, err := db.conn.Query(query, surface, kana.ToHiragana(surface), sqlLimit(limit))
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	return db.scanJapaneseWords(rows)
+}
+
+// QueryJapaneseByRomaji searches for Japanese words by romaji search key
+// (see kana.RomajiKey), e.g. "neko" for 猫
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryJapaneseByRomaji(key string, limit int) ([]types.JapaneseWord, error) {
+	query := `
+		SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
+		       stroke_count
+		FROM japanese_words
+		WHERE reading_romaji = ?
+		ORDER BY rank_score DESC, id
+		LIMIT ?
+	`
+
+	rows, err := db.conn.Query(query, key, sqlLimit(limit))
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	return db.scanJapaneseWords(rows)
+}
+
+// QueryJapaneseContaining searches for Japanese words whose headword contains
+// every kanji of text, via char_index (kana in text is ignored)
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryJapaneseContaining(text string, limit int) ([]types.JapaneseWord, error) {
+	filter, args := charIndexFilter("ja", text)
+	return db.queryJapaneseWhereID(filter, args, limit)
+}
+
+// QueryJapaneseByRadical searches for Japanese words containing a kanji with
+// the given radical (any spelling in the radicals table, e.g. 水 or 氵, or a
+// Kangxi number), via kanji_components joined through char_index
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryJapaneseByRadical(radical string, limit int) ([]types.JapaneseWord, error) {
+	filter, args := radicalFilter("ja", radical)
+	return db.queryJapaneseWhereID(filter, args, limit)
+}
+
+// queryJapaneseWhereID runs an id-selecting subquery against japanese_words,
+// best rank_score first. An empty filter matches nothing.
+func (db *DB) queryJapaneseWhereID(filter string, args []interface{}, limit int) ([]types.JapaneseWord, error) {
+	if filter == "" {
+		return nil, nil
+	}
+
 	query := `
 		SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
-		       stroke_count, components, stroke_svg
+		       stroke_count
 		FROM japanese_words
-		WHERE headword = ? OR reading = ?
-		ORDER BY is_common DESC, frequency_rank ASC
+		WHERE id IN (` + filter + `)
+		ORDER BY rank_score DESC, id
+		LIMIT ?
 	`
 
-	rows, err := db.conn.Query(query, headword, reading)
+	rows, err := db.conn.Query(query, append(args, sqlLimit(limit))...)
 	if err != nil {
 		return nil, err
 	}
@@ -27,7 +133,8 @@ func (db *DB) QueryJapanese(headword, reading string) ([]types.JapaneseWord, err
 }
 
 // QueryJapaneseByEnglish searches for Japanese words by English gloss
-func (db *DB) QueryJapaneseByEnglish(gloss string) ([]types.JapaneseWord, error) {
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryJapaneseByEnglish(gloss string, limit int) ([]types.JapaneseWord, error) {
 	// Strict word boundary matching - only exact matches or definitions starting with the word
 	// e.g., "cat" matches "cat", "cat (animal)", "cat; feline"
 	// but NOT "raccoon cat", "sly cat", "wildcat"
@@ -35,26 +142,28 @@ func (db *DB) QueryJapaneseByEnglish(gloss string) ([]types.JapaneseWord, error)
 	// Phase 2: Can include compound words as additional results
 	query := `
 		SELECT DISTINCT w.id, w.headword, w.reading, w.is_common, w.frequency_rank,
-		       w.jlpt_level, w.stroke_count, w.components, w.stroke_svg
+		       w.jlpt_level, w.stroke_count
 		FROM japanese_words w
 		JOIN japanese_definitions d ON w.id = d.word_id
-		WHERE LOWER(d.english_gloss) = LOWER(?)
-		   OR LOWER(d.english_gloss) LIKE LOWER(?) || ' (%'
-		   OR LOWER(d.english_gloss) LIKE LOWER(?) || ';%'
-		   OR LOWER(d.english_gloss) LIKE '%;' || LOWER(?)
-		   OR LOWER(d.english_gloss) LIKE '%; ' || LOWER(?) || ';%'
+		JOIN glosses g ON g.id = d.gloss_id
+		WHERE LOWER(g.text) = LOWER(?)
+		   OR LOWER(g.text) LIKE LOWER(?) || ' (%'
+		   OR LOWER(g.text) LIKE LOWER(?) || ';%'
+		   OR LOWER(g.text) LIKE '%;' || LOWER(?)
+		   OR LOWER(g.text) LIKE '%; ' || LOWER(?) || ';%'
 		ORDER BY
+		   w.rank_score DESC,
 		   CASE
-		     WHEN LOWER(d.english_gloss) = LOWER(?) THEN 0
-		     WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ' (%' THEN 1
-		     WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ';%' THEN 2
+		     WHEN LOWER(g.text) = LOWER(?) THEN 0
+		     WHEN LOWER(g.text) LIKE LOWER(?) || ' (%' THEN 1
+		     WHEN LOWER(g.text) LIKE LOWER(?) || ';%' THEN 2
 		     ELSE 3
 		   END,
-		   w.is_common DESC,
-		   w.frequency_rank ASC
+		   w.id
+		LIMIT ?
 	`
 
-	rows, err := db.conn.Query(query, gloss, gloss, gloss, gloss, gloss, gloss, gloss, gloss)
+	rows, err := db.conn.Query(query, gloss, gloss, gloss, gloss, gloss, gloss, gloss, gloss, sqlLimit(limit))
 	if err != nil {
 		return nil, err
 	}
@@ -63,17 +172,90 @@ func (db *DB) QueryJapaneseByEnglish(gloss string) ([]types.JapaneseWord, error)
 	return db.scanJapaneseWords(rows)
 }
 
-// QueryChinese searches for Chinese words by simplified form
-func (db *DB) QueryChinese(simplified string) ([]types.ChineseWord, error) {
+// QueryChinese searches for Chinese words written in any script: simplified,
+// traditional or Japanese shinjitai input all fold to the same script_key
+// (see ScriptKey), so one index probe covers every spelling
+// limit: maximum number of rows to return, exact spelling first, then best
+// rank_score (0 = unlimited)
+func (db *DB) QueryChinese(text string, limit int) ([]types.ChineseWord, error) {
+	scriptKey, err := db.ScriptKey(text)
+	if err != nil {
+		return nil, err
+	}
+
+	query := `
+		SELECT id, simplified, traditional, pinyin, pinyin_marked, is_common,
+		       frequency_rank, hsk_level, stroke_count
+		FROM chinese_words
+		WHERE script_key = ?
+		ORDER BY (simplified = ? OR traditional = ?) DESC, rank_score DESC, id
+		LIMIT ?
+	`
+
+	rows, err := db.conn.Query(query, scriptKey, text, text, sqlLimit(limit))
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	return db.scanChineseWords(rows)
+}
+
+// QueryChineseByPinyin searches for Chinese words by toneless pinyin search key
+// (see pinyin.SearchKey), e.g. "nihao" for 你好
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryChineseByPinyin(key string, limit int) ([]types.ChineseWord, error) {
+	query := `
+		SELECT id, simplified, traditional, pinyin, pinyin_marked, is_common,
+		       frequency_rank, hsk_level, stroke_count
+		FROM chinese_words
+		WHERE pinyin_key = ?
+		ORDER BY rank_score DESC, id
+		LIMIT ?
+	`
+
+	rows, err := db.conn.Query(query, key, sqlLimit(limit))
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	return db.scanChineseWords(rows)
+}
+
+// QueryChineseContaining searches for Chinese words whose simplified or
+// traditional spelling contains every kanji/hanzi of text, via char_index
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryChineseContaining(text string, limit int) ([]types.ChineseWord, error) {
+	filter, args := charIndexFilter("zh", text)
+	return db.queryChineseWhereID(filter, args, limit)
+}
+
+// QueryChineseByRadical searches for Chinese words containing a hanzi with
+// the given radical (see QueryJapaneseByRadical)
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryChineseByRadical(radical string, limit int) ([]types.ChineseWord, error) {
+	filter, args := radicalFilter("zh", radical)
+	return db.queryChineseWhereID(filter, args, limit)
+}
+
+// queryChineseWhereID runs an id-selecting subquery against chinese_words,
+// best rank_score first. An empty filter matches nothing.
+func (db *DB) queryChineseWhereID(filter string, args []interface{}, limit int) ([]types.ChineseWord, error) {
+	if filter == "" {
+		return nil, nil
+	}
+
 	query := `
-		SELECT id, simplified, traditional, pinyin, is_common, frequency_rank,
-		       hsk_level, stroke_count, components, decomposition, stroke_svg
+		SELECT id, simplified, traditional, pinyin, pinyin_marked, is_common,
+		       frequency_rank, hsk_level, stroke_count
 		FROM chinese_words
-		WHERE simplified = ?
-		ORDER BY is_common DESC, frequency_rank ASC
+		WHERE id IN (` + filter + `)
+		ORDER BY rank_score DESC, id
+		LIMIT ?
 	`
 
-	rows, err := db.conn.Query(query, simplified)
+	rows, err := db.conn.Query(query, append(args, sqlLimit(limit))...)
 	if err != nil {
 		return nil, err
 	}
@@ -83,35 +265,37 @@ func (db *DB) QueryChinese(simplified string) ([]types.ChineseWord, error) {
 }
 
 // QueryChineseByEnglish searches for Chinese words by English gloss
-func (db *DB) QueryChineseByEnglish(gloss string) ([]types.ChineseWord, error) {
+// limit: maximum number of rows to return, best rank_score first (0 = unlimited)
+func (db *DB) QueryChineseByEnglish(gloss string, limit int) ([]types.ChineseWord, error) {
 	// Strict word boundary matching - only exact matches or definitions starting with the word
 	// e.g., "cat" matches "cat", "cat (animal)", "cat; feline"
 	// but NOT "raccoon cat", "sly cat", "wildcat"
 	// Phase 1: Return only primary/exact matches
 	// Phase 2: Can include compound words as additional results
 	query := `
-		SELECT DISTINCT w.id, w.simplified, w.traditional, w.pinyin, w.is_common,
-		       w.frequency_rank, w.hsk_level, w.stroke_count, w.components,
-		       w.decomposition, w.stroke_svg
+		SELECT DISTINCT w.id, w.simplified, w.traditional, w.pinyin, w.pinyin_marked,
+		       w.is_common, w.frequency_rank, w.hsk_level, w.stroke_count
 		FROM chinese_words w
 		JOIN chinese_definitions d ON w.id = d.word_id
-		WHERE LOWER(d.english_gloss) = LOWER(?)
-		   OR LOWER(d.english_gloss) LIKE LOWER(?) || ' (%'
-		   OR LOWER(d.english_gloss) LIKE LOWER(?) || ';%'
-		   OR LOWER(d.english_gloss) LIKE '%;' || LOWER(?)
-		   OR LOWER(d.english_gloss) LIKE '%; ' || LOWER(?) || ';%'
+		JOIN glosses g ON g.id = d.gloss_id
+		WHERE LOWER(g.text) = LOWER(?)
+		   OR LOWER(g.text) LIKE LOWER(?) || ' (%'
+		   OR LOWER(g.text) LIKE LOWER(?) || ';%'
+		   OR LOWER(g.text) LIKE '%;' || LOWER(?)
+		   OR LOWER(g.text) LIKE '%; ' || LOWER(?) || ';%'
 		ORDER BY
+		   w.rank_score DESC,
 		   CASE
-		     WHEN LOWER(d.english_gloss) = LOWER(?) THEN 0
-		     WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ' (%' THEN 1
-		     WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ';%' THEN 2
+		     WHEN LOWER(g.text) = LOWER(?) THEN 0
+		     WHEN LOWER(g.text) LIKE LOWER(?) || ' (%' THEN 1
+		     WHEN LOWER(g.text) LIKE LOWER(?) || ';%' THEN 2
 		     ELSE 3
 		   END,
-		   w.is_common DESC,
-		   w.frequency_rank ASC
+		   w.id
+		LIMIT ?
 	`
 
-	rows, err := db.conn.Query(query, gloss, gloss, gloss, gloss, gloss, gloss, gloss, gloss)
+	rows, err := db.conn.Query(query, gloss, gloss, gloss, gloss, gloss, gloss, gloss, gloss, sqlLimit(limit))
 	if err != nil {
 		return nil, err
 	}
@@ -123,9 +307,11 @@ func (db *DB) QueryChineseByEnglish(gloss string) ([]types.ChineseWord, error) {
 // GetJapaneseDefinitions retrieves all definitions for a Japanese word
 func (db *DB) GetJapaneseDefinitions(wordID int) ([]types.JapaneseDefinition, error) {
 	query := `
-		SELECT id, word_id, english_gloss, pos
-		FROM japanese_definitions
-		WHERE word_id = ?
+		SELECT d.id, d.word_id, g.text, d.pos
+		FROM japanese_definitions d
+		JOIN glosses g ON g.id = d.gloss_id
+		WHERE d.word_id = ?
+		ORDER BY d.id
 	`
 
 	rows, err := db.conn.Query(query, wordID)
@@ -154,9 +340,11 @@ func (db *DB) GetJapaneseDefinitions(wordID int) ([]types.JapaneseDefinition, er
 // GetChineseDefinitions retrieves all definitions for a Chinese word
 func (db *DB) GetChineseDefinitions(wordID int) ([]types.ChineseDefinition, error) {
 	query := `
-		SELECT id, word_id, english_gloss
-		FROM chinese_definitions
-		WHERE word_id = ?
+		SELECT d.id, d.word_id, g.text
+		FROM chinese_definitions d
+		JOIN glosses g ON g.id = d.gloss_id
+		WHERE d.word_id = ?
+		ORDER BY d.id
 	`
 
 	rows, err := db.conn.Query(query, wordID)
@@ -181,9 +369,11 @@ func (db *DB) GetChineseDefinitions(wordID int) ([]types.ChineseDefinition, erro
 // GetExamples retrieves examples for a word
 func (db *DB) GetExamples(language string, wordID int) ([]types.Example, error) {
 	query := `
-		SELECT source_text, english_text
-		FROM examples
-		WHERE language = ? AND word_id = ?
+		SELECT s.text, COALESCE(s.english, '')
+		FROM example_links l
+		JOIN sentences s ON s.id = l.sentence_id
+		WHERE l.lang = ? AND l.word_id = ?
+		ORDER BY l.score DESC
 		LIMIT 5
 	`
 
@@ -206,19 +396,304 @@ func (db *DB) GetExamples(language string, wordID int) ([]types.Example, error)
 	return examples, rows.Err()
 }
 
+// GetExamplesPage retrieves up to limit of a word's sentences from
+// sentence_terms, after the sentence ID cursor (0 for the first page).
+// Keyset pagination keeps every page a single index range however deep it
+// is. NextCursor is 0 on the last page
+// limit must be positive: a page of nothing would end paging at cursor 0
+func (db *DB) GetExamplesPage(language string, wordID, after, limit int) (types.ExamplePage, error) {
+	if limit <= 0 {
+		return types.ExamplePage{}, fmt.Errorf("examples page size must be positive, got %d", limit)
+	}
+
+	query := `
+		SELECT t.sentence_id, s.text, COALESCE(s.english, '')
+		FROM sentence_terms t
+		JOIN sentences s ON s.id = t.sentence_id
+		WHERE t.lang = ? AND t.word_id = ? AND t.sentence_id > ?
+		ORDER BY t.sentence_id
+		LIMIT ?
+	`
+
+	page := types.ExamplePage{Examples: []types.Example{}}
+	rows, err := db.conn.Query(query, language, wordID, after, limit+1)
+	if err != nil {
+		return page, err
+	}
+	defer rows.Close()
+
+	lastID := 0
+	for rows.Next() {
+		var sentenceID int
+		var ex types.Example
+		if err := rows.Scan(&sentenceID, &ex.SourceText, &ex.EnglishText); err != nil {
+			return page, err
+		}
+		if len(page.Examples) == limit {
+			page.NextCursor = lastID
+			break
+		}
+		page.Examples = append(page.Examples, ex)
+		lastID = sentenceID
+	}
+
+	return page, rows.Err()
+}
+
+// LoadJapaneseDetails fills Components and StrokeSVG of words from
+// japanese_word_details with one query; the word queries leave them unset
+// so lookups only read the narrow japanese_words rows
+func (db *DB) LoadJapaneseDetails(words []types.JapaneseWord) error {
+	if len(words) == 0 {
+		return nil
+	}
+
+	index := make(map[int]int, len(words))
+	args := make([]interface{}, len(words))
+	for i, w := range words {
+		index[w.ID] = i
+		args[i] = w.ID
+	}
+
+	query := `
+		SELECT word_id, components, stroke_svg
+		FROM japanese_word_details
+		WHERE word_id IN (` + placeholders(len(words)) + `)
+	`
+
+	rows, err := db.conn.Query(query, args...)
+	if err != nil {
+		return err
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var wordID int
+		var components, strokeSVG sql.NullString
+		if err := rows.Scan(&wordID, &components, &strokeSVG); err != nil {
+			return err
+		}
+		w := &words[index[wordID]]
+		if components.Valid {
+			w.Components = &components.String
+		}
+		if strokeSVG.Valid {
+			w.StrokeSVG = &strokeSVG.String
+		}
+	}
+
+	return rows.Err()
+}
+
+// LoadChineseDetails fills Components, Decomposition and StrokeSVG of words
+// from chinese_word_details with one query
+func (db *DB) LoadChineseDetails(words []types.ChineseWord) error {
+	if len(words) == 0 {
+		return nil
+	}
+
+	index := make(map[int]int, len(words))
+	args := make([]interface{}, len(words))
+	for i, w := range words {
+		index[w.ID] = i
+		args[i] = w.ID
+	}
+
+	query := `
+		SELECT word_id, components, decomposition, stroke_svg
+		FROM chinese_word_details
+		WHERE word_id IN (` + placeholders(len(words)) + `)
+	`
+
+	rows, err := db.conn.Query(query, args...)
+	if err != nil {
+		return err
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var wordID int
+		var components, decomposition, strokeSVG sql.NullString
+		if err := rows.Scan(&wordID, &components, &decomposition, &strokeSVG); err != nil {
+			return err
+		}
+		w := &words[index[wordID]]
+		if components.Valid {
+			w.Components = &components.String
+		}
+		if decomposition.Valid {
+			w.Decomposition = &decomposition.String
+		}
+		if strokeSVG.Valid {
+			w.StrokeSVG = &strokeSVG.String
+		}
+	}
+
+	return rows.Err()
+}
+
+// Autocomplete tuning, must match data/autocomplete.py
+const (
+	// hotPrefixChars is the longest prefix answered from autocomplete_top
+	hotPrefixChars = 2
+	// topCompletions is the number of completions precomputed per hot prefix
+	topCompletions = 10
+	// prefixUpperBound sorts after every code point in SQLite's BINARY order
+	prefixUpperBound = "\U0010FFFF"
+)
+
+// QueryCompletions returns typeahead suggestions for a prefix in any of the
+// three languages, best rank_score first
+// Short prefixes read precomputed slots from autocomplete_top; longer ones
+// are a single range scan over the autocomplete_keys primary key
+func (db *DB) QueryCompletions(prefix string, limit int) ([]types.Completion, error) {
+	key := kana.ToHiragana(strings.ToLower(strings.TrimSpace(prefix)))
+	if key == "" {
+		return nil, nil
+	}
+	if limit <= 0 {
+		limit = topCompletions
+	}
+
+	var rows *sql.Rows
+	var err error
+	if utf8.RuneCountInString(key) <= hotPrefixChars && limit <= topCompletions {
+		rows, err = db.conn.Query(`
+			SELECT lang, display, detail, rank_score
+			FROM autocomplete_top
+			WHERE prefix = ?
+			ORDER BY slot
+			LIMIT ?
+		`, key, limit)
+	} else {
+		rows, err = db.conn.Query(`
+			SELECT lang, display, detail, rank_score
+			FROM autocomplete_keys
+			WHERE key >= ? AND key < ?
+			ORDER BY rank_score DESC, key
+			LIMIT ?
+		`, key, key+prefixUpperBound, limit)
+	}
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	var completions []types.Completion
+	for rows.Next() {
+		var c types.Completion
+		var detail sql.NullString
+		if err := rows.Scan(&c.Language, &c.Text, &detail, &c.Rank); err != nil {
+			return nil, err
+		}
+		c.Detail = detail.String
+		completions = append(completions, c)
+	}
+
+	return completions, rows.Err()
+}
+
 // Helper functions
 
+// cjkRanges are the ideograph blocks indexed by data/char_index.py
+var cjkRanges = [][2]rune{
+	{0x3400, 0x4DBF},
+	{0x4E00, 0x9FFF},
+	{0xF900, 0xFAFF},
+	{0x20000, 0x2FFFF},
+}
+
+// cjkChars returns the distinct CJK ideographs of text in order of first
+// appearance
+func cjkChars(text string) []string {
+	var chars []string
+	seen := make(map[rune]bool)
+	for _, r := range text {
+		if seen[r] {
+			continue
+		}
+		for _, span := range cjkRanges {
+			if r >= span[0] && r <= span[1] {
+				seen[r] = true
+				chars = append(chars, string(r))
+				break
+			}
+		}
+	}
+	return chars
+}
+
+// charIndexFilter builds a char_index subquery selecting the word IDs of
+// lang that contain every ideograph of text (an intersection of index
+// ranges). Returns "" when text has no ideographs.
+func charIndexFilter(lang, text string) (string, []interface{}) {
+	chars := cjkChars(text)
+	if len(chars) == 0 {
+		return "", nil
+	}
+
+	args := []interface{}{lang}
+	for _, c := range chars {
+		args = append(args, c)
+	}
+	args = append(args, len(chars))
+
+	filter := `
+			SELECT word_id FROM char_index
+			WHERE lang = ? AND char IN (` + placeholders(len(chars)) + `)
+			GROUP BY word_id
+			HAVING COUNT(DISTINCT char) = ?`
+	return filter, args
+}
+
+// radicalFilter builds a subquery selecting the word IDs of lang that contain
+// a character with the given radical. radical is a Kangxi number or any
+// spelling in the radicals table. Returns "" for empty input.
+func radicalFilter(lang, radical string) (string, []interface{}) {
+	radical = strings.TrimSpace(radical)
+	if radical == "" {
+		return "", nil
+	}
+
+	number := "(SELECT number FROM radicals WHERE form = ?)"
+	var arg interface{} = radical
+	if n, err := strconv.Atoi(radical); err == nil {
+		number = "?"
+		arg = n
+	}
+
+	filter := `
+			SELECT ci.word_id
+			FROM kanji_components kc
+			JOIN char_index ci ON ci.char = kc.kanji AND ci.lang = ?
+			WHERE kc.radical_number = ` + number
+	return filter, []interface{}{lang, arg}
+}
+
+// placeholders returns n comma-separated SQL parameters ("?, ?, ?")
+func placeholders(n int) string {
+	return strings.TrimSuffix(strings.Repeat("?, ", n), ", ")
+}
+
+// sqlLimit converts a maxResults value (0 = unlimited) into a SQLite LIMIT
+// argument, where a negative limit means no limit
+func sqlLimit(limit int) int {
+	if limit <= 0 {
+		return -1
+	}
+	return limit
+}
+
 func (db *DB) scanJapaneseWords(rows *sql.Rows) ([]types.JapaneseWord, error) {
 	var words []types.JapaneseWord
 
 	for rows.Next() {
 		var w types.JapaneseWord
-		var freqRank, strokeCount sql.NullInt64
-		var jlptLevel, components, strokeSVG sql.NullString
+		var freqRank, jlptLevel, strokeCount sql.NullInt64
 
 		err := rows.Scan(
 			&w.ID, &w.Headword, &w.Reading, &w.IsCommon,
-			&freqRank, &jlptLevel, &strokeCount, &components, &strokeSVG,
+			&freqRank, &jlptLevel, &strokeCount,
 		)
 		if err != nil {
 			return nil, err
@@ -229,19 +704,13 @@ func (db *DB) scanJapaneseWords(rows *sql.Rows) ([]types.JapaneseWord, error) {
 			w.FrequencyRank = &rank
 		}
 		if jlptLevel.Valid {
-			w.JLPTLevel = &jlptLevel.String
+			level := int(jlptLevel.Int64)
+			w.JLPTLevel = &level
 		}
 		if strokeCount.Valid {
 			count := int(strokeCount.Int64)
 			w.StrokeCount = &count
 		}
-		if components.Valid {
-			w.Components = &components.String
-		}
-		if strokeSVG.Valid {
-			w.StrokeSVG = &strokeSVG.String
-		}
-
 		// Load definitions
 		defs, err := db.GetJapaneseDefinitions(w.ID)
 		if err != nil {
@@ -267,12 +736,12 @@ func (db *DB) scanChineseWords(rows *sql.Rows) ([]types.ChineseWord, error) {
 
 	for rows.Next() {
 		var w types.ChineseWord
-		var freqRank, strokeCount sql.NullInt64
-		var hskLevel, components, decomposition, strokeSVG sql.NullString
+		var freqRank, hskLevel, strokeCount sql.NullInt64
+		var pinyinMarked sql.NullString
 
 		err := rows.Scan(
-			&w.ID, &w.Simplified, &w.Traditional, &w.Pinyin, &w.IsCommon,
-			&freqRank, &hskLevel, &strokeCount, &components, &decomposition, &strokeSVG,
+			&w.ID, &w.Simplified, &w.Traditional, &w.Pinyin, &pinyinMarked, &w.IsCommon,
+			&freqRank, &hskLevel, &strokeCount,
 		)
 		if err != nil {
 			return nil, err
@@ -282,22 +751,17 @@ func (db *DB) scanChineseWords(rows *sql.Rows) ([]types.ChineseWord, error) {
 			rank := int(freqRank.Int64)
 			w.FrequencyRank = &rank
 		}
+		if pinyinMarked.Valid {
+			w.PinyinMarked = &pinyinMarked.String
+		}
 		if hskLevel.Valid {
-			w.HSKLevel = &hskLevel.String
+			level := int(hskLevel.Int64)
+			w.HSKLevel = &level
 		}
 		if strokeCount.Valid {
 			count := int(strokeCount.Int64)
 			w.StrokeCount = &count
 		}
-		if components.Valid {
-			w.Components = &components.String
-		}
-		if decomposition.Valid {
-			w.Decomposition = &decomposition.String
-		}
-		if strokeSVG.Valid {
-			w.StrokeSVG = &strokeSVG.String
-		}
 
 		// Load definitions
 		defs, err := db.GetChineseDefinitions(w.ID)
@@ -0,0 +1,132 @@
+package database
+
+import (
+	"path/filepath"
+	"reflect"
+	"testing"
+)
+
+func TestCJKChars(t *testing.T) {
+	tests := []struct {
+		input    string
+		expected []string
+	}{
+		{"猫", []string{"猫"}},
+		{"学校", []string{"学", "校"}},
+		{"食べる", []string{"食"}}, // Kana is not indexed
+		{"人々", []string{"人"}},  // Iteration mark is not an ideograph
+		{"大大大", []string{"大"}}, // Duplicates collapse
+		{"cat", nil},
+		{"", nil},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			if got := cjkChars(tt.input); !reflect.DeepEqual(got, tt.expected) {
+				t.Errorf("cjkChars(%q) = %v, want %v", tt.input, got, tt.expected)
+			}
+		})
+	}
+}
+
+func TestCharIndexFilterArgs(t *testing.T) {
+	filter, args := charIndexFilter("ja", "学校")
+	if filter == "" {
+		t.Fatal("expected a filter for ideograph input")
+	}
+
+	expected := []interface{}{"ja", "学", "校", 2}
+	if !reflect.DeepEqual(args, expected) {
+		t.Errorf("charIndexFilter args = %v, want %v", args, expected)
+	}
+
+	if filter, args := charIndexFilter("zh", "hello"); filter != "" || args != nil {
+		t.Errorf("charIndexFilter(non-CJK) = %q, %v, want empty", filter, args)
+	}
+}
+
+func TestRadicalFilterArgs(t *testing.T) {
+	tests := []struct {
+		input    string
+		expected []interface{}
+	}{
+		{"氵", []interface{}{"ja", "氵"}},
+		{"85", []interface{}{"ja", 85}}, // Kangxi number is bound directly
+		{" 水 ", []interface{}{"ja", "水"}},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			filter, args := radicalFilter("ja", tt.input)
+			if filter == "" {
+				t.Fatalf("radicalFilter(%q) returned no filter", tt.input)
+			}
+			if !reflect.DeepEqual(args, tt.expected) {
+				t.Errorf("radicalFilter(%q) args = %v, want %v", tt.input, args, tt.expected)
+			}
+		})
+	}
+
+	if filter, _ := radicalFilter("ja", "  "); filter != "" {
+		t.Errorf("radicalFilter(blank) = %q, want empty", filter)
+	}
+}
+
+func TestGetExamplesPage(t *testing.T) {
+	db, err := Open(filepath.Join(t.TempDir(), "examples.db"))
+	if err != nil {
+		t.Fatalf("Failed to open database: %v", err)
+	}
+	defer db.Close()
+
+	for _, stmt := range []string{
+		`CREATE TABLE sentences (id INTEGER PRIMARY KEY, lang TEXT, text TEXT, english TEXT)`,
+		`CREATE TABLE sentence_terms (lang TEXT, word_id INTEGER, sentence_id INTEGER,
+		 PRIMARY KEY (lang, word_id, sentence_id)) WITHOUT ROWID`,
+		`INSERT INTO sentences VALUES (3, 'ja', 'a', 'A'), (7, 'ja', 'b', NULL),
+		 (9, 'ja', 'c', 'C'), (12, 'ja', 'd', 'D'), (15, 'ja', 'e', 'E')`,
+		`INSERT INTO sentence_terms VALUES ('ja', 1, 3), ('ja', 1, 7), ('ja', 1, 9),
+		 ('ja', 1, 12), ('ja', 2, 15), ('zh', 1, 15)`,
+	} {
+		if _, err := db.conn.Exec(stmt); err != nil {
+			t.Fatalf("setup failed: %v", err)
+		}
+	}
+
+	// Each page starts after the previous page's last sentence ID
+	var texts []string
+	var cursors []int
+	after := 0
+	for {
+		page, err := db.GetExamplesPage("ja", 1, after, 3)
+		if err != nil {
+			t.Fatalf("GetExamplesPage(after=%d) failed: %v", after, err)
+		}
+		for _, ex := range page.Examples {
+			texts = append(texts, ex.SourceText)
+		}
+		cursors = append(cursors, page.NextCursor)
+		if page.NextCursor == 0 {
+			break
+		}
+		after = page.NextCursor
+	}
+	if want := []string{"a", "b", "c", "d"}; !reflect.DeepEqual(texts, want) {
+		t.Errorf("paged texts = %v, want %v", texts, want)
+	}
+	if want := []int{9, 0}; !reflect.DeepEqual(cursors, want) {
+		t.Errorf("cursors = %v, want %v", cursors, want)
+	}
+
+	// An exactly full last page has no next cursor
+	page, err := db.GetExamplesPage("ja", 1, 7, 2)
+	if err != nil || page.NextCursor != 0 || len(page.Examples) != 2 {
+		t.Errorf("GetExamplesPage(after=7, limit=2) = %+v, %v; want 2 examples, no cursor", page, err)
+	}
+
+	for _, limit := range []int{0, -1} {
+		if _, err := db.GetExamplesPage("ja", 1, 0, limit); err == nil {
+			t.Errorf("GetExamplesPage(limit=%d) succeeded, want an error", limit)
+		}
+	}
+}
@@ -0,0 +1,53 @@
+package database
+
+import (
+	"strings"
+	"unicode/utf8"
+)
+
+// ScriptKey folds text through char_variants so shinjitai, traditional and
+// simplified spellings of a word share one key (学校, 學校 → 学校), matching
+// the script_key columns built by data/variants.py
+// The variant table is loaded on first use and cached for the DB's lifetime
+func (db *DB) ScriptKey(text string) (string, error) {
+	db.variantsOnce.Do(func() {
+		db.variants, db.variantsErr = db.loadVariants()
+	})
+	if db.variantsErr != nil {
+		return "", db.variantsErr
+	}
+
+	return foldVariants(text, db.variants), nil
+}
+
+// loadVariants reads char_variants into a char → canonical map
+func (db *DB) loadVariants() (map[rune]rune, error) {
+	rows, err := db.conn.Query(`SELECT char, canonical FROM char_variants`)
+	if err != nil {
+		return nil, err
+	}
+	defer rows.Close()
+
+	variants := make(map[rune]rune)
+	for rows.Next() {
+		var char, canonical string
+		if err := rows.Scan(&char, &canonical); err != nil {
+			return nil, err
+		}
+		from, _ := utf8.DecodeRuneInString(char)
+		to, _ := utf8.DecodeRuneInString(canonical)
+		variants[from] = to
+	}
+
+	return variants, rows.Err()
+}
+
+// foldVariants maps every rune of text to its canonical variant
+func foldVariants(text string, variants map[rune]rune) string {
+	return strings.Map(func(r rune) rune {
+		if canonical, ok := variants[r]; ok {
+			return canonical
+		}
+		return r
+	}, text)
+}
@@ -0,0 +1,33 @@
+package database
+
+import "testing"
+
+func TestFoldVariants(t *testing.T) {
+	variants := map[rune]rune{
+		'學': '学',
+		'圖': '図',
+		'图': '図',
+		'貓': '猫',
+	}
+
+	tests := []struct {
+		input    string
+		expected string
+	}{
+		{"學校", "学校"}, // Traditional → shinjitai
+		{"学校", "学校"}, // Already canonical
+		{"图", "図"},   // Simplified and traditional share a class
+		{"圖", "図"},
+		{"貓", "猫"},
+		{"食べる", "食べる"}, // Kana passes through
+		{"", ""},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			if got := foldVariants(tt.input, variants); got != tt.expected {
+				t.Errorf("foldVariants(%q) = %q, want %q", tt.input, got, tt.expected)
+			}
+		})
+	}
+}
@@ -0,0 +1,63 @@
+package kana
+
+import (
+	"regexp"
+	"strings"
+)
+
+// Katakana ァ..ヶ sit exactly 0x60 above hiragana ぁ..ゖ
+const katakanaOffset = 0x60
+
+// longVowels folds macron/circumflex vowels in typed Hepburn to the base vowel
+var longVowels = strings.NewReplacer(
+	"ā", "a", "ī", "i", "ū", "u", "ē", "e", "ō", "o",
+	"â", "a", "î", "i", "û", "u", "ê", "e", "ô", "o",
+)
+
+// syllabicM matches Hepburn's syllabic m before b/p/m (shimbun)
+var syllabicM = regexp.MustCompile(`m([bpm])`)
+
+// ToHiragana folds katakana to hiragana, leaving every other rune untouched
+// Matches the hiragana-folded japanese_forms rows (see to_hiragana in tridict/text.py)
+func ToHiragana(s string) string {
+	return strings.Map(func(r rune) rune {
+		if r >= 'ァ' && r <= 'ヶ' {
+			return r - katakanaOffset
+		}
+		return r
+	}, s)
+}
+
+// RomajiKey normalizes romaji input to the search key stored in
+// japanese_words.reading_romaji (see romaji_key in tridict/text.py)
+// e.g. "Tōkyō", "toukyou" and "tokyo" all become "tokyo", and "kōhī" and
+// "koohii" both become "kohi"
+func RomajiKey(input string) string {
+	input = longVowels.Replace(strings.ToLower(input))
+
+	var b strings.Builder
+	for _, r := range input {
+		if r >= 'a' && r <= 'z' {
+			b.WriteRune(r)
+		}
+	}
+
+	key := syllabicM.ReplaceAllString(b.String(), "n$1")
+	return collapseVowels(strings.ReplaceAll(key, "ou", "o"))
+}
+
+// collapseVowels folds runs of one vowel to a single vowel (aa, ii, uu, ee,
+// oo), so long vowels match whether typed doubled, with a macron or short
+func collapseVowels(key string) string {
+	var b strings.Builder
+	var previous byte
+	for i := 0; i < len(key); i++ {
+		c := key[i]
+		if c == previous && strings.IndexByte("aiueo", c) >= 0 {
+			continue
+		}
+		b.WriteByte(c)
+		previous = c
+	}
+	return b.String()
+}
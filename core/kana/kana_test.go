@@ -0,0 +1,56 @@
+package kana
+
+import "testing"
+
+func TestToHiragana(t *testing.T) {
+	tests := []struct {
+		input    string
+		expected string
+	}{
+		{"ネコ", "ねこ"},
+		{"キャット", "きゃっと"},
+		{"ねこ", "ねこ"},
+		{"猫", "猫"},
+		{"コンピューター", "こんぴゅーたー"}, // Long vowel mark is kept
+		{"cat", "cat"},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			if got := ToHiragana(tt.input); got != tt.expected {
+				t.Errorf("ToHiragana(%q) = %q, want %q", tt.input, got, tt.expected)
+			}
+		})
+	}
+}
+
+func TestRomajiKey(t *testing.T) {
+	tests := []struct {
+		input    string
+		expected string
+	}{
+		{"neko", "neko"},
+		{"Neko", "neko"},
+		{"tokyo", "tokyo"},
+		{"toukyou", "tokyo"},
+		{"Tōkyō", "tokyo"},
+		{"gakkou", "gakko"},
+		{"shimbun", "shinbun"},
+		{"shinbun", "shinbun"},
+		{"kin'en", "kinen"},
+		{"ookii", "oki"},
+		{"kōhī", "kohi"}, // コーヒー is stored as "kohi" too
+		{"koohii", "kohi"},
+		{"obaasan", "obasan"},
+		{"onēsan", "onesan"},
+		{"", ""},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			if got := RomajiKey(tt.input); got != tt.expected {
+				t.Errorf("RomajiKey(%q) = %q, want %q", tt.input, got, tt.expected)
+			}
+		})
+	}
+}
@@ -3,6 +3,7 @@ package pinyin
 import (
 	"regexp"
 	"strings"
+	"unicode"
 )
 
 // Tone mark mappings for each vowel
@@ -21,14 +22,37 @@ var toneMark = map[rune][]rune{
 	'Ü': {'Ǖ', 'Ǘ', 'Ǚ', 'Ǜ', 'Ü'},
 }
 
+// syllablePattern matches syllables with tone numbers: letters followed by 1-5
+var syllablePattern = regexp.MustCompile(`([a-zA-ZüÜ]+)([1-5])`)
+
+// keyFold maps every tone-marked vowel to its search key letter
+// (base vowel, or "v" for ü), built once from toneMark
+var keyFold = buildKeyFold()
+
+func buildKeyFold() map[rune]rune {
+	fold := make(map[rune]rune)
+	for base, marks := range toneMark {
+		key := unicode.ToLower(base)
+		if key == 'ü' {
+			key = 'v'
+		}
+		for _, m := range marks {
+			fold[m] = key
+		}
+	}
+	return fold
+}
+
 // NumberedToTones converts numbered pinyin (e.g., "ni3 hao3") to tone-marked pinyin (e.g., "nǐ hǎo")
+// Databases built by data/ingest.py store this form in chinese_words.pinyin_marked,
+// so this is only needed for rows without it
 func NumberedToTones(numbered string) string {
-	// Pattern matches syllables with tone numbers: word characters followed by 1-5
-	re := regexp.MustCompile(`([a-züÜ]+)([1-5])`)
+	// CC-CEDICT writes ü as "u:"
+	numbered = strings.NewReplacer("u:", "ü", "U:", "Ü").Replace(numbered)
 
-	result := re.ReplaceAllStringFunc(numbered, func(match string) string {
+	result := syllablePattern.ReplaceAllStringFunc(numbered, func(match string) string {
 		// Extract the syllable and tone number
-		parts := re.FindStringSubmatch(match)
+		parts := syllablePattern.FindStringSubmatch(match)
 		if len(parts) != 3 {
 			return match
 		}
@@ -43,6 +67,39 @@ func NumberedToTones(numbered string) string {
 	return result
 }
 
+// SearchKey normalizes pinyin in any spelling to the toneless, spaceless key
+// stored in chinese_words.pinyin_key (see pinyin_key in tridict/text.py)
+// e.g. "ni3 hao3", "nǐ hǎo", "Ni3hao3" and "nihao" all become "nihao"
+func SearchKey(input string) string {
+	input = strings.NewReplacer("u:", "v", "U:", "v").Replace(input)
+
+	var b strings.Builder
+	for _, r := range input {
+		if folded, ok := keyFold[r]; ok {
+			r = folded
+		}
+		r = unicode.ToLower(r)
+		if r >= 'a' && r <= 'z' {
+			b.WriteRune(r)
+		}
+	}
+	return b.String()
+}
+
+// HasTones reports whether input carries pinyin tone numbers or tone marks
+// ("ni3hao3", "nǐ hǎo"), which rules out romaji
+func HasTones(input string) bool {
+	for _, r := range input {
+		if r >= '1' && r <= '5' {
+			return true
+		}
+		if _, ok := keyFold[r]; ok && r > unicode.MaxASCII && r != 'ü' && r != 'Ü' {
+			return true
+		}
+	}
+	return false
+}
+
 // applyTone applies the tone mark to the correct vowel in a syllable
 // Rules for tone placement:
 // 1. If 'a' or 'e' is present, it takes the tone
@@ -0,0 +1,74 @@
+package pinyin
+
+import "testing"
+
+func TestNumberedToTones(t *testing.T) {
+	tests := []struct {
+		input    string
+		expected string
+	}{
+		{"mao1", "māo"},
+		{"ni3 hao3", "nǐ hǎo"},
+		{"xue2 xiao4", "xué xiào"},
+		{"peng2 you5", "péng you"},
+		{"gou3", "gǒu"},
+		{"liu2", "liú"},
+		{"lu:4", "lǜ"},
+		{"Bei3 jing1", "Běi jīng"},
+		{"māo", "māo"}, // Already tone-marked
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			if got := NumberedToTones(tt.input); got != tt.expected {
+				t.Errorf("NumberedToTones(%q) = %q, want %q", tt.input, got, tt.expected)
+			}
+		})
+	}
+}
+
+func TestHasTones(t *testing.T) {
+	tests := []struct {
+		input    string
+		expected bool
+	}{
+		{"ni3hao3", true},
+		{"nǐ hǎo", true},
+		{"nihao", false},
+		{"neko", false},
+		{"lü", false},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			if got := HasTones(tt.input); got != tt.expected {
+				t.Errorf("HasTones(%q) = %v, want %v", tt.input, got, tt.expected)
+			}
+		})
+	}
+}
+
+func TestSearchKey(t *testing.T) {
+	tests := []struct {
+		input    string
+		expected string
+	}{
+		{"nihao", "nihao"},
+		{"ni3hao3", "nihao"},
+		{"ni3 hao3", "nihao"},
+		{"nǐ hǎo", "nihao"},
+		{"Ni3 Hao3", "nihao"},
+		{"lu:4", "lv"},
+		{"lǜ", "lv"},
+		{"lv4", "lv"},
+		{"", ""},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			if got := SearchKey(tt.input); got != tt.expected {
+				t.Errorf("SearchKey(%q) = %q, want %q", tt.input, got, tt.expected)
+			}
+		})
+	}
+}
@@ -0,0 +1,81 @@
+package query
+
+import (
+	"fmt"
+	"strings"
+
+	"github.com/Chiarandini/trilingual-dict/core/database"
+	"github.com/Chiarandini/trilingual-dict/core/detector"
+	"github.com/Chiarandini/trilingual-dict/core/ranker"
+	"github.com/Chiarandini/trilingual-dict/core/types"
+)
+
+// examplesCandidates is how many matches are ranked to pick the word, as
+// many as a default-size lookup ranks
+const examplesCandidates = 5
+
+// Examples pages through every example sentence of the word a lookup of
+// input shows first (a Japanese or Chinese spelling), after the sentence ID
+// cursor (0 for the first page)
+// limit: sentences per page (0 = default 5)
+func Examples(db *database.DB, input string, after, limit int) (*types.ExamplePage, error) {
+	input = strings.TrimSpace(input)
+	if input == "" {
+		return nil, fmt.Errorf("empty query")
+	}
+
+	if limit == 0 {
+		limit = 5
+	}
+
+	language, wordID, err := topWord(db, input)
+	if err != nil {
+		return nil, err
+	}
+	if wordID == 0 {
+		return nil, fmt.Errorf("no Japanese or Chinese word matches %q", input)
+	}
+
+	page, err := db.GetExamplesPage(language, wordID, after, limit)
+	if err != nil {
+		return nil, err
+	}
+	return &page, nil
+}
+
+// topWord returns the language and ID of the first result Query shows for
+// Japanese or Chinese input, or ID 0 if nothing matches
+func topWord(db *database.DB, input string) (string, int, error) {
+	lang := detector.DetectLanguage(input)
+	if lang != "ja" && lang != "ambiguous" {
+		return "", 0, fmt.Errorf("examples need a Japanese or Chinese spelling, got %q", input)
+	}
+
+	jaWords, err := db.QueryJapanese(input, examplesCandidates)
+	if err != nil {
+		return "", 0, fmt.Errorf("japanese query failed: %w", err)
+	}
+	if len(jaWords) == 0 && lang == "ja" {
+		jaWords, err = db.QueryJapaneseByInflection(input, examplesCandidates)
+		if err != nil {
+			return "", 0, fmt.Errorf("inflection query failed: %w", err)
+		}
+	}
+	if len(jaWords) > 0 {
+		jaWords = ranker.ExactJapaneseFirst(ranker.RankJapanese(jaWords, examplesCandidates), input)
+		return "ja", jaWords[0].ID, nil
+	}
+	if lang == "ja" {
+		return "", 0, nil
+	}
+
+	zhWords, err := db.QueryChinese(input, examplesCandidates)
+	if err != nil {
+		return "", 0, fmt.Errorf("chinese query failed: %w", err)
+	}
+	if len(zhWords) > 0 {
+		zhWords = ranker.ExactChineseFirst(ranker.RankChinese(zhWords, examplesCandidates), input)
+		return "zh", zhWords[0].ID, nil
+	}
+	return "", 0, nil
+}
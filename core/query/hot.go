@@ -0,0 +1,104 @@
+package query
+
+import (
+	"bytes"
+	"encoding/json"
+	"fmt"
+
+	"github.com/Chiarandini/trilingual-dict/core/database"
+	"github.com/Chiarandini/trilingual-dict/core/types"
+)
+
+// hotResultsSize is the results per language of the responses stored in
+// hot_results (HOT_RESULTS_SIZE in data/hot_results.py)
+const hotResultsSize = 5
+
+// hotOutput is a stored LanguageOutput whose meta is decoded by language
+type hotOutput struct {
+	types.LanguageOutput
+	Meta json.RawMessage `json:"meta,omitempty"`
+}
+
+// hotResult answers input from the precomputed hot_results table, with
+// meta.query set to input as typed
+func hotResult(db *database.DB, input string) (*types.Response, bool, error) {
+	payload, ok, err := db.HotResult(input)
+	if err != nil || !ok {
+		return nil, false, err
+	}
+
+	var stored struct {
+		Meta    types.MetaInfo `json:"meta"`
+		Outputs []hotOutput    `json:"outputs"`
+	}
+	if err := json.Unmarshal([]byte(payload), &stored); err != nil {
+		return nil, false, fmt.Errorf("hot result for %q: %w", input, err)
+	}
+
+	response := &types.Response{
+		Meta:    types.MetaInfo{InputLanguage: stored.Meta.InputLanguage, Query: input},
+		Outputs: make([]types.LanguageOutput, 0, len(stored.Outputs)),
+	}
+	for _, o := range stored.Outputs {
+		output := o.LanguageOutput
+		if len(o.Meta) > 0 {
+			// CLI and server code type-assert Meta, so decode the concrete type
+			var meta interface{}
+			var err error
+			switch output.Language {
+			case "ja":
+				var m types.KanjiMeta
+				err = json.Unmarshal(o.Meta, &m)
+				meta = m
+			case "zh":
+				var m types.HanziMeta
+				err = json.Unmarshal(o.Meta, &m)
+				meta = m
+			}
+			if err != nil {
+				return nil, false, fmt.Errorf("hot result for %q: %w", input, err)
+			}
+			output.Meta = meta
+		}
+		response.Outputs = append(response.Outputs, output)
+	}
+
+	return response, true, nil
+}
+
+// StaleHotResults returns the hot_results keys whose stored response differs
+// from a live lookup of the key by this engine
+// data/hot_results.py stores what tridict (the Python port) answers, so any
+// drift between the two shows up here instead of only in -n 5 output
+func StaleHotResults(db *database.DB) ([]string, error) {
+	keys, err := db.HotResultKeys()
+	if err != nil {
+		return nil, err
+	}
+
+	var stale []string
+	for _, key := range keys {
+		stored, _, err := hotResult(db, key)
+		if err != nil {
+			return nil, err
+		}
+		live, err := lookup(db, key, hotResultsSize)
+		if err != nil {
+			return nil, fmt.Errorf("live lookup of %q: %w", key, err)
+		}
+
+		storedJSON, err := json.Marshal(stored)
+		if err != nil {
+			return nil, err
+		}
+		liveJSON, err := json.Marshal(live)
+		if err != nil {
+			return nil, err
+		}
+		if !bytes.Equal(storedJSON, liveJSON) {
+			stale = append(stale, key)
+		}
+	}
+
+	return stale, nil
+}
@@ -0,0 +1,70 @@
+package query
+
+import (
+	"encoding/json"
+	"testing"
+
+	"github.com/Chiarandini/trilingual-dict/core/database"
+)
+
+func openSampleDatabase(t *testing.T) *database.DB {
+	dbPath := findSampleDatabase(t)
+	if dbPath == "" {
+		t.Skip("Sample database not found - run: cd data/sample && python3 generate_samples.py")
+	}
+
+	db, err := database.Open(dbPath)
+	if err != nil {
+		t.Fatalf("Failed to open database: %v", err)
+	}
+	return db
+}
+
+func TestQueryServesHotResult(t *testing.T) {
+	db := openSampleDatabase(t)
+	defer db.Close()
+
+	// "cat" is a common gloss head, so the sample database stores it
+	if _, ok, err := db.HotResult("cat"); err != nil || !ok {
+		t.Fatalf("HotResult(cat) = %v, %v; want a stored payload", ok, err)
+	}
+
+	served, err := Query(db, "  Cat ", hotResultsSize)
+	if err != nil {
+		t.Fatalf("Query failed: %v", err)
+	}
+	if served.Meta.Query != "Cat" {
+		t.Errorf("meta.query = %q, want the input as typed", served.Meta.Query)
+	}
+
+	live, err := lookup(db, "Cat", hotResultsSize)
+	if err != nil {
+		t.Fatalf("lookup failed: %v", err)
+	}
+	servedJSON, _ := json.Marshal(served)
+	liveJSON, _ := json.Marshal(live)
+	if string(servedJSON) != string(liveJSON) {
+		t.Errorf("served hot result differs from live lookup:\n got %s\nwant %s", servedJSON, liveJSON)
+	}
+}
+
+func TestStaleHotResults(t *testing.T) {
+	db := openSampleDatabase(t)
+	defer db.Close()
+
+	keys, err := db.HotResultKeys()
+	if err != nil {
+		t.Fatalf("HotResultKeys failed: %v", err)
+	}
+	if len(keys) == 0 {
+		t.Fatal("sample database has no hot results")
+	}
+
+	stale, err := StaleHotResults(db)
+	if err != nil {
+		t.Fatalf("StaleHotResults failed: %v", err)
+	}
+	if len(stale) > 0 {
+		t.Errorf("%d of %d stored responses differ from live lookups: %q", len(stale), len(keys), stale)
+	}
+}
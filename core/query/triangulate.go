@@ -2,10 +2,12 @@ package query
 
 import (
 	"fmt"
+	"strconv"
 	"strings"
 
 	"github.com/Chiarandini/trilingual-dict/core/database"
 	"github.com/Chiarandini/trilingual-dict/core/detector"
+	"github.com/Chiarandini/trilingual-dict/core/kana"
 	"github.com/Chiarandini/trilingual-dict/core/pinyin"
 	"github.com/Chiarandini/trilingual-dict/core/ranker"
 	"github.com/Chiarandini/trilingual-dict/core/types"
@@ -24,6 +26,32 @@ func Query(db *database.DB, input string, maxResults int) (*types.Response, erro
 		maxResults = 5
 	}
 
+	// Default-size lookups of common queries were answered at build time
+	if maxResults == hotResultsSize {
+		if response, ok, err := hotResult(db, input); ok || err != nil {
+			return response, err
+		}
+	}
+
+	return lookup(db, input, maxResults)
+}
+
+// Live is Query without hot_results: every input is triangulated, so
+// benchmarks of common words time the lookup path rather than one read
+func Live(db *database.DB, input string, maxResults int) (*types.Response, error) {
+	input = strings.TrimSpace(input)
+	if input == "" {
+		return nil, fmt.Errorf("empty query")
+	}
+	if maxResults == 0 {
+		maxResults = 5
+	}
+
+	return lookup(db, input, maxResults)
+}
+
+// lookup triangulates a trimmed, non-empty input without consulting hot_results
+func lookup(db *database.DB, input string, maxResults int) (*types.Response, error) {
 	lang := detector.DetectLanguage(input)
 
 	response := &types.Response{
@@ -51,47 +79,174 @@ func Query(db *database.DB, input string, maxResults int) (*types.Response, erro
 	return response, err
 }
 
+// Containing lists Japanese and Chinese words whose headword contains every
+// kanji/hanzi of input (e.g. "猫" or "学校"), best rank first, without pivoting
+// maxResults: maximum number of results per language (0 = unlimited, default 5)
+func Containing(db *database.DB, input string, maxResults int) (*types.Response, error) {
+	return listWords(db, input, maxResults, db.QueryJapaneseContaining, db.QueryChineseContaining)
+}
+
+// ByRadical lists Japanese and Chinese words containing a character with the
+// given radical (e.g. "氵", "水" or Kangxi number "85"), best rank first
+// maxResults: maximum number of results per language (0 = unlimited, default 5)
+func ByRadical(db *database.DB, input string, maxResults int) (*types.Response, error) {
+	return listWords(db, input, maxResults, db.QueryJapaneseByRadical, db.QueryChineseByRadical)
+}
+
+// listWords runs one Japanese and one Chinese lookup and lists the ranked
+// results of both without pivoting through English
+func listWords(
+	db *database.DB,
+	input string,
+	maxResults int,
+	queryJapanese func(string, int) ([]types.JapaneseWord, error),
+	queryChinese func(string, int) ([]types.ChineseWord, error),
+) (*types.Response, error) {
+	input = strings.TrimSpace(input)
+	if input == "" {
+		return nil, fmt.Errorf("empty query")
+	}
+
+	if maxResults == 0 {
+		maxResults = 5
+	}
+
+	response := &types.Response{
+		Meta: types.MetaInfo{
+			InputLanguage: detector.DetectLanguage(input),
+			Query:         input,
+		},
+		Outputs: []types.LanguageOutput{},
+	}
+
+	jaWords, err := queryJapanese(input, maxResults)
+	if err != nil {
+		return nil, fmt.Errorf("japanese query failed: %w", err)
+	}
+	jaWords = ranker.RankJapanese(jaWords, maxResults)
+	if err := db.LoadJapaneseDetails(jaWords); err != nil {
+		return nil, fmt.Errorf("japanese details failed: %w", err)
+	}
+	for _, w := range jaWords {
+		response.Outputs = append(response.Outputs, japaneseToOutput(w))
+	}
+
+	zhWords, err := queryChinese(input, maxResults)
+	if err != nil {
+		return nil, fmt.Errorf("chinese query failed: %w", err)
+	}
+	zhWords = ranker.RankChinese(zhWords, maxResults)
+	if err := db.LoadChineseDetails(zhWords); err != nil {
+		return nil, fmt.Errorf("chinese details failed: %w", err)
+	}
+	for _, w := range zhWords {
+		response.Outputs = append(response.Outputs, chineseToOutput(w))
+	}
+
+	return response, nil
+}
+
 // queryFromEnglish searches from English to Japanese and Chinese
 func queryFromEnglish(db *database.DB, input string, response *types.Response, maxResults int) error {
 	// Query Japanese
-	jaWords, err := db.QueryJapaneseByEnglish(input)
+	jaWords, err := db.QueryJapaneseByEnglish(input, maxResults)
 	if err != nil {
 		return fmt.Errorf("japanese query failed: %w", err)
 	}
 
 	jaWords = ranker.RankJapanese(jaWords, maxResults)
+	if err := db.LoadJapaneseDetails(jaWords); err != nil {
+		return fmt.Errorf("japanese details failed: %w", err)
+	}
 	for _, w := range jaWords {
 		output := japaneseToOutput(w)
 		response.Outputs = append(response.Outputs, output)
 	}
 
 	// Query Chinese
-	zhWords, err := db.QueryChineseByEnglish(input)
+	zhWords, err := db.QueryChineseByEnglish(input, maxResults)
 	if err != nil {
 		return fmt.Errorf("chinese query failed: %w", err)
 	}
 
 	zhWords = ranker.RankChinese(zhWords, maxResults)
+	if err := db.LoadChineseDetails(zhWords); err != nil {
+		return fmt.Errorf("chinese details failed: %w", err)
+	}
 	for _, w := range zhWords {
 		output := chineseToOutput(w)
 		response.Outputs = append(response.Outputs, output)
 	}
 
+	// Romaji and pinyin are ASCII too; try them when no gloss matched
+	if len(response.Outputs) == 0 {
+		return queryFromRomanized(db, input, response, maxResults)
+	}
+
 	return nil
 }
 
+// queryFromRomanized handles ASCII input that matched no English gloss:
+// romaji ("neko") is tried first unless tone numbers/marks make it pinyin
+func queryFromRomanized(db *database.DB, input string, response *types.Response, maxResults int) error {
+	if !pinyin.HasTones(input) {
+		if err := queryFromRomaji(db, input, response, maxResults); err != nil {
+			return err
+		}
+		if len(response.Outputs) > 0 {
+			return nil
+		}
+	}
+
+	return queryFromPinyin(db, input, response, maxResults)
+}
+
+// queryFromRomaji searches Japanese words by the precomputed romaji reading
+// key, then pivots to Chinese
+func queryFromRomaji(db *database.DB, input string, response *types.Response, maxResults int) error {
+	key := kana.RomajiKey(input)
+	if key == "" {
+		return nil
+	}
+
+	jaWords, err := db.QueryJapaneseByRomaji(key, maxResults)
+	if err != nil {
+		return fmt.Errorf("romaji query failed: %w", err)
+	}
+
+	return addJapaneseWithPivot(db, jaWords, "", response, maxResults)
+}
+
 // queryFromJapanese searches from Japanese to English and Chinese (via English pivot)
 func queryFromJapanese(db *database.DB, input string, response *types.Response, maxResults int) error {
 	// Direct lookup in Japanese
-	jaWords, err := db.QueryJapanese(input, input)
+	jaWords, err := db.QueryJapanese(input, maxResults)
 	if err != nil {
 		return fmt.Errorf("japanese query failed: %w", err)
 	}
 
-	jaWords = ranker.RankJapanese(jaWords, maxResults)
+	// Conjugated input (食べました) resolves to its dictionary form
+	if len(jaWords) == 0 {
+		jaWords, err = db.QueryJapaneseByInflection(input, maxResults)
+		if err != nil {
+			return fmt.Errorf("inflection query failed: %w", err)
+		}
+	}
+
+	return addJapaneseWithPivot(db, jaWords, input, response, maxResults)
+}
+
+// addJapaneseWithPivot adds ranked Japanese results and their Chinese
+// equivalents (via the top result's first English gloss)
+// Words spelled exactly spelling ("" for none) rank ahead of folded matches
+func addJapaneseWithPivot(db *database.DB, jaWords []types.JapaneseWord, spelling string, response *types.Response, maxResults int) error {
+	jaWords = ranker.ExactJapaneseFirst(ranker.RankJapanese(jaWords, maxResults), spelling)
 	if len(jaWords) == 0 {
 		return nil
 	}
+	if err := db.LoadJapaneseDetails(jaWords); err != nil {
+		return fmt.Errorf("japanese details failed: %w", err)
+	}
 
 	// Add all Japanese results
 	for _, jaWord := range jaWords {
@@ -106,12 +261,15 @@ func queryFromJapanese(db *database.DB, input string, response *types.Response,
 
 	// Use first English gloss to find Chinese
 	if len(englishGlosses) > 0 {
-		zhWords, err := db.QueryChineseByEnglish(englishGlosses[0])
+		zhWords, err := db.QueryChineseByEnglish(englishGlosses[0], maxResults)
 		if err != nil {
 			return fmt.Errorf("chinese pivot query failed: %w", err)
 		}
 
 		zhWords = ranker.RankChinese(zhWords, maxResults)
+		if err := db.LoadChineseDetails(zhWords); err != nil {
+			return fmt.Errorf("chinese details failed: %w", err)
+		}
 		for _, w := range zhWords {
 			output := chineseToOutput(w)
 			response.Outputs = append(response.Outputs, output)
@@ -124,15 +282,41 @@ func queryFromJapanese(db *database.DB, input string, response *types.Response,
 // queryFromChinese searches from Chinese to English and Japanese (via English pivot)
 func queryFromChinese(db *database.DB, input string, response *types.Response, maxResults int) error {
 	// Direct lookup in Chinese
-	zhWords, err := db.QueryChinese(input)
+	zhWords, err := db.QueryChinese(input, maxResults)
 	if err != nil {
 		return fmt.Errorf("chinese query failed: %w", err)
 	}
 
-	zhWords = ranker.RankChinese(zhWords, maxResults)
+	return addChineseWithPivot(db, zhWords, input, response, maxResults)
+}
+
+// queryFromPinyin searches Chinese words by romanized input ("nihao", "ni3hao3",
+// "nǐ hǎo") via the precomputed pinyin search key, then pivots to Japanese
+func queryFromPinyin(db *database.DB, input string, response *types.Response, maxResults int) error {
+	key := pinyin.SearchKey(input)
+	if key == "" {
+		return nil
+	}
+
+	zhWords, err := db.QueryChineseByPinyin(key, maxResults)
+	if err != nil {
+		return fmt.Errorf("pinyin query failed: %w", err)
+	}
+
+	return addChineseWithPivot(db, zhWords, "", response, maxResults)
+}
+
+// addChineseWithPivot adds ranked Chinese results and their Japanese
+// equivalents (via the top result's first English gloss)
+// Words spelled exactly spelling ("" for none) rank ahead of folded matches
+func addChineseWithPivot(db *database.DB, zhWords []types.ChineseWord, spelling string, response *types.Response, maxResults int) error {
+	zhWords = ranker.ExactChineseFirst(ranker.RankChinese(zhWords, maxResults), spelling)
 	if len(zhWords) == 0 {
 		return nil
 	}
+	if err := db.LoadChineseDetails(zhWords); err != nil {
+		return fmt.Errorf("chinese details failed: %w", err)
+	}
 
 	// Add all Chinese results
 	for _, zhWord := range zhWords {
@@ -147,12 +331,15 @@ func queryFromChinese(db *database.DB, input string, response *types.Response, m
 
 	// Use first English gloss to find Japanese
 	if len(englishGlosses) > 0 {
-		jaWords, err := db.QueryJapaneseByEnglish(englishGlosses[0])
+		jaWords, err := db.QueryJapaneseByEnglish(englishGlosses[0], maxResults)
 		if err != nil {
 			return fmt.Errorf("japanese pivot query failed: %w", err)
 		}
 
 		jaWords = ranker.RankJapanese(jaWords, maxResults)
+		if err := db.LoadJapaneseDetails(jaWords); err != nil {
+			return fmt.Errorf("japanese details failed: %w", err)
+		}
 		for _, w := range jaWords {
 			output := japaneseToOutput(w)
 			response.Outputs = append(response.Outputs, output)
@@ -162,32 +349,24 @@ func queryFromChinese(db *database.DB, input string, response *types.Response, m
 	return nil
 }
 
-// queryAmbiguous tries both Japanese and Chinese
+// queryAmbiguous handles Han-only input, which may be Japanese or Chinese
+// Both lookups are script-folded, so each is a single probe whatever script
+// the input is in; Japanese wins when both match, and the matched rows are
+// used directly instead of being queried again
 func queryAmbiguous(db *database.DB, input string, response *types.Response, maxResults int) error {
-	// Try Japanese first
-	jaWords, err := db.QueryJapanese(input, input)
+	jaWords, err := db.QueryJapanese(input, maxResults)
 	if err != nil {
 		return fmt.Errorf("japanese query failed: %w", err)
 	}
-
-	// Try Chinese
-	zhWords, err := db.QueryChinese(input)
-	if err != nil {
-		return fmt.Errorf("chinese query failed: %w", err)
-	}
-
-	// If we have results from both, it's truly ambiguous
-	// Process as Japanese if found
 	if len(jaWords) > 0 {
-		return queryFromJapanese(db, input, response, maxResults)
+		return addJapaneseWithPivot(db, jaWords, input, response, maxResults)
 	}
 
-	// Otherwise try Chinese
-	if len(zhWords) > 0 {
-		return queryFromChinese(db, input, response, maxResults)
+	zhWords, err := db.QueryChinese(input, maxResults)
+	if err != nil {
+		return fmt.Errorf("chinese query failed: %w", err)
 	}
-
-	return nil
+	return addChineseWithPivot(db, zhWords, input, response, maxResults)
 }
 
 // Helper functions to convert database types to output types
@@ -223,7 +402,7 @@ func japaneseToOutput(w types.JapaneseWord) types.LanguageOutput {
 	// Add kanji metadata
 	meta := types.KanjiMeta{}
 	if w.JLPTLevel != nil {
-		meta.JLPTLevel = *w.JLPTLevel
+		meta.JLPTLevel = fmt.Sprintf("N%d", *w.JLPTLevel)
 	}
 	if w.StrokeCount != nil {
 		meta.StrokeCount = *w.StrokeCount
@@ -247,10 +426,16 @@ func chineseToOutput(w types.ChineseWord) types.LanguageOutput {
 	}
 	definition := strings.Join(definitions, "; ")
 
+	// Tone-marked pinyin is precomputed at ingest; convert only for older rows
+	reading := pinyin.NumberedToTones(w.Pinyin)
+	if w.PinyinMarked != nil {
+		reading = *w.PinyinMarked
+	}
+
 	output := types.LanguageOutput{
 		Language:   "zh",
 		Headword:   w.Simplified,
-		Reading:    pinyin.NumberedToTones(w.Pinyin), // Convert numbered pinyin to tone marks
+		Reading:    reading,
 		Definition: definition,
 		Examples:   w.Examples,
 	}
@@ -272,7 +457,7 @@ func chineseToOutput(w types.ChineseWord) types.LanguageOutput {
 		Traditional: w.Traditional,
 	}
 	if w.HSKLevel != nil {
-		meta.HSKLevel = *w.HSKLevel
+		meta.HSKLevel = strconv.Itoa(*w.HSKLevel)
 	}
 	if w.StrokeCount != nil {
 		meta.StrokeCount = *w.StrokeCount
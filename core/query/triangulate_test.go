@@ -71,7 +71,7 @@ func TestQuery(t *testing.T) {
 
 	for _, tt := range tests {
 		t.Run(tt.name, func(t *testing.T) {
-			result, err := Query(db, tt.input)
+			result, err := Query(db, tt.input, 5)
 
 			if tt.wantOutputs == -1 {
 				// Expect error
@@ -146,7 +146,7 @@ func TestQueryFromEnglish(t *testing.T) {
 		Outputs: []types.LanguageOutput{},
 	}
 
-	err = queryFromEnglish(db, "cat", response)
+	err = queryFromEnglish(db, "cat", response, 5)
 	if err != nil {
 		t.Fatalf("queryFromEnglish failed: %v", err)
 	}
@@ -192,7 +192,7 @@ func TestQueryFromJapanese(t *testing.T) {
 		Outputs: []types.LanguageOutput{},
 	}
 
-	err = queryFromJapanese(db, "ねこ", response)
+	err = queryFromJapanese(db, "ねこ", response, 5)
 	if err != nil {
 		t.Fatalf("queryFromJapanese failed: %v", err)
 	}
@@ -235,7 +235,7 @@ func TestQueryFromChinese(t *testing.T) {
 		Outputs: []types.LanguageOutput{},
 	}
 
-	err = queryFromChinese(db, "猫", response)
+	err = queryFromChinese(db, "猫", response, 5)
 	if err != nil {
 		t.Fatalf("queryFromChinese failed: %v", err)
 	}
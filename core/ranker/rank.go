@@ -13,8 +13,8 @@ func RankJapanese(words []types.JapaneseWord, maxResults int) []types.JapaneseWo
 		return words
 	}
 
-	// Sort by priority
-	sort.Slice(words, func(i, j int) bool {
+	// Sort by priority, keeping the query's order (id) between equal scores
+	sort.SliceStable(words, func(i, j int) bool {
 		return japaneseScore(words[i]) > japaneseScore(words[j])
 	})
 
@@ -32,8 +32,8 @@ func RankChinese(words []types.ChineseWord, maxResults int) []types.ChineseWord
 		return words
 	}
 
-	// Sort by priority
-	sort.Slice(words, func(i, j int) bool {
+	// Sort by priority, keeping the query's order (id) between equal scores
+	sort.SliceStable(words, func(i, j int) bool {
 		return chineseScore(words[i]) > chineseScore(words[j])
 	})
 
@@ -44,6 +44,28 @@ func RankChinese(words []types.ChineseWord, maxResults int) []types.ChineseWord
 	return words[:maxResults]
 }
 
+// ExactJapaneseFirst moves words whose headword is spelled exactly input
+// ahead of the rest, keeping rank order within both groups, so a
+// script-folded match (乾 for 幹) never outranks the word that was typed
+func ExactJapaneseFirst(words []types.JapaneseWord, input string) []types.JapaneseWord {
+	sort.SliceStable(words, func(i, j int) bool {
+		return words[i].Headword == input && words[j].Headword != input
+	})
+	return words
+}
+
+// ExactChineseFirst moves words spelled exactly input, simplified or
+// traditional, ahead of the rest, keeping rank order within both groups
+func ExactChineseFirst(words []types.ChineseWord, input string) []types.ChineseWord {
+	exact := func(w types.ChineseWord) bool {
+		return w.Simplified == input || w.Traditional == input
+	}
+	sort.SliceStable(words, func(i, j int) bool {
+		return exact(words[i]) && !exact(words[j])
+	})
+	return words
+}
+
 // japaneseScore calculates priority score for a Japanese word
 // Higher score = better match
 func japaneseScore(w types.JapaneseWord) int {
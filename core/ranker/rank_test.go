@@ -70,7 +70,7 @@ func TestRankJapanese(t *testing.T) {
 
 	for _, tt := range tests {
 		t.Run(tt.name, func(t *testing.T) {
-			result := RankJapanese(tt.words)
+			result := RankJapanese(tt.words, 1)
 
 			if tt.expectEmpty {
 				if len(result) != 0 {
@@ -123,8 +123,8 @@ func TestRankChinese(t *testing.T) {
 		{
 			name: "HSK 1 ranked higher than HSK 6",
 			words: []types.ChineseWord{
-				{ID: 1, Simplified: "挑战", IsCommon: true, FrequencyRank: intPtr(600), HSKLevel: strPtr("6")},
-				{ID: 2, Simplified: "猫", IsCommon: true, FrequencyRank: intPtr(200), HSKLevel: strPtr("1")},
+				{ID: 1, Simplified: "挑战", IsCommon: true, FrequencyRank: intPtr(600), HSKLevel: intPtr(6)},
+				{ID: 2, Simplified: "猫", IsCommon: true, FrequencyRank: intPtr(200), HSKLevel: intPtr(1)},
 			},
 			expectedTop: "猫",
 		},
@@ -132,7 +132,7 @@ func TestRankChinese(t *testing.T) {
 
 	for _, tt := range tests {
 		t.Run(tt.name, func(t *testing.T) {
-			result := RankChinese(tt.words)
+			result := RankChinese(tt.words, 1)
 
 			if len(result) != 1 {
 				t.Fatalf("Expected 1 result (top-ranked), got %d", len(result))
@@ -145,11 +145,30 @@ func TestRankChinese(t *testing.T) {
 	}
 }
 
+func TestExactFirst(t *testing.T) {
+	// 乾 and 干 share 幹's script_key but are more common; the typed
+	// spelling still comes first
+	ja := RankJapanese([]types.JapaneseWord{
+		{ID: 1, Headword: "幹", IsCommon: false},
+		{ID: 2, Headword: "乾", IsCommon: true, FrequencyRank: intPtr(100)},
+		{ID: 3, Headword: "干", IsCommon: true, FrequencyRank: intPtr(50)},
+	}, 0)
+	ja = ExactJapaneseFirst(ja, "幹")
+	if got := [3]string{ja[0].Headword, ja[1].Headword, ja[2].Headword}; got != [3]string{"幹", "干", "乾"} {
+		t.Errorf("ExactJapaneseFirst order = %v, want [幹 干 乾]", got)
+	}
+
+	zh := RankChinese([]types.ChineseWord{
+		{ID: 1, Simplified: "干", Traditional: "乾", IsCommon: true, FrequencyRank: intPtr(50)},
+		{ID: 2, Simplified: "干", Traditional: "幹", IsCommon: false},
+	}, 0)
+	zh = ExactChineseFirst(zh, "幹")
+	if zh[0].ID != 2 || zh[1].ID != 1 {
+		t.Errorf("ExactChineseFirst order = [%d %d], want [2 1]", zh[0].ID, zh[1].ID)
+	}
+}
+
 // Helper functions
 func intPtr(i int) *int {
 	return &i
 }
-
-func strPtr(s string) *string {
-	return &s
-}
@@ -37,6 +37,21 @@ type Example struct {
 	EnglishText string `json:"english_text"`
 }
 
+// ExamplePage is one page of a word's example sentences. Pass NextCursor
+// back to fetch the next page; it is 0 on the last one
+type ExamplePage struct {
+	Examples   []Example `json:"examples"`
+	NextCursor int       `json:"next_cursor,omitempty"`
+}
+
+// Completion is a typeahead suggestion for a typed prefix
+type Completion struct {
+	Language string `json:"language"` // "ja", "zh" or "en"
+	Text     string `json:"text"`
+	Detail   string `json:"detail,omitempty"` // reading or tone-marked pinyin
+	Rank     int    `json:"rank"`
+}
+
 // KanjiMeta contains Japanese character metadata
 type KanjiMeta struct {
 	JLPTLevel   string `json:"jlpt_level,omitempty"`
@@ -64,9 +79,9 @@ type JapaneseWord struct {
 	Reading       string
 	IsCommon      bool
 	FrequencyRank *int
-	JLPTLevel     *string
+	JLPTLevel     *int // N-level number (5 = N5)
 	StrokeCount   *int
-	Components    *string
+	Components    *string // from japanese_word_details, see LoadJapaneseDetails
 	StrokeSVG     *string
 	Definitions   []JapaneseDefinition
 	Examples      []Example
@@ -86,11 +101,12 @@ type ChineseWord struct {
 	Simplified    string
 	Traditional   string
 	Pinyin        string
+	PinyinMarked  *string
 	IsCommon      bool
 	FrequencyRank *int
-	HSKLevel      *string
+	HSKLevel      *int
 	StrokeCount   *int
-	Components    *string
+	Components    *string // from chinese_word_details, see LoadChineseDetails
 	Decomposition *string
 	StrokeSVG     *string
 	Definitions   []ChineseDefinition
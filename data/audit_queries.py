@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""EXPLAIN QUERY PLAN audit of the SQL shipped to the frontends.
+
+QUERIES is a registry of every statement issued by
+core/database/queries.go (go), web/src/app/services/dictionary.service.ts
+(web) and ios/TriDict/TriDict/DatabaseManager.swift (ios), copied
+verbatim apart from LIMIT values. Each one is planned against a built
+database and run with sample parameters taken from that database. The
+audit reports:
+
+- SCAN: a full pass over a table or index. The build fails unless the
+  entry carries an allow_scan reason.
+- TEMP B-TREE: a sort or DISTINCT that no index provides, which is
+  usually fine on a handful of rows.
+- NOT COVERING: index searches that still read the table row.
+
+An entry must be added or updated whenever a frontend query changes.
+
+Usage:
+    python3 audit_queries.py --db dictionary.db
+    python3 audit_queries.py --db dictionary.db --runs 50 --verbose
+"""
+
+import argparse
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+JAPANESE_COLUMNS = '''
+    SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
+           stroke_count
+    FROM japanese_words'''
+
+CHINESE_COLUMNS = '''
+    SELECT id, simplified, traditional, pinyin, pinyin_marked, is_common,
+           frequency_rank, hsk_level, stroke_count
+    FROM chinese_words'''
+
+# English gloss match shared by the *ByEnglish queries of all frontends
+GLOSS_MATCH = '''
+    WHERE LOWER(g.text) = LOWER(?)
+       OR LOWER(g.text) LIKE LOWER(?) || ' (%'
+       OR LOWER(g.text) LIKE LOWER(?) || ';%'
+       OR LOWER(g.text) LIKE '%;' || LOWER(?)
+       OR LOWER(g.text) LIKE '%; ' || LOWER(?) || ';%'
+    ORDER BY
+       w.rank_score DESC,
+       CASE
+         WHEN LOWER(g.text) = LOWER(?) THEN 0
+         WHEN LOWER(g.text) LIKE LOWER(?) || ' (%' THEN 1
+         WHEN LOWER(g.text) LIKE LOWER(?) || ';%' THEN 2
+         ELSE 3
+       END,
+       w.id
+    LIMIT ?'''
+
+GLOSS_PARAMS = (':gloss',) * 8 + (5,)
+
+CHAR_INDEX_FILTER = '''
+    SELECT word_id FROM char_index
+    WHERE lang = ? AND char IN (?)
+    GROUP BY word_id
+    HAVING COUNT(DISTINCT char) = ?'''
+
+RADICAL_FILTER = '''
+    SELECT ci.word_id
+    FROM kanji_components kc
+    JOIN char_index ci ON ci.char = kc.kanji AND ci.lang = ?
+    WHERE kc.radical_number = (SELECT number FROM radicals WHERE form = ?)'''
+
+# name, sources, sql, params, allow_scan. A ':name' param is replaced by the
+# sample value of that name (see load_samples).
+QUERIES = (
+    ('japanese_by_form', ('go QueryJapanese',), JAPANESE_COLUMNS + '''
+        WHERE id IN (
+            SELECT word_id FROM japanese_forms WHERE form IN (?, ?)
+            UNION
+            SELECT id FROM japanese_words WHERE script_key = ?
+        )
+        ORDER BY headword = ? DESC, rank_score DESC, id
+        LIMIT ?''', (':headword', ':reading', ':ja_script_key', ':headword', 5), None),
+    ('japanese_by_form_single', ('web queryJapanese', 'ios queryJapanese'), JAPANESE_COLUMNS + '''
+        WHERE id IN (
+            SELECT word_id FROM japanese_forms WHERE form IN (?, ?)
+            UNION
+            SELECT id FROM japanese_words WHERE script_key = ?
+        )
+        ORDER BY headword = ? DESC, rank_score DESC, id
+        LIMIT 1''', (':headword', ':reading', ':ja_script_key', ':headword'), None),
+    ('japanese_by_inflection', ('go QueryJapaneseByInflection',), JAPANESE_COLUMNS + '''
+        WHERE id IN (SELECT word_id FROM japanese_inflections WHERE surface IN (?, ?))
+        ORDER BY rank_score DESC, id
+        LIMIT ?''', (':surface', ':surface', 5), None),
+    ('japanese_by_inflection_single',
+     ('web queryJapaneseByInflection', 'ios queryJapaneseByInflection'), JAPANESE_COLUMNS + '''
+        WHERE id IN (SELECT word_id FROM japanese_inflections WHERE surface IN (?, ?))
+        ORDER BY rank_score DESC, id
+        LIMIT 1''', (':surface', ':surface'), None),
+    ('japanese_by_romaji', ('go QueryJapaneseByRomaji',), JAPANESE_COLUMNS + '''
+        WHERE reading_romaji = ?
+        ORDER BY rank_score DESC, id
+        LIMIT ?''', (':romaji', 5), None),
+    ('japanese_containing', ('go QueryJapaneseContaining',), JAPANESE_COLUMNS + '''
+        WHERE id IN (''' + CHAR_INDEX_FILTER + ''')
+        ORDER BY rank_score DESC, id
+        LIMIT ?''', ('ja', ':ja_char', 1, 5), None),
+    ('japanese_by_radical', ('go QueryJapaneseByRadical', 'web queryJapaneseByRadical'),
+     JAPANESE_COLUMNS + '''
+        WHERE id IN (''' + RADICAL_FILTER + ''')
+        ORDER BY rank_score DESC, id
+        LIMIT ?''', ('ja', ':radical', 20), None),
+    ('japanese_by_english',
+     ('go QueryJapaneseByEnglish', 'web queryJapaneseByEnglish', 'ios queryJapaneseByEnglish'), '''
+        SELECT DISTINCT w.id, w.headword, w.reading, w.is_common, w.frequency_rank,
+               w.jlpt_level, w.stroke_count
+        FROM japanese_words w
+        JOIN japanese_definitions d ON w.id = d.word_id
+        JOIN glosses g ON g.id = d.gloss_id''' + GLOSS_MATCH, GLOSS_PARAMS,
+     "LIKE on LOWER(text) can't use an index; every gloss is tested"),
+    ('chinese_by_script_key', ('go QueryChinese', 'web queryChinese', 'ios queryChinese'),
+     CHINESE_COLUMNS + '''
+        WHERE script_key = ?
+        ORDER BY (simplified = ? OR traditional = ?) DESC, rank_score DESC, id
+        LIMIT ?''', (':zh_script_key', ':simplified', ':simplified', 5), None),
+    ('chinese_by_pinyin', ('go QueryChineseByPinyin',), CHINESE_COLUMNS + '''
+        WHERE pinyin_key = ?
+        ORDER BY rank_score DESC, id
+        LIMIT ?''', (':pinyin_key', 5), None),
+    ('chinese_containing', ('go QueryChineseContaining',), CHINESE_COLUMNS + '''
+        WHERE id IN (''' + CHAR_INDEX_FILTER + ''')
+        ORDER BY rank_score DESC, id
+        LIMIT ?''', ('zh', ':zh_char', 1, 5), None),
+    ('chinese_by_radical', ('go QueryChineseByRadical', 'web queryChineseByRadical'),
+     CHINESE_COLUMNS + '''
+        WHERE id IN (''' + RADICAL_FILTER + ''')
+        ORDER BY rank_score DESC, id
+        LIMIT ?''', ('zh', ':radical', 20), None),
+    ('chinese_by_english',
+     ('go QueryChineseByEnglish', 'web queryChineseByEnglish', 'ios queryChineseByEnglish'), '''
+        SELECT DISTINCT w.id, w.simplified, w.traditional, w.pinyin, w.pinyin_marked,
+               w.is_common, w.frequency_rank, w.hsk_level, w.stroke_count
+        FROM chinese_words w
+        JOIN chinese_definitions d ON w.id = d.word_id
+        JOIN glosses g ON g.id = d.gloss_id''' + GLOSS_MATCH, GLOSS_PARAMS,
+     "LIKE on LOWER(text) can't use an index; every gloss is tested"),
+    ('japanese_definitions',
+     ('go GetJapaneseDefinitions', 'web getJapaneseDefinitions', 'ios getJapaneseDefinitions'), '''
+        SELECT d.id, d.word_id, g.text, d.pos
+        FROM japanese_definitions d
+        JOIN glosses g ON g.id = d.gloss_id
+        WHERE d.word_id = ?
+        ORDER BY d.id''', (':ja_id',), None),
+    ('chinese_definitions',
+     ('go GetChineseDefinitions', 'web getChineseDefinitions', 'ios getChineseDefinitions'), '''
+        SELECT d.id, d.word_id, g.text
+        FROM chinese_definitions d
+        JOIN glosses g ON g.id = d.gloss_id
+        WHERE d.word_id = ?
+        ORDER BY d.id''', (':zh_id',), None),
+    ('examples', ('go GetExamples', 'web getExamples', 'ios getExamples'), '''
+        SELECT s.text, COALESCE(s.english, '')
+        FROM example_links l
+        JOIN sentences s ON s.id = l.sentence_id
+        WHERE l.lang = ? AND l.word_id = ?
+        ORDER BY l.score DESC
+        LIMIT 5''', ('ja', ':ja_id'), None),
+    ('examples_page', ('go GetExamplesPage',), '''
+        SELECT t.sentence_id, s.text, COALESCE(s.english, '')
+        FROM sentence_terms t
+        JOIN sentences s ON s.id = t.sentence_id
+        WHERE t.lang = ? AND t.word_id = ? AND t.sentence_id > ?
+        ORDER BY t.sentence_id
+        LIMIT ?''', ('ja', ':ja_id', 0, 21), None),
+    ('japanese_details', ('go LoadJapaneseDetails', 'web getDetails', 'ios getWordDetails'), '''
+        SELECT word_id, components, stroke_svg
+        FROM japanese_word_details
+        WHERE word_id IN (?)''', (':ja_id',), None),
+    ('chinese_details', ('go LoadChineseDetails', 'web getDetails', 'ios getWordDetails'), '''
+        SELECT word_id, components, decomposition, stroke_svg
+        FROM chinese_word_details
+        WHERE word_id IN (?)''', (':zh_id',), None),
+    ('completions_hot', ('go QueryCompletions', 'web getCompletions'), '''
+        SELECT lang, display, detail, rank_score
+        FROM autocomplete_top
+        WHERE prefix = ?
+        ORDER BY slot
+        LIMIT ?''', (':hot_prefix', 10), None),
+    ('completions_range', ('go QueryCompletions', 'web getCompletions'), '''
+        SELECT lang, display, detail, rank_score
+        FROM autocomplete_keys
+        WHERE key >= ? AND key < ?
+        ORDER BY rank_score DESC, key
+        LIMIT ?''', (':prefix', ':prefix_end', 10), None),
+    ('hot_results', ('go HotResult', 'web hotResult', 'ios hotResult'),
+     'SELECT payload FROM hot_results WHERE query_key = ?', (':hot_key',), None),
+    ('char_variants', ('go loadVariants', 'web scriptKey', 'ios loadVariants'),
+     'SELECT char, canonical FROM char_variants', (),
+     'loaded whole into memory once per connection'),
+)
+
+# Plan lines name a table by its alias when it has one; subqueries show up
+# as "(subquery-N)" and single-row selects as "CONSTANT ROW"
+SCAN_PATTERN = re.compile(r'^SCAN (?!CONSTANT ROW)\w+')
+SEARCH_PATTERN = re.compile(r'^SEARCH \w+ USING (COVERING |PRIMARY KEY|INTEGER PRIMARY KEY)?')
+
+
+def load_samples(cursor) -> dict:
+    """Realistic parameter values from the database: the best-ranked word, its gloss, ..."""
+    def first(sql, default=None):
+        try:
+            cursor.execute(sql)
+        except sqlite3.OperationalError:
+            return default
+        row = cursor.fetchone()
+        return row[0] if row and row[0] is not None else default
+
+    samples = {}
+    cursor.execute('''
+        SELECT id, headword, reading, script_key, reading_romaji FROM japanese_words
+        ORDER BY rank_score DESC LIMIT 1
+    ''')
+    row = cursor.fetchone() or (0, '', '', '', '')
+    samples.update(zip(('ja_id', 'headword', 'reading', 'ja_script_key', 'romaji'), row))
+    cursor.execute('''
+        SELECT id, simplified, script_key, pinyin_key FROM chinese_words
+        ORDER BY rank_score DESC LIMIT 1
+    ''')
+    row = cursor.fetchone() or (0, '', '', '')
+    samples.update(zip(('zh_id', 'simplified', 'zh_script_key', 'pinyin_key'), row))
+
+    samples['gloss'] = first(f'''
+        SELECT g.text FROM japanese_definitions d JOIN glosses g ON g.id = d.gloss_id
+        WHERE d.word_id = {int(samples['ja_id'])} ORDER BY d.id LIMIT 1
+    ''', 'cat')
+    samples['surface'] = first('SELECT surface FROM japanese_inflections LIMIT 1', '')
+    samples['ja_char'] = first("SELECT char FROM char_index WHERE lang = 'ja' LIMIT 1", '')
+    samples['zh_char'] = first("SELECT char FROM char_index WHERE lang = 'zh' LIMIT 1", '')
+    samples['radical'] = first('''
+        SELECT r.form FROM radicals r
+        WHERE r.number IN (SELECT radical_number FROM kanji_components)
+        LIMIT 1
+    ''', '水')
+    samples['hot_prefix'] = first('SELECT prefix FROM autocomplete_top LIMIT 1', 'a')
+    samples['hot_key'] = first('SELECT query_key FROM hot_results LIMIT 1', 'cat')
+    samples['prefix'] = first('SELECT SUBSTR(key, 1, 3) FROM autocomplete_keys LIMIT 1', 'abc')
+    samples['prefix_end'] = samples['prefix'] + '\U0010FFFF'
+    return samples
+
+
+def bind(params, samples) -> tuple:
+    return tuple(samples[p[1:]] if isinstance(p, str) and p.startswith(':') else p
+                 for p in params)
+
+
+def analyse(plan) -> dict:
+    """Classify EXPLAIN QUERY PLAN details into scans, temp B-trees and non-covering searches."""
+    findings = {'scan': [], 'temp': [], 'not_covering': []}
+    for detail in plan:
+        if SCAN_PATTERN.match(detail):
+            findings['scan'].append(detail)
+            continue
+        search = SEARCH_PATTERN.match(detail)
+        if search and search.group(1) is None:
+            findings['not_covering'].append(detail)
+        if 'TEMP B-TREE' in detail:
+            findings['temp'].append(detail)
+    return findings
+
+
+def audit(db_path: Path, runs: int, verbose: bool) -> int:
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+    samples = load_samples(cursor)
+
+    failures = []
+    print(f"Query plan audit: {db_path}")
+    print(f"  {'query':<32}{'p50 ms':>9}{'max ms':>9}  findings")
+    for name, sources, sql, params, allow_scan in QUERIES:
+        args = bind(params, samples)
+        try:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, args)
+        except sqlite3.OperationalError as e:
+            failures.append((name, f'does not prepare: {e}'))
+            print(f"  {name:<32}{'-':>9}{'-':>9}  ✗ {e}")
+            continue
+        plan = [row[3] for row in cursor.fetchall()]
+        findings = analyse(plan)
+
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            cursor.execute(sql, args).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        notes = []
+        if findings['scan']:
+            notes.append('SCAN (allowed)' if allow_scan else '✗ SCAN')
+            if not allow_scan:
+                failures.append((name, '; '.join(findings['scan'])))
+        if findings['temp']:
+            notes.append('TEMP B-TREE')
+        if findings['not_covering']:
+            notes.append('NOT COVERING')
+        print(f"  {name:<32}{statistics.median(timings):>9.3f}{max(timings):>9.3f}  "
+              f"{', '.join(notes) or 'ok'}")
+        if verbose:
+            print(f"      sources: {', '.join(sources)}")
+            if allow_scan and findings['scan']:
+                print(f"      allowed: {allow_scan}")
+            for detail in plan:
+                print(f"      {detail}")
+
+    conn.close()
+
+    if failures:
+        print(f"\n✗ {len(failures)} queries scan a table without an allow_scan reason:")
+        for name, reason in failures:
+            print(f"  {name}: {reason}")
+        return 1
+    print(f"\n✓ {len(QUERIES)} queries audited, no unexpected scans")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit frontend SQL against a built database')
+    parser.add_argument('--db', default='dictionary.db',
+                        help='Database path (default: dictionary.db)')
+    parser.add_argument('--runs', type=int, default=20,
+                        help='Timed runs per query (default: 20)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Print sources and the full plan of every query')
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"Error: Database not found: {db_path}")
+        return 1
+
+    return audit(db_path, max(1, args.runs), args.verbose)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
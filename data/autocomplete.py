@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Prefix autocomplete index for as-you-type suggestions.
+
+Every searchable key is stored once in autocomplete_keys, normalized the
+same way the query side normalizes a typed prefix:
+
+- ja: headword, hiragana-folded reading and romaji key
+- zh: simplified, traditional and toneless pinyin key
+- en: each gloss term ("to eat" is also keyed as "eat")
+
+The table is WITHOUT ROWID and keyed on (key, lang, display), so a prefix
+is a single range scan `key >= prefix AND key < prefix || U+10FFFF` that
+never touches another table. Short prefixes match too many keys to sort
+per keystroke, so their top completions are precomputed into
+autocomplete_top (prefix, slot) at build time.
+
+Usage (benchmark, p99 latency per keystroke):
+    python3 autocomplete.py --db dictionary.db --words 2000
+"""
+
+import argparse
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from kana import to_hiragana
+
+# Prefixes up to this many characters are answered from autocomplete_top
+HOT_PREFIX_CHARS = 2
+
+# Completions precomputed per hot prefix
+TOP_COMPLETIONS = 10
+
+# Sorts after every code point in SQLite's BINARY (UTF-8 byte) order
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+GLOSS_SPLIT_PATTERN = re.compile(r'\s*;\s*')
+GLOSS_QUALIFIER_PATTERN = re.compile(r'\s*\(.*$')
+
+
+def normalize_key(text: str) -> str:
+    """Normalize a key or typed prefix: lowercase, katakana folded to hiragana."""
+    return to_hiragana(text.strip().lower())
+
+
+def gloss_terms(gloss: str) -> list:
+    """Split a gloss into completable terms.
+
+    "cat (animal); feline" → ["cat", "feline"]; verb glosses are also
+    keyed without their "to " so typing "ea" reaches "to eat".
+    """
+    terms = []
+    for part in GLOSS_SPLIT_PATTERN.split(gloss):
+        term = GLOSS_QUALIFIER_PATTERN.sub('', part).strip()
+        if term:
+            terms.append(term)
+    return terms
+
+
+def _collect_keys(cursor) -> dict:
+    """Map (key, lang, display) → (detail, rank_score), keeping the best rank."""
+    best = {}
+
+    def add(key, lang, display, detail, score):
+        key = normalize_key(key or '')
+        if not key:
+            return
+        current = best.get((key, lang, display))
+        if current is None or score > current[1]:
+            best[(key, lang, display)] = (detail, score)
+
+    cursor.execute('SELECT headword, reading, reading_romaji, rank_score FROM japanese_words')
+    for headword, reading, reading_romaji, score in cursor.fetchall():
+        for key in (headword, reading, reading_romaji):
+            add(key, 'ja', headword, reading, score)
+
+    cursor.execute('''
+        SELECT simplified, traditional, COALESCE(pinyin_marked, pinyin), pinyin_key, rank_score
+        FROM chinese_words
+    ''')
+    for simplified, traditional, pinyin, key_pinyin, score in cursor.fetchall():
+        for key in (simplified, traditional, key_pinyin):
+            add(key, 'zh', simplified, pinyin, score)
+
+    cursor.execute('''
+        SELECT g.text, w.rank_score
+        FROM japanese_definitions d
+        JOIN japanese_words w ON w.id = d.word_id
+        JOIN glosses g ON g.id = d.gloss_id
+        UNION ALL
+        SELECT g.text, w.rank_score
+        FROM chinese_definitions d
+        JOIN chinese_words w ON w.id = d.word_id
+        JOIN glosses g ON g.id = d.gloss_id
+    ''')
+    for gloss, score in cursor.fetchall():
+        for term in gloss_terms(gloss):
+            add(term, 'en', term, None, score)
+            if term.lower().startswith('to '):
+                add(term[3:], 'en', term, None, score)
+
+    return best
+
+
+def build_autocomplete(cursor) -> int:
+    """(Re)build autocomplete_keys and autocomplete_top from the word tables.
+
+    Returns the number of keys written.
+    """
+    best = _collect_keys(cursor)
+
+    cursor.execute('DELETE FROM autocomplete_keys')
+    cursor.execute('DELETE FROM autocomplete_top')
+
+    rows = sorted(
+        ((key, lang, display, detail, score) for (key, lang, display), (detail, score) in best.items()),
+        key=lambda row: row[0],
+    )
+    cursor.executemany('''
+        INSERT INTO autocomplete_keys (key, lang, display, detail, rank_score)
+        VALUES (?, ?, ?, ?, ?)
+    ''', rows)
+
+    # Walk keys best-first and fill each short prefix's slots until full, so
+    # memory stays bounded by (hot prefixes × TOP_COMPLETIONS)
+    rows.sort(key=lambda row: (-row[4], row[0], row[1], row[2]))
+    slots = {}
+    seen = {}
+    top_rows = []
+    for key, lang, display, detail, score in rows:
+        for length in range(1, min(HOT_PREFIX_CHARS, len(key)) + 1):
+            prefix = key[:length]
+            filled = slots.get(prefix, 0)
+            if filled >= TOP_COMPLETIONS:
+                continue
+            shown = seen.setdefault(prefix, set())
+            if (lang, display) in shown:
+                continue
+            shown.add((lang, display))
+            slots[prefix] = filled + 1
+            top_rows.append((prefix, filled, lang, display, detail, score))
+
+    cursor.executemany('''
+        INSERT INTO autocomplete_top (prefix, slot, lang, display, detail, rank_score)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', top_rows)
+
+    return len(rows)
+
+
+def complete(cursor, prefix: str, limit: int = TOP_COMPLETIONS) -> list:
+    """Top completions for a typed prefix, best rank_score first.
+
+    Returns [(lang, display, detail, rank_score)]. Must stay in sync with
+    QueryCompletions in core/database/queries.go.
+    """
+    key = normalize_key(prefix)
+    if not key:
+        return []
+
+    if len(key) <= HOT_PREFIX_CHARS and limit <= TOP_COMPLETIONS:
+        cursor.execute('''
+            SELECT lang, display, detail, rank_score
+            FROM autocomplete_top
+            WHERE prefix = ?
+            ORDER BY slot
+            LIMIT ?
+        ''', (key, limit))
+    else:
+        cursor.execute('''
+            SELECT lang, display, detail, rank_score
+            FROM autocomplete_keys
+            WHERE key >= ? AND key < ?
+            ORDER BY rank_score DESC, key
+            LIMIT ?
+        ''', (key, key + PREFIX_UPPER_BOUND, limit))
+
+    return cursor.fetchall()
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def benchmark(db_path: Path, words: int, limit: int, seed: int):
+    """Replay every keystroke of sampled keys and report latency percentiles."""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT key FROM autocomplete_keys')
+    keys = [row[0] for row in cursor.fetchall()]
+    if not keys:
+        print('Error: autocomplete_keys is empty (rebuild with ingest.py)')
+        return 1
+
+    random.Random(seed).shuffle(keys)
+    sample = keys[:words]
+
+    timings = {'hot': [], 'scan': []}
+    for key in sample:
+        for length in range(1, len(key) + 1):
+            start = time.perf_counter()
+            complete(cursor, key[:length], limit)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            bucket = 'hot' if length <= HOT_PREFIX_CHARS and limit <= TOP_COMPLETIONS else 'scan'
+            timings[bucket].append(elapsed_ms)
+
+    conn.close()
+
+    everything = timings['hot'] + timings['scan']
+    print(f"Autocomplete benchmark: {db_path}")
+    print(f"  Keys sampled: {len(sample)}  Keystrokes: {len(everything)}  Limit: {limit}")
+    print(f"  {'path':<8}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, samples in (('hot', timings['hot']), ('scan', timings['scan']), ('all', everything)):
+        if not samples:
+            continue
+        print(f"  {name:<8}{len(samples):>8}"
+              f"{statistics.median(samples):>10.3f}"
+              f"{percentile(samples, 95):>10.3f}"
+              f"{percentile(samples, 99):>10.3f}"
+              f"{max(samples):>10.3f}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark prefix autocomplete latency')
+    parser.add_argument('--db', default='dictionary.db',
+                        help='Database path (default: dictionary.db)')
+    parser.add_argument('--words', type=int, default=2000,
+                        help='Number of keys to type out (default: 2000)')
+    parser.add_argument('--limit', type=int, default=TOP_COMPLETIONS,
+                        help=f'Completions per keystroke (default: {TOP_COMPLETIONS})')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Sampling seed (default: 0)')
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"Error: Database not found: {db_path}")
+        return 1
+
+    return benchmark(db_path, args.words, args.limit, args.seed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
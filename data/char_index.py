@@ -0,0 +1,56 @@
+"""Character-level inverted index for "words containing this kanji/hanzi".
+
+char_index maps every CJK ideograph in a headword to the words that
+contain it, with its position in the headword:
+
+- ja: japanese_words.headword
+- zh: chinese_words.simplified and traditional (same positions, so a
+  character shared by both spellings is stored once)
+
+The table is WITHOUT ROWID and keyed on (char, lang, word_id, position),
+so "contains 猫" is an index range and multi-character queries are an
+intersection over those ranges instead of a LIKE '%猫%' scan.
+"""
+
+# CJK Unified Ideographs, Extension A, compatibility ideographs and the
+# supplementary-plane extensions; kana and the iteration mark are left out
+CJK_RANGES = (
+    (0x3400, 0x4DBF),
+    (0x4E00, 0x9FFF),
+    (0xF900, 0xFAFF),
+    (0x20000, 0x2FFFF),
+)
+
+
+def is_cjk(char: str) -> bool:
+    """True if char is a CJK ideograph (kanji/hanzi)."""
+    code = ord(char)
+    return any(low <= code <= high for low, high in CJK_RANGES)
+
+
+def _index_rows(cursor):
+    """Yield (char, lang, word_id, position) for every headword in one pass."""
+    cursor.execute('SELECT id, headword FROM japanese_words')
+    for word_id, headword in cursor.fetchall():
+        for position, char in enumerate(headword):
+            if is_cjk(char):
+                yield char, 'ja', word_id, position
+
+    cursor.execute('SELECT id, simplified, traditional FROM chinese_words')
+    for word_id, simplified, traditional in cursor.fetchall():
+        for spelling in {simplified, traditional}:
+            for position, char in enumerate(spelling):
+                if is_cjk(char):
+                    yield char, 'zh', word_id, position
+
+
+def build_char_index(cursor) -> int:
+    """(Re)build char_index from the word tables. Returns the row count."""
+    cursor.execute('DELETE FROM char_index')
+    rows = sorted(set(_index_rows(cursor)))
+    cursor.executemany('''
+        INSERT INTO char_index (char, lang, word_id, position)
+        VALUES (?, ?, ?, ?)
+    ''', rows)
+    return len(rows)
+
@@ -16,6 +16,14 @@ import shutil
 import sqlite3
 from pathlib import Path
 
+from autocomplete import build_autocomplete
+from char_index import build_char_index
+from fuzzy import build_fuzzy_index
+from hot_results import build_hot_results
+
+# Queries precomputed for the web database (the full build keeps HOT_LIMIT)
+WEB_HOT_LIMIT = 3000
+
 
 def create_web_database(source_db, output_db, verbose=False):
     """Create web-optimized database from full database."""
@@ -34,7 +42,7 @@ def create_web_database(source_db, output_db, verbose=False):
     ja_before = cursor.fetchone()[0]
     cursor.execute("SELECT COUNT(*) FROM chinese_words")
     zh_before = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM examples")
+    cursor.execute("SELECT COUNT(*) FROM example_links")
     ex_before = cursor.fetchone()[0]
 
     if verbose:
@@ -81,6 +89,32 @@ def create_web_database(source_db, output_db, verbose=False):
     """)
     zh_def_removed = cursor.rowcount
 
+    cursor.execute("""
+        DELETE FROM japanese_word_details
+        WHERE word_id NOT IN (SELECT id FROM japanese_words)
+    """)
+
+    cursor.execute("""
+        DELETE FROM chinese_word_details
+        WHERE word_id NOT IN (SELECT id FROM chinese_words)
+    """)
+
+    cursor.execute("""
+        DELETE FROM glosses
+        WHERE id NOT IN (SELECT gloss_id FROM japanese_definitions)
+        AND id NOT IN (SELECT gloss_id FROM chinese_definitions)
+    """)
+
+    cursor.execute("""
+        DELETE FROM japanese_forms
+        WHERE word_id NOT IN (SELECT id FROM japanese_words)
+    """)
+
+    cursor.execute("""
+        DELETE FROM japanese_inflections
+        WHERE word_id NOT IN (SELECT id FROM japanese_words)
+    """)
+
     if verbose:
         print(f"  Removed {ja_def_removed:,} Japanese definitions")
         print(f"  Removed {zh_def_removed:,} Chinese definitions")
@@ -90,32 +124,52 @@ def create_web_database(source_db, output_db, verbose=False):
         print("\nCleaning orphaned examples...")
 
     cursor.execute("""
-        DELETE FROM examples
-        WHERE language = 'ja' AND word_id NOT IN (SELECT id FROM japanese_words)
+        DELETE FROM example_links
+        WHERE lang = 'ja' AND word_id NOT IN (SELECT id FROM japanese_words)
     """)
     ja_ex_removed = cursor.rowcount
 
     cursor.execute("""
-        DELETE FROM examples
-        WHERE language = 'zh' AND word_id NOT IN (SELECT id FROM chinese_words)
+        DELETE FROM example_links
+        WHERE lang = 'zh' AND word_id NOT IN (SELECT id FROM chinese_words)
     """)
     zh_ex_removed = cursor.rowcount
 
+    # The web app only shows each word's linked examples, so the full
+    # sentence index and the sentences only it points at are dropped
+    cursor.execute("DELETE FROM sentence_terms")
+    cursor.execute("""
+        DELETE FROM sentences
+        WHERE id NOT IN (SELECT sentence_id FROM example_links)
+    """)
+
     if verbose:
         print(f"  Removed {ja_ex_removed:,} Japanese examples")
         print(f"  Removed {zh_ex_removed:,} Chinese examples")
 
+    # Rebuild derived indexes over the remaining words
+    if verbose:
+        print("\nRebuilding character, autocomplete and fuzzy indexes...")
+    build_char_index(cursor)
+    build_autocomplete(cursor)
+    build_fuzzy_index(cursor)
+
     # Get final counts
     cursor.execute("SELECT COUNT(*) FROM japanese_words")
     ja_after = cursor.fetchone()[0]
     cursor.execute("SELECT COUNT(*) FROM chinese_words")
     zh_after = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM examples")
+    cursor.execute("SELECT COUNT(*) FROM example_links")
     ex_after = cursor.fetchone()[0]
 
     # Commit changes before vacuum
     conn.commit()
 
+    # Stored responses point at removed words and examples, so rebuild them
+    if verbose:
+        print("\nRebuilding hot query results...")
+    build_hot_results(output_db, WEB_HOT_LIMIT)
+
     # Vacuum to reclaim space (must be outside transaction)
     if verbose:
         print("\nVacuuming database to reclaim space...")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Storage report: bytes and pages per table, with its indexes.
+
+SQLite's dbstat virtual table attributes every page of the file to the
+table or index that owns it. Each table's pages (plus its indexes') are
+also what the page cache has to hold to keep lookups on that table hot,
+so the page count is reported next to the size.
+
+Usage:
+    python3 db_report.py dictionary.db
+    python3 db_report.py before.db after.db    # side by side with deltas
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+
+def table_size(cursor, name: str):
+    """On-disk size of a table or index in bytes via dbstat, or None if unavailable."""
+    try:
+        cursor.execute('SELECT SUM(pgsize) FROM dbstat WHERE name = ?', (name,))
+    except sqlite3.OperationalError:
+        return None
+    return cursor.fetchone()[0]
+
+
+def table_sizes(cursor) -> dict:
+    """Map table name → (pages, bytes), counting its indexes with it.
+
+    Returns {} when SQLite was built without dbstat.
+    """
+    try:
+        cursor.execute('''
+            SELECT COALESCE(m.tbl_name, s.name), COUNT(*), SUM(s.pgsize)
+            FROM dbstat s
+            LEFT JOIN sqlite_master m ON m.name = s.name
+            GROUP BY 1
+        ''')
+    except sqlite3.OperationalError:
+        return {}
+    return {name: (pages, size) for name, pages, size in cursor.fetchall()}
+
+
+def database_stats(db_path: Path) -> dict:
+    """File size, page size and per-table sizes of a database."""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+    cursor.execute('PRAGMA page_size')
+    page_size = cursor.fetchone()[0]
+    tables = table_sizes(cursor)
+    conn.close()
+    return {'file': db_path.stat().st_size, 'page_size': page_size, 'tables': tables}
+
+
+def _mb(size) -> str:
+    return '-' if size is None else f'{size / (1024 * 1024):.2f}'
+
+
+def print_report(stats: dict):
+    """Print one database's tables, largest first."""
+    print(f"  File: {_mb(stats['file'])} MB  Page size: {stats['page_size']} B")
+    print(f"  {'table':<28}{'pages':>10}{'MB':>10}")
+    for name, (pages, size) in sorted(stats['tables'].items(), key=lambda item: -item[1][1]):
+        print(f"  {name:<28}{pages:>10}{_mb(size):>10}")
+
+
+def print_comparison(before: dict, after: dict):
+    """Print two databases' tables side by side with the change in MB."""
+    print(f"  {'table':<28}{'before MB':>12}{'after MB':>12}{'delta MB':>12}"
+          f"{'before pg':>12}{'after pg':>12}")
+    names = sorted(set(before['tables']) | set(after['tables']),
+                   key=lambda name: -max(before['tables'].get(name, (0, 0))[1],
+                                         after['tables'].get(name, (0, 0))[1]))
+    rows = [(name, before['tables'].get(name, (0, 0)), after['tables'].get(name, (0, 0)))
+            for name in names]
+    rows.append(('(file)', (before['file'] // before['page_size'], before['file']),
+                 (after['file'] // after['page_size'], after['file'])))
+    for name, (pages_before, size_before), (pages_after, size_after) in rows:
+        print(f"  {name:<28}{_mb(size_before):>12}{_mb(size_after):>12}"
+              f"{(size_after - size_before) / (1024 * 1024):>+12.2f}"
+              f"{pages_before:>12}{pages_after:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report per-table database size')
+    parser.add_argument('databases', nargs='+', type=Path, metavar='DB',
+                        help='Database to report, or two to compare (before after)')
+    args = parser.parse_args()
+
+    if len(args.databases) > 2:
+        parser.error('give one database, or two to compare')
+    for db_path in args.databases:
+        if not db_path.exists():
+            print(f"Error: Database not found: {db_path}")
+            return 1
+
+    stats = [database_stats(db_path) for db_path in args.databases]
+    if not stats[0]['tables']:
+        print('Error: this SQLite build has no dbstat virtual table')
+        return 1
+
+    if len(stats) == 1:
+        print(f"Storage report: {args.databases[0]}")
+        print_report(stats[0])
+    else:
+        print(f"Storage comparison: {args.databases[0]} → {args.databases[1]}")
+        print_comparison(*stats)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Conjugated-form lookup table for Japanese verbs and adjectives.
+
+JMdict part-of-speech tags say how a word conjugates (Ichidan, Godan with
+'mu' ending, i-adjective, ...). At ingest each such word gets a
+conjugation class in japanese_words.conjugation, and every conjugated
+surface of its headword and reading is written to japanese_inflections
+(surface → word_id, rule), keyed on surface. 食べました or のんで then
+resolves to its dictionary form with one primary-key probe instead of
+rule search at query time.
+
+Usage (report table size and per-rule counts):
+    python3 deinflect.py --db dictionary.db
+"""
+
+import argparse
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+
+from db_report import table_size
+
+# JMdict POS (entity name or expanded entity text) → conjugation class
+POS_CLASSES = {}
+for _code, _description in (
+    ('v1', 'Ichidan verb'),
+    ('v1-s', 'Ichidan verb - kureru special class'),
+    ('v5u', "Godan verb with 'u' ending"),
+    ('v5u-s', "Godan verb with 'u' ending (special class)"),
+    ('v5k', "Godan verb with 'ku' ending"),
+    ('v5k-s', 'Godan verb - Iku/Yuku special class'),
+    ('v5g', "Godan verb with 'gu' ending"),
+    ('v5s', "Godan verb with 'su' ending"),
+    ('v5t', "Godan verb with 'tsu' ending"),
+    ('v5n', "Godan verb with 'nu' ending"),
+    ('v5b', "Godan verb with 'bu' ending"),
+    ('v5m', "Godan verb with 'mu' ending"),
+    ('v5r', "Godan verb with 'ru' ending"),
+    ('v5r-i', "Godan verb with 'ru' ending (irregular verb)"),
+    ('v5aru', 'Godan verb - -aru special class'),
+    ('vk', 'Kuru verb - special class'),
+    ('vs-i', 'suru verb - included'),
+    ('vs-s', 'suru verb - special class'),
+    ('vs', 'noun or participle which takes the aux. verb suru'),
+    ('adj-i', 'adjective (keiyoushi)'),
+    ('adj-ix', 'adjective (keiyoushi) - yoi/ii class'),
+):
+    POS_CLASSES[_code] = _code
+    POS_CLASSES[_description] = _code
+
+# Godan final kana → (a-row, i-row, e-row, o-row, te form, ta form)
+GODAN_ROWS = {
+    'う': ('わ', 'い', 'え', 'お', 'って', 'った'),
+    'く': ('か', 'き', 'け', 'こ', 'いて', 'いた'),
+    'ぐ': ('が', 'ぎ', 'げ', 'ご', 'いで', 'いだ'),
+    'す': ('さ', 'し', 'せ', 'そ', 'して', 'した'),
+    'つ': ('た', 'ち', 'て', 'と', 'って', 'った'),
+    'ぬ': ('な', 'に', 'ね', 'の', 'んで', 'んだ'),
+    'ぶ': ('ば', 'び', 'べ', 'ぼ', 'んで', 'んだ'),
+    'む': ('ま', 'み', 'め', 'も', 'んで', 'んだ'),
+    'る': ('ら', 'り', 'れ', 'ろ', 'って', 'った'),
+}
+
+# (rule, stem, suffix) for every verb class; stems come from _verb_stems
+VERB_RULES = (
+    ('negative', 'neg', 'ない'),
+    ('negative past', 'neg', 'なかった'),
+    ('negative te', 'neg', 'なくて'),
+    ('negative conditional', 'neg', 'なければ'),
+    ('polite', 'masu', 'ます'),
+    ('polite past', 'masu', 'ました'),
+    ('polite negative', 'masu', 'ません'),
+    ('polite negative past', 'masu', 'ませんでした'),
+    ('polite volitional', 'masu', 'ましょう'),
+    ('desire', 'masu', 'たい'),
+    ('desire negative', 'masu', 'たくない'),
+    ('desire past', 'masu', 'たかった'),
+    ('while', 'masu', 'ながら'),
+    ('te', 'te', ''),
+    ('progressive', 'te', 'いる'),
+    ('progressive polite', 'te', 'います'),
+    ('progressive past', 'te', 'いた'),
+    ('progressive negative', 'te', 'いない'),
+    ('completion', 'te', 'しまう'),
+    ('past', 'ta', ''),
+    ('conditional tara', 'ta', 'ら'),
+    ('conditional ba', 'ba', 'ば'),
+    ('potential', 'pot', 'る'),
+    ('potential negative', 'pot', 'ない'),
+    ('potential polite', 'pot', 'ます'),
+    ('passive', 'pass', 'る'),
+    ('passive past', 'pass', 'た'),
+    ('causative', 'caus', 'る'),
+    ('volitional', 'vol', ''),
+    ('imperative', 'imp', ''),
+)
+
+# (rule, suffix) applied to an i-adjective stem (word minus final い)
+ADJECTIVE_RULES = (
+    ('adverbial', 'く'),
+    ('negative', 'くない'),
+    ('negative past', 'くなかった'),
+    ('polite negative', 'くないです'),
+    ('past', 'かった'),
+    ('polite past', 'かったです'),
+    ('te', 'くて'),
+    ('conditional ba', 'ければ'),
+    ('conditional tara', 'かったら'),
+    ('noun', 'さ'),
+    ('seems', 'そう'),
+)
+
+# i-adjectives besides the yoi/ii class that insert さ before そう
+SA_SOU_ADJECTIVES = {'ない', '無い'}
+
+# Stems of 来る / くる, in kana; a kanji 来 replaces the leading kana
+KURU_STEMS = {
+    'neg': 'こ', 'masu': 'き', 'te': 'きて', 'ta': 'きた', 'ba': 'くれ',
+    'pot': 'こられ', 'pass': 'こられ', 'caus': 'こさせ', 'vol': 'こよう', 'imp': 'こい',
+}
+
+# Stems of する, appended to the part before する
+SURU_STEMS = {
+    'neg': 'し', 'masu': 'し', 'te': 'して', 'ta': 'した', 'ba': 'すれ',
+    'pot': 'でき', 'pass': 'され', 'caus': 'させ', 'vol': 'しよう', 'imp': 'しろ',
+}
+
+
+def conjugation_class(pos_values):
+    """First conjugation class among an entry's POS values, or None."""
+    for pos in pos_values:
+        if pos in POS_CLASSES:
+            return POS_CLASSES[pos]
+    return None
+
+
+def _verb_stems(word: str, conjugation: str):
+    """Stem table for a verb, or None if word doesn't fit its class."""
+    if conjugation in ('v1', 'v1-s'):
+        if not word.endswith('る'):
+            return None
+        s = word[:-1]
+        return {
+            'neg': s, 'masu': s, 'te': s + 'て', 'ta': s + 'た', 'ba': s + 'れ',
+            'pot': s + 'られ', 'pass': s + 'られ', 'caus': s + 'させ',
+            'vol': s + 'よう', 'imp': s + ('' if conjugation == 'v1-s' else 'ろ'),
+        }
+
+    if conjugation == 'vk':
+        if word.endswith('来る'):
+            base = word[:-2] + '来'
+            return {k: base + v[1:] for k, v in KURU_STEMS.items()}
+        if word.endswith('くる'):
+            return {k: word[:-2] + v for k, v in KURU_STEMS.items()}
+        return None
+
+    if conjugation in ('vs-i', 'vs-s', 'vs'):
+        if conjugation == 'vs':
+            base = word
+        elif word.endswith('する'):
+            base = word[:-2]
+        else:
+            return None
+        return {k: base + v for k, v in SURU_STEMS.items()}
+
+    if conjugation.startswith('v5'):
+        row = GODAN_ROWS.get(word[-1:])
+        if row is None:
+            return None
+        s = word[:-1]
+        a, i, e, o, te, ta = row
+        if conjugation == 'v5k-s':
+            te, ta = 'って', 'った'
+        elif conjugation == 'v5u-s':
+            te, ta = 'うて', 'うた'
+        stems = {
+            'neg': s + a, 'masu': s + i, 'te': s + te, 'ta': s + ta, 'ba': s + e,
+            'pot': s + e, 'pass': s + a + 'れ', 'caus': s + a + 'せ',
+            'vol': s + o + 'う', 'imp': s + e,
+        }
+        if conjugation == 'v5aru':
+            stems['masu'] = stems['imp'] = s + 'い'
+        elif conjugation == 'v5r-i':
+            # ある has no regular negative (ない is its own entry)
+            del stems['neg']
+        return stems
+
+    return None
+
+
+def inflect(word: str, conjugation: str) -> dict:
+    """Map every conjugated surface of word to the rule that produced it."""
+    surfaces = {}
+
+    if conjugation in ('adj-i', 'adj-ix'):
+        if not word.endswith('い'):
+            return surfaces
+        stem = word[:-2] + 'よ' if conjugation == 'adj-ix' and word.endswith('いい') else word[:-1]
+        surfaces[word + 'です'] = 'polite'
+        for rule, suffix in ADJECTIVE_RULES:
+            surfaces.setdefault(stem + suffix, rule)
+        if conjugation == 'adj-ix' or word in SA_SOU_ADJECTIVES:
+            # よさそう / なさそう, not よそう / なそう
+            del surfaces[stem + 'そう']
+            surfaces.setdefault(stem + 'さそう', 'seems')
+        return surfaces
+
+    stems = _verb_stems(word, conjugation)
+    if stems is None:
+        return surfaces
+
+    if conjugation == 'vs':
+        surfaces[word + 'する'] = 'suru'
+    for rule, stem, suffix in VERB_RULES:
+        if stem in stems:
+            surfaces.setdefault(stems[stem] + suffix, rule)
+
+    surfaces.pop(word, None)
+    return surfaces
+
+
+def build_inflections(cursor) -> int:
+    """(Re)build japanese_inflections for every word with a conjugation class.
+
+    Both the headword and the reading are conjugated, so kana input works
+    too. Returns the number of rows written.
+    """
+    cursor.execute('DELETE FROM japanese_inflections')
+    cursor.execute('''
+        SELECT id, headword, reading, conjugation FROM japanese_words
+        WHERE conjugation IS NOT NULL
+    ''')
+
+    rows = []
+    for word_id, headword, reading, conjugation in cursor.fetchall():
+        surfaces = inflect(reading, conjugation)
+        surfaces.update(inflect(headword, conjugation))
+        rows.extend((surface, word_id, rule) for surface, rule in surfaces.items())
+
+    cursor.executemany('''
+        INSERT OR IGNORE INTO japanese_inflections (surface, word_id, rule)
+        VALUES (?, ?, ?)
+    ''', sorted(rows))
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report japanese_inflections size')
+    parser.add_argument('--db', default='dictionary.db',
+                        help='Database path (default: dictionary.db)')
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"Error: Database not found: {db_path}")
+        return 1
+
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT rule FROM japanese_inflections')
+    rules = Counter(row[0] for row in cursor.fetchall())
+    cursor.execute('SELECT COUNT(DISTINCT word_id) FROM japanese_inflections')
+    words = cursor.fetchone()[0]
+    size = table_size(cursor, 'japanese_inflections')
+    conn.close()
+
+    print(f"japanese_inflections: {sum(rules.values())} surfaces for {words} words")
+    if size is not None:
+        print(f"  Size: {size / (1024 * 1024):.1f} MB")
+    for rule, count in rules.most_common():
+        print(f"  {rule:<24}{count:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,7 @@
 
 import argparse
 import gzip
+import zipfile
 import os
 from pathlib import Path
 import shutil
@@ -35,6 +36,12 @@ SOURCES = {
         'extracted': 'kanjidic2.xml',
         'description': 'Kanji character dictionary (optional)',
     },
+    'unihan': {
+        'url': 'https://www.unicode.org/Public/UCD/latest/ucd/Unihan.zip',
+        'file': 'Unihan.zip',
+        'extracted': 'Unihan_IRGSources.txt',
+        'description': 'Unicode Han database, radicals of simplified hanzi (optional)',
+    },
 }
 
 
@@ -76,12 +83,17 @@ def download_file(url: str, dest: Path, description: str) -> bool:
 
 
 def extract_gz(gz_path: Path, output_path: Path) -> bool:
-    """Extract a .gz file."""
+    """Extract a .gz file, or output_path's member of a .zip file."""
     try:
         print(f"  Extracting {gz_path.name}...")
-        with gzip.open(gz_path, 'rb') as f_in:
-            with open(output_path, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+        if gz_path.suffix == '.zip':
+            with zipfile.ZipFile(gz_path) as archive:
+                with archive.open(output_path.name) as f_in, open(output_path, 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+        else:
+            with gzip.open(gz_path, 'rb') as f_in:
+                with open(output_path, 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out)
         print(f"  ✓ Extracted to {output_path.name}")
         return True
     except Exception as e:
@@ -95,10 +107,10 @@ def main():
                         help='Skip downloads (use sample data)')
     parser.add_argument('--output', default='sources',
                         help='Output directory (default: sources)')
-    parser.add_argument('--skip', nargs='+', choices=['jmdict', 'cedict', 'kanjidic'],
+    parser.add_argument('--skip', nargs='+', choices=list(SOURCES),
                         help='Skip downloading specific sources')
     parser.add_argument('--extract', action='store_true',
-                        help='Extract .gz files after downloading')
+                        help='Extract .gz/.zip files after downloading')
     args = parser.parse_args()
 
     output_dir = Path(__file__).parent / args.output
@@ -174,7 +186,7 @@ def main():
             print("\nTo extract files:")
             print(f"  python3 download.py --extract")
             print("\nOr manually:")
-            print(f"  cd {output_dir} && gunzip *.gz")
+            print(f"  cd {output_dir} && gunzip *.gz && unzip Unihan.zip Unihan_IRGSources.txt")
 
         return 0
     else:
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Trigram index for typo-tolerant English gloss search.
+
+Every distinct gloss term ("receive", "restaurant") is normalized into
+fuzzy_terms, and each of its padded character trigrams is posted to
+fuzzy_trigrams (trigram, length, term_id). The table is WITHOUT ROWID, so
+one trigram's postings for terms of a given length range are a single
+index range. A misspelled query then:
+
+1. counts shared trigrams per term over the query's postings only, for
+   terms whose length is within the query's edit bound
+2. keeps the CANDIDATES terms sharing the most trigrams
+3. verifies those with an edit distance that gives up past its bound
+
+so no gloss is ever scanned. "recieve" → "receive", "restaraunt" →
+"restaurant".
+
+Usage (benchmark, p99 latency and top-1 accuracy on typo'd terms):
+    python3 fuzzy.py --db dictionary.db --queries 1000
+"""
+
+import argparse
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from autocomplete import gloss_terms, percentile
+
+# Terms checked with edit distance per query
+CANDIDATES = 50
+
+# Largest edit distance ever accepted (see max_distance)
+MAX_DISTANCE = 3
+
+TERM_PATTERN = re.compile(r"[^a-z0-9' -]+")
+
+
+def normalize_term(text: str) -> str:
+    """Lowercase, drop a leading "to " and anything but letters/digits/spaces."""
+    term = TERM_PATTERN.sub('', text.strip().lower())
+    if term.startswith('to '):
+        term = term[3:]
+    return ' '.join(term.split())
+
+
+def trigrams(term: str) -> set:
+    """Distinct trigrams of a term padded with two leading and one trailing space."""
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_distance(term: str) -> int:
+    """Edits tolerated for a query of this length: 1 up to 4 chars, 2 up to 8."""
+    if len(term) <= 4:
+        return 1
+    if len(term) <= 8:
+        return 2
+    return MAX_DISTANCE
+
+
+def edit_distance(a: str, b: str, bound: int):
+    """Optimal string alignment distance (a swap counts as one edit).
+
+    Returns None as soon as the distance must exceed bound.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return None
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > bound:
+            return None
+        previous2, previous = previous, current
+
+    return previous[-1] if previous[-1] <= bound else None
+
+
+def _collect_terms(cursor) -> dict:
+    """Map normalized term → best rank_score of any word glossed with it."""
+    best = {}
+    cursor.execute('''
+        SELECT g.text, w.rank_score
+        FROM japanese_definitions d
+        JOIN japanese_words w ON w.id = d.word_id
+        JOIN glosses g ON g.id = d.gloss_id
+        UNION ALL
+        SELECT g.text, w.rank_score
+        FROM chinese_definitions d
+        JOIN chinese_words w ON w.id = d.word_id
+        JOIN glosses g ON g.id = d.gloss_id
+    ''')
+    for gloss, score in cursor.fetchall():
+        for raw in gloss_terms(gloss):
+            term = normalize_term(raw)
+            if len(term) >= 3 and score > best.get(term, float('-inf')):
+                best[term] = score
+    return best
+
+
+def build_fuzzy_index(cursor) -> int:
+    """(Re)build fuzzy_terms and fuzzy_trigrams from the definition tables.
+
+    Returns the number of terms indexed.
+    """
+    best = _collect_terms(cursor)
+
+    cursor.execute('DELETE FROM fuzzy_trigrams')
+    cursor.execute('DELETE FROM fuzzy_terms')
+
+    term_rows = []
+    postings = []
+    for term_id, term in enumerate(sorted(best), 1):
+        grams = trigrams(term)
+        term_rows.append((term_id, term, len(grams), best[term]))
+        postings.extend((gram, len(term), term_id) for gram in grams)
+
+    cursor.executemany('''
+        INSERT INTO fuzzy_terms (id, term, trigram_count, rank_score)
+        VALUES (?, ?, ?, ?)
+    ''', term_rows)
+    postings.sort()
+    cursor.executemany('''
+        INSERT INTO fuzzy_trigrams (trigram, length, term_id)
+        VALUES (?, ?, ?)
+    ''', postings)
+
+    return len(term_rows)
+
+
+def suggest(cursor, text: str, limit: int = 5) -> list:
+    """Gloss terms within edit distance of a (misspelled) English query.
+
+    Returns [(term, distance, rank_score)], closest first, then by
+    trigram similarity and rank_score. An exact match comes back with
+    distance 0.
+    """
+    term = normalize_term(text)
+    if len(term) < 3:
+        return []
+
+    grams = sorted(trigrams(term))
+    bound = max_distance(term)
+    placeholders = ', '.join('?' * len(grams))
+    cursor.execute(f'''
+        SELECT t.term, t.rank_score, c.shared, t.trigram_count
+        FROM (
+            SELECT term_id, COUNT(*) AS shared
+            FROM fuzzy_trigrams
+            WHERE trigram IN ({placeholders}) AND length BETWEEN ? AND ?
+            GROUP BY term_id
+            ORDER BY shared DESC
+            LIMIT ?
+        ) c
+        JOIN fuzzy_terms t ON t.id = c.term_id
+    ''', (*grams, len(term) - bound, len(term) + bound, CANDIDATES))
+
+    matches = []
+    for candidate, score, shared, trigram_count in cursor.fetchall():
+        distance = edit_distance(term, candidate, bound)
+        if distance is not None:
+            similarity = shared / (len(grams) + trigram_count - shared)
+            matches.append((distance, -similarity, -score, candidate))
+
+    matches.sort()
+    return [(candidate, distance, -score) for distance, _, score, candidate in matches[:limit]]
+
+
+def misspell(term: str, rng: random.Random) -> str:
+    """Apply one random typo: swap, drop, double or replace a letter."""
+    i = rng.randrange(len(term) - 1)
+    kind = rng.choice(('swap', 'drop', 'double', 'replace'))
+    if kind == 'swap':
+        return term[:i] + term[i + 1] + term[i] + term[i + 2:]
+    if kind == 'drop':
+        return term[:i] + term[i + 1:]
+    if kind == 'double':
+        return term[:i] + term[i] + term[i:]
+    return term[:i] + rng.choice('abcdefghijklmnopqrstuvwxyz') + term[i + 1:]
+
+
+def benchmark(db_path: Path, queries: int, seed: int):
+    """Misspell sampled terms and report suggest() latency and accuracy."""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT term FROM fuzzy_terms WHERE LENGTH(term) >= 5')
+    terms = [row[0] for row in cursor.fetchall()]
+    if not terms:
+        print('Error: fuzzy_terms is empty (rebuild with ingest.py)')
+        return 1
+
+    rng = random.Random(seed)
+    sample = [rng.choice(terms) for _ in range(queries)]
+
+    timings = []
+    found = top1 = 0
+    for term in sample:
+        typo = misspell(term, rng)
+        start = time.perf_counter()
+        results = suggest(cursor, typo)
+        timings.append((time.perf_counter() - start) * 1000)
+        suggested = [candidate for candidate, _, _ in results]
+        found += term in suggested
+        top1 += bool(suggested) and suggested[0] == term
+
+    conn.close()
+
+    print(f"Fuzzy gloss benchmark: {db_path}")
+    print(f"  Terms indexed: {len(terms)}  Queries: {len(sample)}")
+    print(f"  p50 {statistics.median(timings):.3f} ms  p95 {percentile(timings, 95):.3f} ms  "
+          f"p99 {percentile(timings, 99):.3f} ms  max {max(timings):.3f} ms")
+    print(f"  Original term suggested: {found * 100 / len(sample):.1f}%  "
+          f"(first: {top1 * 100 / len(sample):.1f}%)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark typo-tolerant gloss search')
+    parser.add_argument('--db', default='dictionary.db',
+                        help='Database path (default: dictionary.db)')
+    parser.add_argument('--queries', type=int, default=1000,
+                        help='Number of misspelled queries (default: 1000)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Sampling seed (default: 0)')
+    parser.add_argument('--suggest', metavar='TEXT',
+                        help='Print suggestions for TEXT instead of benchmarking')
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"Error: Database not found: {db_path}")
+        return 1
+
+    if args.suggest:
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        for term, distance, _ in suggest(conn.cursor(), args.suggest):
+            print(f"{term}\t{distance}")
+        conn.close()
+        return 0
+
+    return benchmark(db_path, args.queries, args.seed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Precomputed responses for the most likely queries (hot_results).
+
+Most lookups are for a few thousand common words, and each one would
+otherwise re-run the English pivot, the ranking and the definition and
+example fetches. This build stage resolves the likeliest queries once,
+with the same triangulation as the Go core (tridict), and stores every
+complete response as JSON. The queries are:
+
+- headwords and readings of common or JLPT-listed Japanese words
+- simplified and traditional spellings of common or HSK-listed Chinese words
+- the English gloss heads ("cat" of "cat (animal)") of common words
+
+They are ranked by their best word's rank_score, and the top limit are
+kept. A frontend normalizes its input with the same key (see hot_key),
+reads one row by primary key, and substitutes its own input for
+meta.query. Only default-size lookups (HOT_RESULTS_SIZE per language) are
+served from it. Must stay in sync with hotKey in core/database/hot.go;
+`dict --verify-hot` checks every stored response against the Go engine.
+
+The payloads include examples, so this runs after everything that
+changes words or examples: ingest.py, import_tatoeba.py,
+create_web_database.py and sample/generate_samples.py all call it last.
+
+Usage:
+    python3 hot_results.py --db dictionary.db --limit 20000
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+# tridict (repository root) holds the Python port of the query engine
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tridict import Dictionary  # noqa: E402
+from db_report import table_size  # noqa: E402
+
+# Results per language in a stored response (the CLI's default -n)
+HOT_RESULTS_SIZE = 5
+
+# Queries precomputed by default
+HOT_LIMIT = 20000
+
+GLOSS_HEAD_PATTERN = re.compile(r' \(|;')
+
+
+def hot_key(text: str) -> str:
+    """Lookup key of a query: trimmed, and lowercased if ASCII.
+
+    English, romaji and pinyin lookups all ignore ASCII case, so "Cat" and
+    "cat" share one row.
+    """
+    text = text.strip()
+    return text.lower() if text.isascii() else text
+
+
+def hot_queries(cursor, limit: int) -> list:
+    """Up to limit query keys, the best-ranked first."""
+    scores = {}
+
+    def add(text, score):
+        key = hot_key(text or '')
+        if key and score > scores.get(key, float('-inf')):
+            scores[key] = score
+
+    cursor.execute('''
+        SELECT headword, reading, rank_score FROM japanese_words
+        WHERE is_common = 1 OR jlpt_level IS NOT NULL
+    ''')
+    for headword, reading, score in cursor.fetchall():
+        add(headword, score)
+        add(reading, score)
+
+    cursor.execute('''
+        SELECT simplified, traditional, rank_score FROM chinese_words
+        WHERE is_common = 1 OR hsk_level IS NOT NULL
+    ''')
+    for simplified, traditional, score in cursor.fetchall():
+        add(simplified, score)
+        add(traditional, score)
+
+    for table in ('japanese', 'chinese'):
+        cursor.execute(f'''
+            SELECT g.text, MAX(w.rank_score)
+            FROM glosses g
+            JOIN {table}_definitions d ON d.gloss_id = g.id
+            JOIN {table}_words w ON w.id = d.word_id
+            WHERE w.is_common = 1
+            GROUP BY g.id
+        ''')
+        for text, score in cursor.fetchall():
+            head = GLOSS_HEAD_PATTERN.split(text, 1)[0]
+            if head.isascii():
+                add(head, score)
+
+    ranked = sorted(scores, key=lambda key: (-scores[key], key))
+    return ranked[:limit]
+
+
+def build_hot_results(db_path, limit: int = HOT_LIMIT) -> int:
+    """(Re)build hot_results for the database at db_path.
+
+    Call with no write transaction open on db_path. Returns the number of
+    responses stored; queries with no results are not stored.
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    queries = hot_queries(cursor, limit)
+
+    with Dictionary(db_path, pool_size=1, cache_size=0) as dictionary:
+        rows = [
+            (key, json.dumps(response, ensure_ascii=False, separators=(',', ':')))
+            for key, response in zip(queries, dictionary.lookup_bulk(queries, HOT_RESULTS_SIZE))
+            if response and response['outputs']
+        ]
+
+    cursor.execute('DELETE FROM hot_results')
+    cursor.executemany('INSERT INTO hot_results (query_key, payload) VALUES (?, ?)', rows)
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute responses for the most likely queries')
+    parser.add_argument('--db', default='dictionary.db', help='Database to update (default: dictionary.db)')
+    parser.add_argument('--limit', type=int, default=HOT_LIMIT,
+                        help=f'Queries to precompute (default: {HOT_LIMIT})')
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"Error: Database not found: {args.db}")
+        return 1
+
+    count = build_hot_results(args.db, args.limit)
+    conn = sqlite3.connect(args.db)
+    cursor = conn.cursor()
+    cursor.execute('SELECT COALESCE(SUM(LENGTH(CAST(payload AS BLOB))), 0) FROM hot_results')
+    payload_bytes = cursor.fetchone()[0]
+    disk_bytes = table_size(cursor, 'hot_results')
+    conn.close()
+    print(f"✓ Stored {count} hot responses ({payload_bytes / (1024 * 1024):.1f} MB of JSON"
+          + (f", {disk_bytes / (1024 * 1024):.1f} MB on disk)" if disk_bytes is not None else ")"))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,8 +3,11 @@
 Import example sentences from Tatoeba Project.
 
 Tatoeba (tatoeba.org) is an open-source collection of sentences and translations.
-This script downloads Japanese and Chinese sentences with English translations
-and links them to dictionary words.
+This script downloads Japanese and Chinese sentences and links the best few
+for each common dictionary word (see example_score) to it, with their English
+translation when Tatoeba has one. Every word of any frequency is also indexed
+in sentence_terms against all sentences containing it, for paging through
+more examples (see GetExamplesPage in core/database/queries.go).
 
 Data files:
 - sentences.tar.bz2: All sentences with IDs and text
@@ -16,6 +19,7 @@ License: CC BY 2.0 FR
 import argparse
 import bz2
 import csv
+import heapq
 import os
 import re
 import sqlite3
@@ -23,6 +27,9 @@ import tarfile
 from collections import defaultdict
 from pathlib import Path
 
+from char_index import is_cjk
+from hot_results import build_hot_results
+
 try:
     import requests
 except ImportError:
@@ -34,6 +41,19 @@ except ImportError:
 SENTENCES_URL = "https://downloads.tatoeba.org/exports/sentences.tar.bz2"
 LINKS_URL = "https://downloads.tatoeba.org/exports/links.tar.bz2"
 
+# Tatoeba languages imported as examples → dictionary language
+SOURCE_LANGUAGES = {'jpn': 'ja', 'cmn': 'zh'}
+
+# Example quality score (see example_score)
+TRANSLATION_BONUS = 2000  # translated sentences always beat untranslated ones
+IDEAL_LENGTH = 12         # characters; shorter is too terse, longer too hard
+LENGTH_PENALTY = 20       # per character away from IDEAL_LENGTH
+MAX_LENGTH_PENALTY = 600  # so TRANSLATION_BONUS - MAX_LENGTH_PENALTY stays above
+                          # any co_occurring_rank (rank_score is at most 1200)
+
+# sentence_terms rows buffered before each insert
+TERMS_BATCH = 50000
+
 def download_file(url, dest_path):
     """Download a file with progress indication."""
     print(f"Downloading {url}...")
@@ -95,136 +115,198 @@ def load_links(links_file):
     print(f"✓ Loaded {len(links)} translation links")
     return links
 
-def find_matching_words(db_conn, text, language):
-    """Find words in the database that appear in the sentence."""
+def load_common_words(db_conn, language):
+    """Common words to look for in sentences of a Tatoeba language.
+
+    Returns [(lang, word_id, forms, rank_score)], longest headword first.
+    """
     cursor = db_conn.cursor()
-    matched_words = []
 
     if language == 'jpn':
         # Japanese: search by headword or reading
         cursor.execute("""
-            SELECT id, headword, reading
+            SELECT id, headword, reading, rank_score
             FROM japanese_words
             WHERE is_common = 1
             ORDER BY LENGTH(headword) DESC
             LIMIT 5000
         """)
-
-        for word_id, headword, reading in cursor.fetchall():
-            if headword in text or reading in text:
-                matched_words.append(('ja', word_id))
-
-    elif language == 'cmn':
-        # Chinese: search by simplified form
-        cursor.execute("""
-            SELECT id, simplified
-            FROM chinese_words
-            WHERE is_common = 1
-            ORDER BY LENGTH(simplified) DESC
-            LIMIT 5000
-        """)
-
-        for word_id, simplified in cursor.fetchall():
-            if simplified in text:
-                matched_words.append(('zh', word_id))
-
-    return matched_words
+        return [('ja', word_id, (headword, reading), score)
+                for word_id, headword, reading, score in cursor.fetchall()]
+
+    # Chinese: search by simplified form
+    cursor.execute("""
+        SELECT id, simplified, rank_score
+        FROM chinese_words
+        WHERE is_common = 1
+        ORDER BY LENGTH(simplified) DESC
+        LIMIT 5000
+    """)
+    return [('zh', word_id, (simplified,), score)
+            for word_id, simplified, score in cursor.fetchall()]
+
+def load_word_forms(db_conn, language):
+    """Index every word of a Tatoeba language by its written forms.
+
+    Returns ({form: [word_id, ...]}, longest form length). Japanese words
+    are indexed by headword and reading, Chinese words by both scripts
+    (Tatoeba has traditional and simplified sentences). Single characters
+    other than ideographs (particles like は) would match nearly every
+    sentence, so they are left out.
+    """
+    cursor = db_conn.cursor()
+    if language == 'jpn':
+        cursor.execute("SELECT id, headword, reading FROM japanese_words")
+    else:
+        cursor.execute("SELECT id, simplified, traditional FROM chinese_words")
+
+    forms = defaultdict(list)
+    for word_id, *spellings in cursor.fetchall():
+        for form in dict.fromkeys(spellings):
+            if form and (len(form) > 1 or is_cjk(form)):
+                forms[form].append(word_id)
+    return dict(forms), max(map(len, forms), default=0)
+
+def find_terms(forms, longest, text):
+    """IDs of every word with a form appearing in text, via substring probes."""
+    word_ids = set()
+    for start in range(len(text)):
+        for end in range(start + 1, min(start + longest, len(text)) + 1):
+            word_ids.update(forms.get(text[start:end], ()))
+    return word_ids
+
+def find_matching_words(words, text):
+    """(lang, word_id, rank_score) of every word with a form appearing in text."""
+    return [(lang, word_id, score)
+            for lang, word_id, forms, score in words
+            if any(form in text for form in forms)]
+
+def find_translation(sentences, links, sentence_id):
+    """English text of the first English sentence linked to sentence_id, or None."""
+    for linked_id in links.get(sentence_id, []):
+        if linked_id in sentences and sentences[linked_id]['lang'] == 'eng':
+            return sentences[linked_id]['text']
+    return None
+
+def example_score(text, english_text, co_occurring_rank):
+    """Cheap quality score for an example sentence (higher = better).
+
+    - A translation is worth more than anything else, however long the
+      sentence: the length penalty stops at MAX_LENGTH_PENALTY
+    - Sentences near IDEAL_LENGTH characters beat terse or long ones
+    - co_occurring_rank is the mean rank_score of the other dictionary words
+      in the sentence; common surroundings make it easier to read
+    """
+    score = TRANSLATION_BONUS if english_text else 0
+    score -= min(MAX_LENGTH_PENALTY, LENGTH_PENALTY * abs(len(text) - IDEAL_LENGTH))
+    score += int(co_occurring_rank)
+    return score
+
+def insert_sentence(cursor, lang, text, english_text):
+    """Store an example sentence once and return its ID."""
+    cursor.execute("""
+        INSERT INTO sentences (lang, text, english)
+        VALUES (?, ?, ?)
+    """, (lang, text, english_text))
+    return cursor.lastrowid
+
+def _insert_terms(cursor, rows):
+    cursor.executemany("""
+        INSERT INTO sentence_terms (lang, word_id, sentence_id)
+        VALUES (?, ?, ?)
+    """, rows)
 
 def import_examples(db_path, sentences, links, max_per_word=5):
-    """Import examples into the database."""
+    """Import the best max_per_word examples of every common word.
+
+    Sentences are streamed once. Every sentence containing a dictionary
+    word is stored once in sentences and indexed in sentence_terms under
+    each word it contains. Each common word also keeps a min-heap of its
+    max_per_word best (score, order, sentence) candidates, so that memory
+    is bounded by words × max_per_word however large the corpus is;
+    example_links then points every word at its picks with their score.
+    """
     print("\nImporting examples into database...")
 
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     # Clear existing examples
-    cursor.execute("DELETE FROM examples")
-
-    # Track examples per word to avoid duplicates
-    examples_per_word = defaultdict(int)
-    total_imported = 0
-
-    # Process Japanese sentences
-    ja_count = 0
-    for sent_id, sent_data in sentences.items():
-        if sent_data['lang'] != 'jpn':
+    cursor.execute("DELETE FROM example_links")
+    cursor.execute("DELETE FROM sentence_terms")
+    cursor.execute("DELETE FROM sentences")
+
+    words = {language: load_common_words(conn, language) for language in SOURCE_LANGUAGES}
+    forms = {language: load_word_forms(conn, language) for language in SOURCE_LANGUAGES}
+
+    # (lang, word_id) → min-heap of (score, -order, sentence_id); ties keep
+    # the earlier sentence
+    best = defaultdict(list)
+    processed = {language: 0 for language in SOURCE_LANGUAGES}
+    sentences_stored = 0
+    terms = []
+    total_terms = 0
+    for order, (sentence_id, sent_data) in enumerate(sentences.items()):
+        language = sent_data['lang']
+        if language not in SOURCE_LANGUAGES:
             continue
 
-        # Find English translation
-        english_text = None
-        for linked_id in links.get(sent_id, []):
-            if linked_id in sentences and sentences[linked_id]['lang'] == 'eng':
-                english_text = sentences[linked_id]['text']
-                break
+        processed[language] += 1
+        if sum(processed.values()) % 1000 == 0:
+            print(f"\rProcessed {sum(processed.values())} sentences", end='')
 
-        if not english_text:
+        term_ids = find_terms(*forms[language], sent_data['text'])
+        matched_words = find_matching_words(words[language], sent_data['text'])
+        if not term_ids and not matched_words:
             continue
 
-        # Find matching words
-        matched_words = find_matching_words(conn, sent_data['text'], 'jpn')
-
-        for lang, word_id in matched_words:
-            key = (lang, word_id)
-            if examples_per_word[key] >= max_per_word:
-                continue
-
-            cursor.execute("""
-                INSERT INTO examples (language, word_id, source_text, english_text)
-                VALUES (?, ?, ?, ?)
-            """, (lang, word_id, sent_data['text'], english_text))
-
-            examples_per_word[key] += 1
-            total_imported += 1
-
-        ja_count += 1
-        if ja_count % 1000 == 0:
-            print(f"\rProcessed {ja_count} Japanese sentences, imported {total_imported} examples", end='')
-
-    print(f"\n✓ Japanese: {ja_count} sentences processed")
-
-    # Process Chinese sentences
-    zh_count = 0
-    for sent_id, sent_data in sentences.items():
-        if sent_data['lang'] != 'cmn':
-            continue
-
-        # Find English translation
-        english_text = None
-        for linked_id in links.get(sent_id, []):
-            if linked_id in sentences and sentences[linked_id]['lang'] == 'eng':
-                english_text = sentences[linked_id]['text']
-                break
-
-        if not english_text:
-            continue
-
-        # Find matching words
-        matched_words = find_matching_words(conn, sent_data['text'], 'cmn')
-
-        for lang, word_id in matched_words:
-            key = (lang, word_id)
-            if examples_per_word[key] >= max_per_word:
-                continue
-
+        lang = SOURCE_LANGUAGES[language]
+        english_text = find_translation(sentences, links, sentence_id)
+        stored_id = insert_sentence(cursor, lang, sent_data['text'], english_text)
+        sentences_stored += 1
+
+        terms.extend((lang, word_id, stored_id) for word_id in term_ids)
+        if len(terms) >= TERMS_BATCH:
+            _insert_terms(cursor, terms)
+            total_terms += len(terms)
+            terms = []
+
+        total_rank = sum(rank for _, _, rank in matched_words)
+        others = len(matched_words) - 1
+
+        for lang, word_id, rank in matched_words:
+            co_occurring_rank = (total_rank - rank) / others if others else 0
+            candidate = (example_score(sent_data['text'], english_text, co_occurring_rank),
+                         -order, stored_id)
+            heap = best[(lang, word_id)]
+            if len(heap) < max_per_word:
+                heapq.heappush(heap, candidate)
+            elif candidate > heap[0]:
+                heapq.heapreplace(heap, candidate)
+
+    _insert_terms(cursor, terms)
+    total_terms += len(terms)
+
+    print(f"\n✓ Japanese: {processed['jpn']} sentences processed")
+    print(f"✓ Chinese: {processed['cmn']} sentences processed")
+
+    # Link each word to its picks
+    total_imported = 0
+    for (lang, word_id), heap in best.items():
+        for score, _, sentence_id in heap:
             cursor.execute("""
-                INSERT INTO examples (language, word_id, source_text, english_text)
+                INSERT INTO example_links (lang, word_id, sentence_id, score)
                 VALUES (?, ?, ?, ?)
-            """, (lang, word_id, sent_data['text'], english_text))
-
-            examples_per_word[key] += 1
+            """, (lang, word_id, sentence_id, score))
             total_imported += 1
 
-        zh_count += 1
-        if zh_count % 1000 == 0:
-            print(f"\rProcessed {zh_count} Chinese sentences, imported {total_imported} examples", end='')
-
-    print(f"\n✓ Chinese: {zh_count} sentences processed")
-
     conn.commit()
     conn.close()
 
     print(f"\n✅ Imported {total_imported} examples")
-    print(f"   Words with examples: {len(examples_per_word)}")
+    print(f"   Sentences stored: {sentences_stored}")
+    print(f"   Words with examples: {len(best)}")
+    print(f"   Sentence index entries: {total_terms}")
 
 def main():
     parser = argparse.ArgumentParser(description='Import Tatoeba example sentences')
@@ -284,6 +366,11 @@ def main():
     # Import into database
     import_examples(args.db, sentences, links, args.max_per_word)
 
+    # Stored responses include examples, so rebuild them
+    print("\nRebuilding hot query results...")
+    hot_count = build_hot_results(args.db)
+    print(f"✓ Stored {hot_count} responses")
+
     print("\n✅ Done!")
     return 0
 
@@ -5,15 +5,32 @@ import argparse
 import re
 import sqlite3
 import sys
+import time
 from collections import defaultdict
 from pathlib import Path
 
+from autocomplete import build_autocomplete
+from char_index import build_char_index
+from db_report import table_size
+from deinflect import build_inflections, conjugation_class
+from fuzzy import build_fuzzy_index
+from hot_results import build_hot_results
+from kana import reading_romaji_key, to_hiragana
+from pinyin import numbered_to_tones, pinyin_key
+from radicals import build_radical_index
+from variants import build_variants
+from ranker import rank_score
+
 try:
     from lxml import etree
 except ImportError:
     print("Error: lxml not found. Install with: pip install lxml")
     sys.exit(1)
 
+# tridict (repository root) packs the optional lookup artifact
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tridict.artifact import build_artifact  # noqa: E402
+
 
 # Priority tag to frequency rank mapping
 # Lower rank = more common
@@ -28,13 +45,17 @@ PRIORITY_MAP = {
     'gai2': 300,
 }
 
-# JLPT tag mapping
+# ke_inf values marking old-kanji (kyūjitai) spellings, as entity name or
+# as the expanded entity text
+OUTDATED_KANJI_INFO = {'oK', 'word containing out-dated kanji or kanji usage'}
+
+# JLPT tag mapping (stored as the N-level number)
 JLPT_MAP = {
-    'jlpt-n5': 'N5',
-    'jlpt-n4': 'N4',
-    'jlpt-n3': 'N3',
-    'jlpt-n2': 'N2',
-    'jlpt-n1': 'N1',
+    'jlpt-n5': 5,
+    'jlpt-n4': 4,
+    'jlpt-n3': 3,
+    'jlpt-n2': 2,
+    'jlpt-n1': 1,
 }
 
 # HSK level patterns (extracted from definitions or tags)
@@ -47,6 +68,10 @@ HSK_PATTERNS = {
     6: ['HSK 6', 'HSK6'],
 }
 
+# One radical of a Unihan kRSUnicode value: number, apostrophes for a
+# simplified radical form, residual strokes
+RS_UNICODE_PATTERN = re.compile(r"(\d+)'*\.-?\d+")
+
 
 class DatabaseBuilder:
     """Build SQLite database from parsed dictionary data."""
@@ -55,6 +80,7 @@ class DatabaseBuilder:
         self.db_path = db_path
         self.conn = None
         self.cursor = None
+        self.gloss_ids = {}
 
     def __enter__(self):
         self.conn = sqlite3.connect(self.db_path)
@@ -74,44 +100,70 @@ class DatabaseBuilder:
         self.conn.commit()
         print(f"  ✓ Schema created")
 
-    def insert_japanese_word(self, headword, reading, is_common, freq_rank, jlpt_level, stroke_count):
+    def insert_japanese_word(self, headword, reading, reading_romaji,
+                             is_common, freq_rank, rank_score, jlpt_level, stroke_count,
+                             conjugation):
         """Insert a Japanese word and return its ID."""
         self.cursor.execute('''
             INSERT INTO japanese_words
-            (headword, reading, is_common, frequency_rank, jlpt_level, stroke_count)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (headword, reading, is_common, freq_rank, jlpt_level, stroke_count))
+            (headword, reading, reading_romaji,
+             is_common, frequency_rank, rank_score, jlpt_level, stroke_count, conjugation)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (headword, reading, reading_romaji,
+              is_common, freq_rank, rank_score, jlpt_level, stroke_count, conjugation))
         return self.cursor.lastrowid
 
+    def insert_japanese_forms(self, word_id, forms):
+        """Insert every kanji/kana spelling of a Japanese word."""
+        self.cursor.executemany('''
+            INSERT OR IGNORE INTO japanese_forms (form, word_id, kind, priority, is_outdated)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(f['form'], word_id, f['kind'], f['priority'], f['outdated']) for f in forms])
+
+    def intern_gloss(self, gloss):
+        """Return the glosses row ID for gloss, inserting it on first use."""
+        gloss_id = self.gloss_ids.get(gloss)
+        if gloss_id is None:
+            self.cursor.execute('INSERT INTO glosses (text) VALUES (?)', (gloss,))
+            gloss_id = self.gloss_ids[gloss] = self.cursor.lastrowid
+        return gloss_id
+
     def insert_japanese_definition(self, word_id, gloss, pos):
         """Insert a Japanese definition."""
         self.cursor.execute('''
-            INSERT INTO japanese_definitions (word_id, english_gloss, pos)
+            INSERT INTO japanese_definitions (word_id, gloss_id, pos)
             VALUES (?, ?, ?)
-        ''', (word_id, gloss, pos))
+        ''', (word_id, self.intern_gloss(gloss), pos))
 
-    def insert_chinese_word(self, simplified, traditional, pinyin, is_common, freq_rank, hsk_level, stroke_count):
+    def insert_chinese_word(self, simplified, traditional, pinyin, pinyin_marked, pinyin_key,
+                            is_common, freq_rank, rank_score, hsk_level, stroke_count):
         """Insert a Chinese word and return its ID."""
         self.cursor.execute('''
             INSERT INTO chinese_words
-            (simplified, traditional, pinyin, is_common, frequency_rank, hsk_level, stroke_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (simplified, traditional, pinyin, is_common, freq_rank, hsk_level, stroke_count))
+            (simplified, traditional, pinyin, pinyin_marked, pinyin_key,
+             is_common, frequency_rank, rank_score, hsk_level, stroke_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (simplified, traditional, pinyin, pinyin_marked, pinyin_key,
+              is_common, freq_rank, rank_score, hsk_level, stroke_count))
         return self.cursor.lastrowid
 
     def insert_chinese_definition(self, word_id, gloss):
         """Insert a Chinese definition."""
         self.cursor.execute('''
-            INSERT INTO chinese_definitions (word_id, english_gloss)
+            INSERT INTO chinese_definitions (word_id, gloss_id)
             VALUES (?, ?)
-        ''', (word_id, gloss))
+        ''', (word_id, self.intern_gloss(gloss)))
 
     def insert_example(self, language, word_id, source_text, english_text):
-        """Insert an example sentence."""
+        """Insert an example sentence and link it to a word."""
         self.cursor.execute('''
-            INSERT INTO examples (language, word_id, source_text, english_text)
-            VALUES (?, ?, ?, ?)
-        ''', (language, word_id, source_text, english_text))
+            INSERT INTO sentences (lang, text, english)
+            VALUES (?, ?, ?)
+        ''', (language, source_text, english_text))
+        self.cursor.execute('''
+            INSERT INTO example_links (lang, word_id, sentence_id)
+            VALUES (?, ?, ?)
+        ''', (language, word_id, self.cursor.lastrowid))
 
     def commit(self):
         """Commit transaction."""
@@ -124,10 +176,15 @@ def parse_jmdict(xml_path: Path, kanjidic_data: dict) -> list:
     Each entry: {
         'headword': str,
         'reading': str,
+        'reading_romaji': str,
         'is_common': bool,
         'frequency_rank': int or None,
-        'jlpt_level': str or None,
+        'rank_score': int,
+        'jlpt_level': int or None,
         'stroke_count': int or None,
+        'conjugation': str or None,
+        'forms': [{'form': str, 'kind': 'k' or 'r', 'priority': int or None,
+                   'outdated': bool}],
         'definitions': [{'gloss': str, 'pos': str}],
     }
     """
@@ -164,6 +221,21 @@ def parse_jmdict(xml_path: Path, kanjidic_data: dict) -> list:
         r_ele = entry.find('r_ele')
         reading = r_ele.find('reb').text if r_ele is not None else headword
 
+        # Collect every spelling with its own priority rank. Katakana
+        # readings also get a hiragana-folded form for kana-insensitive lookup.
+        forms = []
+        for element, text_tag, pri_tag, kind in (('k_ele', 'keb', 'ke_pri', 'k'),
+                                                 ('r_ele', 'reb', 're_pri', 'r')):
+            for ele in entry.findall(element):
+                form = ele.find(text_tag).text
+                form_ranks = [PRIORITY_MAP.get(p.text, 1000) for p in ele.findall(pri_tag)]
+                priority = min(form_ranks) if form_ranks else None
+                outdated = any(inf.text in OUTDATED_KANJI_INFO for inf in ele.findall('ke_inf'))
+                forms.append({'form': form, 'kind': kind, 'priority': priority, 'outdated': outdated})
+                if kind == 'r' and to_hiragana(form) != form:
+                    forms.append({'form': to_hiragana(form), 'kind': kind, 'priority': priority,
+                                  'outdated': False})
+
         # Extract priority tags for frequency ranking
         priorities = []
         for ke_pri in entry.findall('.//ke_pri'):
@@ -189,6 +261,9 @@ def parse_jmdict(xml_path: Path, kanjidic_data: dict) -> list:
         # Get stroke count from KANJIDIC2
         stroke_count = kanjidic_data.get(headword, {}).get('stroke_count')
 
+        # Conjugation class from the first verb/adjective POS of any sense
+        conjugation = conjugation_class(pos.text for pos in entry.findall('sense/pos'))
+
         # Extract definitions (sense elements)
         definitions = []
         for sense in entry.findall('sense'):
@@ -212,10 +287,14 @@ def parse_jmdict(xml_path: Path, kanjidic_data: dict) -> list:
             entries.append({
                 'headword': headword,
                 'reading': reading,
+                'reading_romaji': reading_romaji_key(reading),
                 'is_common': is_common,
                 'frequency_rank': freq_rank,
+                'rank_score': rank_score(headword, is_common, freq_rank),
                 'jlpt_level': jlpt_level,
                 'stroke_count': stroke_count,
+                'conjugation': conjugation,
+                'forms': forms,
                 'definitions': definitions,
             })
 
@@ -232,9 +311,12 @@ def parse_cedict(txt_path: Path) -> list:
         'simplified': str,
         'traditional': str,
         'pinyin': str,
+        'pinyin_marked': str,
+        'pinyin_key': str,
         'is_common': bool,
         'frequency_rank': int or None,
-        'hsk_level': str or None,
+        'rank_score': int,
+        'hsk_level': int or None,
         'stroke_count': int or None,
         'definitions': [str],
     }
@@ -279,21 +361,21 @@ def parse_cedict(txt_path: Path) -> list:
         for level, patterns in HSK_PATTERNS.items():
             for pattern in patterns:
                 if any(pattern in d for d in definitions):
-                    hsk_level = str(level)
+                    hsk_level = level
                     break
             if hsk_level:
                 break
 
         # Estimate frequency based on word length (shorter = more common for basic words)
         # This is a heuristic; real frequency data would be better
-        is_common = len(simplified) <= 2 or hsk_level in ['1', '2', '3']
+        is_common = len(simplified) <= 2 or hsk_level in (1, 2, 3)
         freq_rank = None
         if is_common:
             # Rough heuristic: shorter words are more common
             freq_rank = 100 + (len(simplified) - 1) * 50
             if hsk_level:
                 # HSK level provides better frequency estimate
-                freq_rank = int(hsk_level) * 200
+                freq_rank = hsk_level * 200
 
         # Stroke count (approximate by character count * 10)
         # Real stroke data would come from a separate database
@@ -303,8 +385,11 @@ def parse_cedict(txt_path: Path) -> list:
             'simplified': simplified,
             'traditional': traditional,
             'pinyin': pinyin,
+            'pinyin_marked': numbered_to_tones(pinyin),
+            'pinyin_key': pinyin_key(pinyin),
             'is_common': is_common,
             'frequency_rank': freq_rank,
+            'rank_score': rank_score(simplified, is_common, freq_rank),
             'hsk_level': hsk_level,
             'stroke_count': stroke_count,
             'definitions': definitions,
@@ -317,7 +402,10 @@ def parse_cedict(txt_path: Path) -> list:
 def parse_kanjidic(xml_path: Path) -> dict:
     """Parse KANJIDIC2 XML file and return kanji data.
 
-    Returns: {kanji: {'stroke_count': int, 'grade': int, ...}}
+    Returns: {kanji: {'stroke_count': int, 'grade': int, 'radicals': [int]}}
+
+    radicals holds the Kangxi (classical) radical number first, then the
+    Nelson radical number when it differs.
     """
     print(f"Parsing KANJIDIC2: {xml_path}")
 
@@ -351,16 +439,61 @@ def parse_kanjidic(xml_path: Path) -> dict:
             if g is not None:
                 grade = int(g.text)
 
+        # Get radical numbers (classical first, then Nelson if different)
+        radicals = []
+        for rad_type in ('classical', 'nelson_c'):
+            for rad in character.findall(f"radical/rad_value[@rad_type='{rad_type}']"):
+                number = int(rad.text)
+                if 1 <= number <= 214 and number not in radicals:
+                    radicals.append(number)
+
         kanji_data[kanji] = {
             'stroke_count': stroke_count,
             'grade': grade,
+            'radicals': radicals,
         }
 
     print(f"  ✓ Parsed {len(kanji_data)} kanji characters")
     return kanji_data
 
 
-def build_database(output_path: Path, japanese_entries: list, chinese_entries: list, schema_path: Path):
+def parse_unihan(txt_path: Path) -> dict:
+    """Parse Unihan_IRGSources.txt and return each hanzi's radicals.
+
+    Returns: {hanzi: [int]}
+
+    kRSUnicode values look like "9.3" or "149'.2 150.1": Kangxi radical
+    number, apostrophes for a simplified radical form, residual strokes.
+    """
+    print(f"Parsing Unihan: {txt_path}")
+
+    if not txt_path.exists():
+        print("  ⚠ File not found (optional - simplified-only hanzi get no radicals)")
+        return {}
+
+    hanzi_radicals = {}
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.startswith('U+'):
+                continue
+            codepoint, field, value = line.rstrip('\n').split('\t', 2)
+            if field != 'kRSUnicode':
+                continue
+
+            radicals = []
+            for match in RS_UNICODE_PATTERN.finditer(value):
+                number = int(match.group(1))
+                if 1 <= number <= 214 and number not in radicals:
+                    radicals.append(number)
+            if radicals:
+                hanzi_radicals[chr(int(codepoint[2:], 16))] = radicals
+
+    print(f"  ✓ Parsed {len(hanzi_radicals)} hanzi radicals")
+    return hanzi_radicals
+
+
+def build_database(output_path: Path, japanese_entries: list, chinese_entries: list, schema_path: Path,
+                   kanjidic_data: dict, hanzi_radicals: dict):
     """Build SQLite database from parsed entries."""
     print(f"\nBuilding database: {output_path}")
 
@@ -383,12 +516,17 @@ def build_database(output_path: Path, japanese_entries: list, chinese_entries: l
             word_id = db.insert_japanese_word(
                 headword=entry['headword'],
                 reading=entry['reading'],
+                reading_romaji=entry['reading_romaji'],
                 is_common=entry['is_common'],
                 freq_rank=entry['frequency_rank'],
+                rank_score=entry['rank_score'],
                 jlpt_level=entry['jlpt_level'],
-                stroke_count=entry['stroke_count']
+                stroke_count=entry['stroke_count'],
+                conjugation=entry['conjugation']
             )
 
+            db.insert_japanese_forms(word_id, entry['forms'])
+
             for defn in entry['definitions']:
                 db.insert_japanese_definition(
                     word_id=word_id,
@@ -410,8 +548,11 @@ def build_database(output_path: Path, japanese_entries: list, chinese_entries: l
                 simplified=entry['simplified'],
                 traditional=entry['traditional'],
                 pinyin=entry['pinyin'],
+                pinyin_marked=entry['pinyin_marked'],
+                pinyin_key=entry['pinyin_key'],
                 is_common=entry['is_common'],
                 freq_rank=entry['frequency_rank'],
+                rank_score=entry['rank_score'],
                 hsk_level=entry['hsk_level'],
                 stroke_count=entry['stroke_count']
             )
@@ -425,6 +566,49 @@ def build_database(output_path: Path, japanese_entries: list, chinese_entries: l
         db.commit()
         print(f"  ✓ Inserted Chinese entries")
 
+        # Build character inverted index
+        print(f"\nBuilding character index...")
+        char_rows = build_char_index(db.cursor)
+        db.commit()
+        print(f"  ✓ Indexed {char_rows} character occurrences")
+
+        # Build conjugated-form table, reporting its cost
+        print(f"\nBuilding inflection table...")
+        started = time.perf_counter()
+        inflection_rows = build_inflections(db.cursor)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"  ✓ Generated {inflection_rows} conjugated forms in {elapsed:.1f}s")
+
+        # Build cross-script variant classes and script_key columns
+        print(f"\nBuilding character variant table...")
+        variant_count = build_variants(db.cursor)
+        db.commit()
+        print(f"  ✓ Mapped {variant_count} variant characters")
+
+        # Build radical → character index (needs KANJIDIC2, Unihan for hanzi)
+        print(f"\nBuilding radical index...")
+        component_rows = build_radical_index(db.cursor, kanjidic_data, hanzi_radicals)
+        db.commit()
+        print(f"  ✓ Indexed {component_rows} radical/character pairs")
+
+        # Build typeahead index
+        print(f"\nBuilding autocomplete index...")
+        key_count = build_autocomplete(db.cursor)
+        db.commit()
+        print(f"  ✓ Indexed {key_count} completion keys")
+
+        # Build trigram index for misspelled English queries
+        print(f"\nBuilding fuzzy gloss index...")
+        term_count = build_fuzzy_index(db.cursor)
+        db.commit()
+        print(f"  ✓ Indexed {term_count} gloss terms")
+
+        # Precompute responses of the likeliest queries (needs every table above)
+        print(f"\nBuilding hot query results...")
+        hot_count = build_hot_results(output_path)
+        print(f"  ✓ Stored {hot_count} responses")
+
         # Optimize database
         print(f"\nOptimizing database...")
         db.cursor.execute('ANALYZE')
@@ -434,12 +618,20 @@ def build_database(output_path: Path, japanese_entries: list, chinese_entries: l
 
     # Show database statistics
     file_size_mb = output_path.stat().st_size / (1024 * 1024)
+    conn = sqlite3.connect(output_path)
+    inflections_bytes = table_size(conn.cursor(), 'japanese_inflections')
+    hot_bytes = table_size(conn.cursor(), 'hot_results')
+    conn.close()
     print(f"\n{'='*60}")
     print(f"Database created successfully!")
     print(f"  Location: {output_path}")
     print(f"  Size: {file_size_mb:.1f} MB")
     print(f"  Japanese entries: {len(japanese_entries)}")
     print(f"  Chinese entries: {len(chinese_entries)}")
+    if inflections_bytes is not None:
+        print(f"  Inflection table: {inflections_bytes / (1024 * 1024):.1f} MB")
+    if hot_bytes is not None:
+        print(f"  Hot results table: {hot_bytes / (1024 * 1024):.1f} MB")
     print(f"{'='*60}")
 
 
@@ -451,6 +643,8 @@ def main():
                         help='Output SQLite database path (default: dictionary.db)')
     parser.add_argument('--sample', action='store_true',
                         help='Use sample data only')
+    parser.add_argument('--artifact', metavar='PATH',
+                        help='Also write a memory-mapped lookup artifact (see tridict/artifact.py)')
     args = parser.parse_args()
 
     # Resolve paths
@@ -481,6 +675,7 @@ def main():
     jmdict_path = input_dir / 'JMdict_e.xml'
     cedict_path = input_dir / 'cedict.txt'
     kanjidic_path = input_dir / 'kanjidic2.xml'
+    unihan_path = input_dir / 'Unihan_IRGSources.txt'
 
     # Check required files
     if not jmdict_path.exists():
@@ -498,6 +693,9 @@ def main():
     # Parse KANJIDIC2 (optional)
     kanjidic_data = parse_kanjidic(kanjidic_path)
 
+    # Parse Unihan radicals (optional)
+    hanzi_radicals = parse_unihan(unihan_path)
+
     # Parse dictionaries
     japanese_entries = parse_jmdict(jmdict_path, kanjidic_data)
     chinese_entries = parse_cedict(cedict_path)
@@ -507,7 +705,14 @@ def main():
         return 1
 
     # Build database
-    build_database(output_path, japanese_entries, chinese_entries, schema_path)
+    build_database(output_path, japanese_entries, chinese_entries, schema_path, kanjidic_data,
+                   hanzi_radicals)
+
+    if args.artifact:
+        artifact_path = Path(__file__).parent / args.artifact
+        print(f"\nWriting lookup artifact: {artifact_path}")
+        size = build_artifact(output_path, artifact_path)
+        print(f"  ✓ {size / (1024 * 1024):.1f} MB")
 
     print("\n✅ Data ingestion complete!")
     print("\nNext steps:")
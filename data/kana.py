@@ -0,0 +1,116 @@
+"""Kana folding and romaji helpers for the ingest pipeline.
+
+At ingest katakana readings get a hiragana-folded japanese_forms row, so
+キャット and きゃっと probe the same key, and every reading gets
+reading_romaji: a Hepburn romaji search key ("neko", "tokyo"), so ASCII
+input can be looked up without a scan.
+
+Both conversions are table driven: the tables are built once at import
+and applied with str.translate / dict lookups. Folding and the search key
+itself are tridict.text's to_hiragana and romaji_key, the functions the
+Python lookups probe with (and ports of core/kana/kana.go).
+"""
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# tridict (repository root) holds the key normalization shared with lookups
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tridict.text import romaji_key, to_hiragana  # noqa: E402,F401
+
+# Single kana → Hepburn
+_MONOGRAPHS = {
+    'あ': 'a', 'い': 'i', 'う': 'u', 'え': 'e', 'お': 'o',
+    'か': 'ka', 'き': 'ki', 'く': 'ku', 'け': 'ke', 'こ': 'ko',
+    'さ': 'sa', 'し': 'shi', 'す': 'su', 'せ': 'se', 'そ': 'so',
+    'た': 'ta', 'ち': 'chi', 'つ': 'tsu', 'て': 'te', 'と': 'to',
+    'な': 'na', 'に': 'ni', 'ぬ': 'nu', 'ね': 'ne', 'の': 'no',
+    'は': 'ha', 'ひ': 'hi', 'ふ': 'fu', 'へ': 'he', 'ほ': 'ho',
+    'ま': 'ma', 'み': 'mi', 'む': 'mu', 'め': 'me', 'も': 'mo',
+    'や': 'ya', 'ゆ': 'yu', 'よ': 'yo',
+    'ら': 'ra', 'り': 'ri', 'る': 'ru', 'れ': 're', 'ろ': 'ro',
+    'わ': 'wa', 'ゐ': 'i', 'ゑ': 'e', 'を': 'o', 'ん': 'n',
+    'が': 'ga', 'ぎ': 'gi', 'ぐ': 'gu', 'げ': 'ge', 'ご': 'go',
+    'ざ': 'za', 'じ': 'ji', 'ず': 'zu', 'ぜ': 'ze', 'ぞ': 'zo',
+    'だ': 'da', 'ぢ': 'ji', 'づ': 'zu', 'で': 'de', 'ど': 'do',
+    'ば': 'ba', 'び': 'bi', 'ぶ': 'bu', 'べ': 'be', 'ぼ': 'bo',
+    'ぱ': 'pa', 'ぴ': 'pi', 'ぷ': 'pu', 'ぺ': 'pe', 'ぽ': 'po',
+    'ゔ': 'vu',
+    'ぁ': 'a', 'ぃ': 'i', 'ぅ': 'u', 'ぇ': 'e', 'ぉ': 'o',
+    'ゃ': 'ya', 'ゅ': 'yu', 'ょ': 'yo', 'ゎ': 'wa', 'ゕ': 'ka', 'ゖ': 'ke',
+}
+
+# Loanword digraphs that don't follow the i-row + small ya/yu/yo pattern
+_EXTENDED_DIGRAPHS = {
+    'ふぁ': 'fa', 'ふぃ': 'fi', 'ふぇ': 'fe', 'ふぉ': 'fo',
+    'てぃ': 'ti', 'でぃ': 'di', 'とぅ': 'tu', 'どぅ': 'du',
+    'うぃ': 'wi', 'うぇ': 'we', 'うぉ': 'wo',
+    'ゔぁ': 'va', 'ゔぃ': 'vi', 'ゔぇ': 've', 'ゔぉ': 'vo',
+    'しぇ': 'she', 'じぇ': 'je', 'ちぇ': 'che',
+    'つぁ': 'tsa', 'つぃ': 'tsi', 'つぇ': 'tse', 'つぉ': 'tso',
+}
+
+
+def _build_romaji_table() -> dict:
+    """Build the kana → Hepburn table, including ki+ya style digraphs."""
+    table = dict(_MONOGRAPHS)
+    for base in 'きしちにひみりぎじぢびぴ':
+        stem = table[base][:-1]  # drop the trailing 'i'
+        for small, vowel in (('ゃ', 'a'), ('ゅ', 'u'), ('ょ', 'o')):
+            # shi/chi/ji digraphs are sha/cha/ja, the rest are kya/nya/...
+            glide = '' if stem in ('sh', 'ch', 'j') else 'y'
+            table[base + small] = stem + glide + vowel
+    table.update(_EXTENDED_DIGRAPHS)
+    return table
+
+
+ROMAJI_TABLE = _build_romaji_table()
+
+VOWELS = 'aeiou'
+
+
+@lru_cache(maxsize=None)
+def to_romaji(kana: str) -> str:
+    """Convert a kana reading to Hepburn romaji (ねこ → neko, がっこう → gakkou)."""
+    text = to_hiragana(kana)
+    out = []
+    geminate = False
+    i = 0
+
+    while i < len(text):
+        char = text[i]
+
+        if char == 'っ':
+            # Sokuon doubles the next consonant (っち → tchi)
+            geminate = True
+            i += 1
+            continue
+
+        if char == 'ー':
+            # Long vowel mark repeats the previous vowel
+            previous = ''.join(out)
+            vowel = next((c for c in reversed(previous) if c in VOWELS), '')
+            out.append(vowel)
+            i += 1
+            continue
+
+        pair = text[i:i + 2]
+        if pair in ROMAJI_TABLE:
+            syllable = ROMAJI_TABLE[pair]
+            i += 2
+        else:
+            syllable = ROMAJI_TABLE.get(char, '')
+            i += 1
+
+        if geminate and syllable and syllable[0] not in VOWELS:
+            out.append('t' if syllable.startswith('ch') else syllable[0])
+        geminate = False
+        out.append(syllable)
+
+    return ''.join(out)
+
+
+def reading_romaji_key(reading: str) -> str:
+    """Romaji search key for a kana reading."""
+    return romaji_key(to_romaji(reading))
@@ -0,0 +1,61 @@
+"""Pinyin conversion helpers for the ingest pipeline.
+
+CC-CEDICT stores numbered pinyin ("ni3 hao3", "lu:4"). At ingest we derive
+two extra columns so frontends never convert per result row:
+
+- pinyin_marked: tone-marked display form ("nǐ hǎo", "lǜ"), same rules as
+  NumberedToTones in core/pinyin/convert.go
+- pinyin_key: toneless, spaceless search key ("nihao", "lv"); this is
+  tridict.text's pinyin_key, the one the Python lookups probe with (a port
+  of SearchKey in core/pinyin/convert.go)
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# tridict (repository root) holds the key normalization shared with lookups
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tridict.text import TONE_MARKS, pinyin_key  # noqa: E402,F401
+
+VOWELS = set('aeiouüAEIOUÜ')
+
+SYLLABLE_PATTERN = re.compile(r'([A-Za-züÜ]+)([1-5])')
+
+
+def _apply_tone(syllable: str, tone: int) -> str:
+    """Apply the tone mark to the correct vowel in a syllable.
+
+    Rules for tone placement:
+    1. If 'a' or 'e' is present, it takes the tone
+    2. If 'ou' is present, 'o' takes the tone
+    3. Otherwise, the last vowel takes the tone
+    """
+    lower = syllable.lower()
+    index = -1
+    for i, ch in enumerate(lower):
+        if ch in 'ae':
+            index = i
+            break
+        if ch == 'o' and lower[i + 1:i + 2] == 'u':
+            index = i
+            break
+
+    if index == -1:
+        for i in range(len(syllable) - 1, -1, -1):
+            if syllable[i] in VOWELS:
+                index = i
+                break
+
+    if index == -1:
+        return syllable
+
+    marked = TONE_MARKS[syllable[index]][tone - 1]
+    return syllable[:index] + marked + syllable[index + 1:]
+
+
+def numbered_to_tones(numbered: str) -> str:
+    """Convert numbered pinyin ("ni3 hao3") to tone marks ("nǐ hǎo")."""
+    text = numbered.replace('u:', 'ü').replace('U:', 'Ü')
+    return SYLLABLE_PATTERN.sub(lambda m: _apply_tone(m.group(1), int(m.group(2))), text)
+
@@ -0,0 +1,126 @@
+"""Radical tables and the component → character → word index.
+
+KANJIDIC2 tags every kanji with its Kangxi ("classical") radical number
+and often a Nelson radical number. It has no simplified-only hanzi (们,
+这, 说), so those take their radical from Unihan's kRSUnicode field when
+Unihan_IRGSources.txt is available. At ingest these become:
+
+- radicals: every spelling of the 214 Kangxi radicals (the standard form
+  plus common positional variants such as 氵 for 水) → radical number
+- kanji_components: radical number → character, WITHOUT ROWID so one
+  radical's characters are a single index range; joined through
+  char_index it yields every word containing such a character
+- japanese_word_details.components / chinese_word_details.components:
+  the radicals of the headword's characters, for display
+
+Neither source has a full component decomposition, so radicals are the
+only components and chinese_word_details.decomposition stays empty.
+Without Unihan, search by radical finds Chinese words only through
+characters they share with Japanese.
+"""
+
+# Kangxi radicals 1..214 in their standard (unified ideograph) forms
+KANGXI_RADICALS = (
+    '一丨丶丿乙亅二亠人儿入八冂冖冫几凵刀力勹匕匚匸十卜卩厂厶又口囗土士夂夊夕大女子宀寸'
+    '小尢尸屮山巛工己巾干幺广廴廾弋弓彐彡彳心戈戶手支攴文斗斤方无日曰月木欠止歹殳毋比毛'
+    '氏气水火爪父爻爿片牙牛犬玄玉瓜瓦甘生用田疋疒癶白皮皿目矛矢石示禸禾穴立竹米糸缶网羊'
+    '羽老而耒耳聿肉臣自至臼舌舛舟艮色艸虍虫血行衣襾見角言谷豆豕豸貝赤走足身車辛辰辵邑酉'
+    '釆里金長門阜隶隹雨靑非面革韋韭音頁風飛食首香馬骨高髟鬥鬯鬲鬼魚鳥鹵鹿麥麻黃黍黑黹黽'
+    '鼎鼓鼠鼻齊齒龍龜龠'
+)
+
+# Positional and simplified variants people type when searching by radical
+RADICAL_VARIANTS = {
+    '亻': 9, '刂': 18, '㔾': 26, '⺌': 42, '彑': 58, '忄': 61, '⺗': 61,
+    '扌': 64, '攵': 66, '旡': 71, '氵': 85, '氺': 85, '灬': 86, '爫': 87,
+    '牜': 93, '犭': 94, '王': 96, '礻': 113, '罒': 122, '⺲': 122, '耂': 125,
+    '⺼': 130, '艹': 140, '衤': 145, '西': 146, '覀': 146, '讠': 149,
+    '贝': 154, '⻊': 157, '车': 159, '辶': 162, '⻌': 162, '钅': 167,
+    '长': 168, '门': 169, '阝': 170, '青': 174, '韦': 178,
+    '页': 181, '风': 182, '飞': 183, '饣': 184, '飠': 184, '马': 187,
+    '鱼': 195, '鸟': 196, '卤': 197, '麦': 199, '黄': 201, '黒': 203,
+    '黾': 205, '齐': 210, '齿': 211, '龙': 212, '竜': 212, '龟': 213,
+    '亀': 213, '纟': 120, '糹': 120,
+}
+
+# Columns of each side table, for dropping rows with nothing left in them
+DETAIL_COLUMNS = {
+    'japanese_word_details': ('components', 'stroke_svg'),
+    'chinese_word_details': ('components', 'decomposition', 'stroke_svg'),
+}
+
+assert len(KANGXI_RADICALS) == 214
+
+
+def radical_char(number: int) -> str:
+    """Standard form of Kangxi radical number (1-based)."""
+    return KANGXI_RADICALS[number - 1]
+
+
+def radical_forms() -> dict:
+    """Map every radical spelling (standard and variant) to its number."""
+    forms = {char: number for number, char in enumerate(KANGXI_RADICALS, 1)}
+    for form, number in RADICAL_VARIANTS.items():
+        forms.setdefault(form, number)
+    return forms
+
+
+def _headword_components(text: str, kanji_radicals: dict):
+    """Space-separated distinct radicals of text's characters, or None."""
+    components = []
+    for char in text:
+        for number in kanji_radicals.get(char, ()):
+            radical = radical_char(number)
+            if radical not in components:
+                components.append(radical)
+    return ' '.join(components) or None
+
+
+def build_radical_index(cursor, kanjidic_data: dict, hanzi_radicals: dict = None) -> int:
+    """(Re)build radicals and kanji_components and fill the details components.
+
+    kanjidic_data is parse_kanjidic() output; characters without 'radicals'
+    are skipped. hanzi_radicals (parse_unihan() output) supplies
+    the characters KANJIDIC2 lacks. Returns the number of kanji_components
+    rows.
+    """
+    cursor.execute('DELETE FROM radicals')
+    cursor.executemany('INSERT INTO radicals (form, number) VALUES (?, ?)',
+                       sorted(radical_forms().items()))
+
+    kanji_radicals = dict(hanzi_radicals or {})
+    kanji_radicals.update((kanji, info['radicals'])
+                          for kanji, info in kanjidic_data.items() if info.get('radicals'))
+
+    cursor.execute('DELETE FROM kanji_components')
+    rows = sorted({(number, kanji) for kanji, numbers in kanji_radicals.items() for number in numbers})
+    cursor.executemany('INSERT INTO kanji_components (radical_number, kanji) VALUES (?, ?)', rows)
+
+    cursor.execute('SELECT id, headword FROM japanese_words')
+    _store_components(cursor, 'japanese_word_details', [
+        (word_id, _headword_components(headword, kanji_radicals))
+        for word_id, headword in cursor.fetchall()
+    ])
+
+    cursor.execute('SELECT id, simplified, traditional FROM chinese_words')
+    _store_components(cursor, 'chinese_word_details', [
+        (word_id, _headword_components(simplified + traditional, kanji_radicals))
+        for word_id, simplified, traditional in cursor.fetchall()
+    ])
+
+    return len(rows)
+
+
+def _store_components(cursor, table: str, components: list):
+    """Replace the components column of a details table, keeping other columns.
+
+    Rows left with no attribute at all are dropped.
+    """
+    cursor.execute(f'UPDATE {table} SET components = NULL')
+    cursor.executemany(f'''
+        INSERT INTO {table} (word_id, components) VALUES (?, ?)
+        ON CONFLICT (word_id) DO UPDATE SET components = excluded.components
+    ''', [(word_id, value) for word_id, value in components if value is not None])
+    empty = ' AND '.join(f'{column} IS NULL' for column in DETAIL_COLUMNS[table])
+    cursor.execute(f'DELETE FROM {table} WHERE {empty}')
+
@@ -0,0 +1,28 @@
+"""Word ranking score shared by the ingest pipeline and sample generator.
+
+Mirrors japaneseScore/chineseScore in core/ranker/rank.go. The score is
+stored in the rank_score column so lookups can ORDER BY rank_score DESC
+LIMIT k in SQL instead of sorting every match in memory.
+"""
+
+
+def rank_score(text: str, is_common: bool, frequency_rank) -> int:
+    """Calculate the priority score for a word (higher = better match).
+
+    text is the headword (Japanese) or simplified form (Chinese).
+    """
+    score = 0
+
+    # Common words get priority
+    if is_common:
+        score += 100
+
+    # Frequency rank (lower rank = more common = higher score)
+    if frequency_rank is not None:
+        score += max(0, 1000 - frequency_rank)
+
+    # Shorter words are often more basic
+    if text:
+        score += 100 // len(text)
+
+    return score
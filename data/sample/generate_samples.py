@@ -5,30 +5,54 @@ import sqlite3
 import sys
 from pathlib import Path
 
-# Sample data: (english, japanese_headword, japanese_reading, chinese_simplified, chinese_traditional, pinyin)
+# Share helpers with the ingest pipeline (data/)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from autocomplete import build_autocomplete  # noqa: E402
+from char_index import build_char_index  # noqa: E402
+from deinflect import build_inflections  # noqa: E402
+from fuzzy import build_fuzzy_index  # noqa: E402
+from hot_results import build_hot_results  # noqa: E402
+from kana import reading_romaji_key  # noqa: E402
+from pinyin import pinyin_key  # noqa: E402
+from radicals import build_radical_index  # noqa: E402
+from variants import build_variants  # noqa: E402
+from ranker import rank_score  # noqa: E402
+
+# Sample data: (english, japanese_headword, japanese_reading, chinese_simplified, chinese_traditional, pinyin,
+#               jlpt_level, hsk_level, stroke_count); JLPT is the N-level number (5 = N5)
 SAMPLE_WORDS = [
-    ("cat", "猫", "ねこ", "猫", "貓", "māo", "N3", "1", 11),
-    ("dog", "犬", "いぬ", "狗", "狗", "gǒu", "N3", "2", 8),
-    ("eat", "食べる", "たべる", "吃", "吃", "chī", "N4", "1", 6),
-    ("drink", "飲む", "のむ", "喝", "喝", "hē", "N4", "1", 12),
-    ("book", "本", "ほん", "书", "書", "shū", "N5", "1", 4),
-    ("water", "水", "みず", "水", "水", "shuǐ", "N5", "1", 4),
-    ("fire", "火", "ひ", "火", "火", "huǒ", "N5", "1", 4),
-    ("tree", "木", "き", "树", "樹", "shù", "N5", "1", 4),
-    ("person", "人", "ひと", "人", "人", "rén", "N5", "1", 2),
-    ("big", "大きい", "おおきい", "大", "大", "dà", "N5", "1", 3),
-    ("small", "小さい", "ちいさい", "小", "小", "xiǎo", "N5", "1", 3),
-    ("good", "良い", "よい", "好", "好", "hǎo", "N4", "1", 6),
-    ("bad", "悪い", "わるい", "坏", "壞", "huài", "N4", "2", 7),
-    ("house", "家", "いえ", "家", "家", "jiā", "N5", "1", 10),
-    ("school", "学校", "がっこう", "学校", "學校", "xuéxiào", "N5", "1", 10),
-    ("friend", "友達", "ともだち", "朋友", "朋友", "péngyǒu", "N4", "1", 8),
-    ("time", "時間", "じかん", "时间", "時間", "shíjiān", "N4", "1", 10),
-    ("year", "年", "とし", "年", "年", "nián", "N5", "1", 6),
-    ("day", "日", "ひ", "天", "天", "tiān", "N5", "1", 4),
-    ("hand", "手", "て", "手", "手", "shǒu", "N5", "1", 4),
+    ("cat", "猫", "ねこ", "猫", "貓", "māo", 3, 1, 11),
+    ("dog", "犬", "いぬ", "狗", "狗", "gǒu", 3, 2, 8),
+    ("eat", "食べる", "たべる", "吃", "吃", "chī", 4, 1, 6),
+    ("drink", "飲む", "のむ", "喝", "喝", "hē", 4, 1, 12),
+    ("book", "本", "ほん", "书", "書", "shū", 5, 1, 4),
+    ("water", "水", "みず", "水", "水", "shuǐ", 5, 1, 4),
+    ("fire", "火", "ひ", "火", "火", "huǒ", 5, 1, 4),
+    ("tree", "木", "き", "树", "樹", "shù", 5, 1, 4),
+    ("person", "人", "ひと", "人", "人", "rén", 5, 1, 2),
+    ("big", "大きい", "おおきい", "大", "大", "dà", 5, 1, 3),
+    ("small", "小さい", "ちいさい", "小", "小", "xiǎo", 5, 1, 3),
+    ("good", "良い", "よい", "好", "好", "hǎo", 4, 1, 6),
+    ("bad", "悪い", "わるい", "坏", "壞", "huài", 4, 2, 7),
+    ("house", "家", "いえ", "家", "家", "jiā", 5, 1, 10),
+    ("school", "学校", "がっこう", "学校", "學校", "xuéxiào", 5, 1, 10),
+    ("friend", "友達", "ともだち", "朋友", "朋友", "péngyǒu", 4, 1, 8),
+    ("time", "時間", "じかん", "时间", "時間", "shíjiān", 4, 1, 10),
+    ("year", "年", "とし", "年", "年", "nián", 5, 1, 6),
+    ("day", "日", "ひ", "天", "天", "tiān", 5, 1, 4),
+    ("hand", "手", "て", "手", "手", "shǒu", 5, 1, 4),
 ]
 
+# JMdict conjugation classes for the sample verbs and adjectives
+SAMPLE_CONJUGATIONS = {
+    "食べる": "v1",
+    "飲む": "v5m",
+    "大きい": "adj-i",
+    "小さい": "adj-i",
+    "良い": "adj-ix",
+    "悪い": "adj-i",
+}
+
 # Example sentences
 JAPANESE_EXAMPLES = [
     (1, "猫が好きです。", "I like cats."),
@@ -59,50 +83,76 @@ def generate_db(output_path: Path):
     # Execute schema
     cursor.executescript(schema)
 
-    # Insert sample data
+    # Insert sample data; glosses are interned like ingest.py does
+    gloss_ids = {}
     for idx, (english, ja_head, ja_read, zh_simp, zh_trad, pinyin, jlpt, hsk, strokes) in enumerate(SAMPLE_WORDS, 1):
         # Insert Japanese word
         cursor.execute("""
-            INSERT INTO japanese_words (headword, reading, is_common, frequency_rank, jlpt_level, stroke_count)
-            VALUES (?, ?, 1, ?, ?, ?)
-        """, (ja_head, ja_read, idx, jlpt, strokes))
+            INSERT INTO japanese_words (headword, reading, reading_romaji,
+                                        is_common, frequency_rank, rank_score, jlpt_level, stroke_count,
+                                        conjugation)
+            VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)
+        """, (ja_head, ja_read, reading_romaji_key(ja_read),
+              idx, rank_score(ja_head, True, idx), jlpt, strokes, SAMPLE_CONJUGATIONS.get(ja_head)))
         ja_word_id = cursor.lastrowid
 
-        # Insert Japanese definition
+        # Insert Japanese spellings (kana-only headwords are readings)
+        ja_forms = {(ja_head, 'r' if ja_head == ja_read else 'k'), (ja_read, 'r')}
+        cursor.executemany("""
+            INSERT INTO japanese_forms (form, word_id, kind, priority)
+            VALUES (?, ?, ?, ?)
+        """, [(form, ja_word_id, kind, idx) for form, kind in ja_forms])
+
+        # Insert the shared gloss and Japanese definition
+        gloss_id = gloss_ids.get(english)
+        if gloss_id is None:
+            cursor.execute("INSERT INTO glosses (text) VALUES (?)", (english,))
+            gloss_id = gloss_ids[english] = cursor.lastrowid
         cursor.execute("""
-            INSERT INTO japanese_definitions (word_id, english_gloss, pos)
+            INSERT INTO japanese_definitions (word_id, gloss_id, pos)
             VALUES (?, ?, 'noun')
-        """, (ja_word_id, english))
+        """, (ja_word_id, gloss_id))
 
-        # Insert Chinese word
+        # Insert Chinese word (sample pinyin is already tone-marked)
         cursor.execute("""
-            INSERT INTO chinese_words (simplified, traditional, pinyin, is_common, frequency_rank, hsk_level, stroke_count)
-            VALUES (?, ?, ?, 1, ?, ?, ?)
-        """, (zh_simp, zh_trad, pinyin, idx, hsk, strokes))
+            INSERT INTO chinese_words (simplified, traditional, pinyin, pinyin_marked, pinyin_key,
+                                       is_common, frequency_rank, rank_score, hsk_level, stroke_count)
+            VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?)
+        """, (zh_simp, zh_trad, pinyin, pinyin, pinyin_key(pinyin), idx, rank_score(zh_simp, True, idx), hsk, strokes))
         zh_word_id = cursor.lastrowid
 
         # Insert Chinese definition
         cursor.execute("""
-            INSERT INTO chinese_definitions (word_id, english_gloss)
+            INSERT INTO chinese_definitions (word_id, gloss_id)
             VALUES (?, ?)
-        """, (zh_word_id, english))
-
-    # Insert examples
-    for word_id, source, english in JAPANESE_EXAMPLES:
-        cursor.execute("""
-            INSERT INTO examples (language, word_id, source_text, english_text)
-            VALUES ('ja', ?, ?, ?)
-        """, (word_id, source, english))
-
-    for word_id, source, english in CHINESE_EXAMPLES:
-        cursor.execute("""
-            INSERT INTO examples (language, word_id, source_text, english_text)
-            VALUES ('zh', ?, ?, ?)
-        """, (word_id, source, english))
+        """, (zh_word_id, gloss_id))
+
+    # Insert example sentences and link them to their words
+    for lang, examples in (('ja', JAPANESE_EXAMPLES), ('zh', CHINESE_EXAMPLES)):
+        for word_id, source, english in examples:
+            cursor.execute("""
+                INSERT INTO sentences (lang, text, english)
+                VALUES (?, ?, ?)
+            """, (lang, source, english))
+            sentence_id = cursor.lastrowid
+            for table in ('example_links', 'sentence_terms'):
+                cursor.execute(f"""
+                    INSERT INTO {table} (lang, word_id, sentence_id)
+                    VALUES (?, ?, ?)
+                """, (lang, word_id, sentence_id))
+
+    build_inflections(cursor)
+    build_variants(cursor)
+    build_char_index(cursor)
+    build_radical_index(cursor, {})
+    build_autocomplete(cursor)
+    build_fuzzy_index(cursor)
 
     conn.commit()
     conn.close()
 
+    build_hot_results(output_path)
+
     print(f"✓ Generated sample database: {output_path}")
     print(f"  - {len(SAMPLE_WORDS)} word pairs")
     print(f"  - {len(JAPANESE_EXAMPLES)} Japanese examples")
@@ -5,20 +5,57 @@ CREATE TABLE IF NOT EXISTS japanese_words (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     headword TEXT NOT NULL,
     reading TEXT NOT NULL,
+    reading_romaji TEXT,  -- Hepburn romaji search key ("neko", "tokyo")
+    script_key TEXT,      -- headword folded through char_variants
+    conjugation TEXT,     -- JMdict conjugation class (v1, v5m, adj-i, ...)
     is_common BOOLEAN DEFAULT 0,
     frequency_rank INTEGER,
-    jlpt_level TEXT,
-    stroke_count INTEGER,
+    rank_score INTEGER NOT NULL DEFAULT 0,  -- see data/ranker.py
+    jlpt_level INTEGER,   -- JLPT N-level (5 = N5 ... 1 = N1)
+    stroke_count INTEGER
+);
+
+-- Large, rarely read attributes live outside the hot word tables so
+-- lookups touch fewer pages; fetched by word_id for displayed results only.
+-- A row exists only when at least one attribute is set.
+CREATE TABLE IF NOT EXISTS japanese_word_details (
+    word_id INTEGER PRIMARY KEY,
     components TEXT,
-    stroke_svg TEXT
+    stroke_svg TEXT,
+    FOREIGN KEY (word_id) REFERENCES japanese_words(id)
+);
+
+-- Every kanji (keb) and kana (reb) spelling of a word, so alternate and
+-- old forms resolve with a single probe. Katakana readings also get a
+-- hiragana-folded row. priority is the best PRIORITY_MAP rank of the
+-- form's ke_pri/re_pri tags (lower = more common, NULL = untagged).
+-- is_outdated marks old-kanji (oK) spellings.
+CREATE TABLE IF NOT EXISTS japanese_forms (
+    form TEXT NOT NULL,
+    word_id INTEGER NOT NULL,
+    kind TEXT NOT NULL CHECK(kind IN ('k', 'r')),
+    priority INTEGER,
+    is_outdated INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (form, word_id, kind),
+    FOREIGN KEY (word_id) REFERENCES japanese_words(id)
+) WITHOUT ROWID;
+
+-- Every distinct English gloss, stored once; definitions reference it by id.
+-- Writers intern glosses themselves: no lookup reads text through an index
+-- (the English match is LIKE on LOWER(text)), so a UNIQUE index would only
+-- store every gloss a second time
+CREATE TABLE IF NOT EXISTS glosses (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL
 );
 
 CREATE TABLE IF NOT EXISTS japanese_definitions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     word_id INTEGER NOT NULL,
-    english_gloss TEXT NOT NULL,
+    gloss_id INTEGER NOT NULL,
     pos TEXT,
-    FOREIGN KEY (word_id) REFERENCES japanese_words(id)
+    FOREIGN KEY (word_id) REFERENCES japanese_words(id),
+    FOREIGN KEY (gloss_id) REFERENCES glosses(id)
 );
 
 CREATE TABLE IF NOT EXISTS chinese_words (
@@ -26,41 +63,170 @@ CREATE TABLE IF NOT EXISTS chinese_words (
     simplified TEXT NOT NULL,
     traditional TEXT NOT NULL,
     pinyin TEXT NOT NULL,
+    pinyin_marked TEXT,  -- tone-marked display form ("nǐ hǎo")
+    pinyin_key TEXT,     -- toneless, spaceless search key ("nihao")
+    script_key TEXT,     -- simplified folded through char_variants
     is_common BOOLEAN DEFAULT 0,
     frequency_rank INTEGER,
-    hsk_level TEXT,
-    stroke_count INTEGER,
+    rank_score INTEGER NOT NULL DEFAULT 0,  -- see data/ranker.py
+    hsk_level INTEGER,    -- HSK level 1-6
+    stroke_count INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS chinese_word_details (
+    word_id INTEGER PRIMARY KEY,
     components TEXT,
     decomposition TEXT,
-    stroke_svg TEXT
+    stroke_svg TEXT,
+    FOREIGN KEY (word_id) REFERENCES chinese_words(id)
 );
 
 CREATE TABLE IF NOT EXISTS chinese_definitions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     word_id INTEGER NOT NULL,
-    english_gloss TEXT NOT NULL,
-    FOREIGN KEY (word_id) REFERENCES chinese_words(id)
+    gloss_id INTEGER NOT NULL,
+    FOREIGN KEY (word_id) REFERENCES chinese_words(id),
+    FOREIGN KEY (gloss_id) REFERENCES glosses(id)
 );
 
-CREATE TABLE IF NOT EXISTS examples (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    language TEXT NOT NULL CHECK(language IN ('ja', 'zh')),
+-- Example sentences and their English translation, each stored once
+-- however many words it illustrates (data/import_tatoeba.py)
+CREATE TABLE IF NOT EXISTS sentences (
+    id INTEGER PRIMARY KEY,
+    lang TEXT NOT NULL CHECK(lang IN ('ja', 'zh')),
+    text TEXT NOT NULL,
+    english TEXT            -- NULL when Tatoeba has no English translation
+);
+
+-- Word → example sentence links, keyed by word so one word's examples are
+-- a single index range joined to sentences by primary key. Higher score
+-- (see example_score in data/import_tatoeba.py) is shown first.
+CREATE TABLE IF NOT EXISTS example_links (
+    lang TEXT NOT NULL CHECK(lang IN ('ja', 'zh')),
     word_id INTEGER NOT NULL,
-    source_text TEXT NOT NULL,
-    english_text TEXT NOT NULL
+    sentence_id INTEGER NOT NULL,
+    score INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (lang, word_id, sentence_id),
+    FOREIGN KEY (sentence_id) REFERENCES sentences(id)
+) WITHOUT ROWID;
+
+-- Word → every Tatoeba sentence containing it, for any word, not just the
+-- common ones with example_links. Keyset-paged by sentence_id
+-- (GetExamplesPage in core/database/queries.go).
+CREATE TABLE IF NOT EXISTS sentence_terms (
+    lang TEXT NOT NULL CHECK(lang IN ('ja', 'zh')),
+    word_id INTEGER NOT NULL,
+    sentence_id INTEGER NOT NULL,
+    PRIMARY KEY (lang, word_id, sentence_id),
+    FOREIGN KEY (sentence_id) REFERENCES sentences(id)
+) WITHOUT ROWID;
+
+-- Inverted index from each kanji/hanzi in a headword to its words, built
+-- by data/char_index.py. "Contains X" is an index range on (char, lang).
+CREATE TABLE IF NOT EXISTS char_index (
+    char TEXT NOT NULL,
+    lang TEXT NOT NULL CHECK(lang IN ('ja', 'zh')),
+    word_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (char, lang, word_id, position)
+) WITHOUT ROWID;
+
+-- Conjugated surfaces of verbs/adjectives (食べました → 食べる), built by
+-- data/deinflect.py from japanese_words.conjugation
+CREATE TABLE IF NOT EXISTS japanese_inflections (
+    surface TEXT NOT NULL,
+    word_id INTEGER NOT NULL,
+    rule TEXT NOT NULL,
+    PRIMARY KEY (surface, word_id),
+    FOREIGN KEY (word_id) REFERENCES japanese_words(id)
+) WITHOUT ROWID;
+
+-- Normalized English gloss terms and their trigram postings for
+-- typo-tolerant search, built by data/fuzzy.py
+CREATE TABLE IF NOT EXISTS fuzzy_terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    trigram_count INTEGER NOT NULL,
+    rank_score INTEGER NOT NULL       -- Best rank_score of a word glossed with term
 );
 
+-- length (of the term) sits in the key so a query's length window is
+-- part of each trigram's index range
+CREATE TABLE IF NOT EXISTS fuzzy_trigrams (
+    trigram TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    term_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, length, term_id),
+    FOREIGN KEY (term_id) REFERENCES fuzzy_terms(id)
+) WITHOUT ROWID;
+
+-- Shinjitai / traditional / simplified character variants, built by
+-- data/variants.py. Only non-canonical members of a class are stored;
+-- script_key columns hold headwords folded through this table.
+CREATE TABLE IF NOT EXISTS char_variants (
+    char TEXT PRIMARY KEY,
+    canonical TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- Every spelling of the 214 Kangxi radicals (standard form and variants
+-- such as 氵) → radical number, built by data/radicals.py
+CREATE TABLE IF NOT EXISTS radicals (
+    form TEXT PRIMARY KEY,
+    number INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- Radical → character inverted index from KANJIDIC2 classical/Nelson
+-- radicals. Joined through char_index it gives radical → words.
+CREATE TABLE IF NOT EXISTS kanji_components (
+    radical_number INTEGER NOT NULL,
+    kanji TEXT NOT NULL,
+    PRIMARY KEY (radical_number, kanji)
+) WITHOUT ROWID;
+
+-- Typeahead index built by data/autocomplete.py. Keys are lowercased and
+-- katakana-folded; a prefix is one range scan on the primary key.
+CREATE TABLE IF NOT EXISTS autocomplete_keys (
+    key TEXT NOT NULL,
+    lang TEXT NOT NULL CHECK(lang IN ('ja', 'zh', 'en')),
+    display TEXT NOT NULL,
+    detail TEXT,
+    rank_score INTEGER NOT NULL,
+    PRIMARY KEY (key, lang, display)
+) WITHOUT ROWID;
+
+-- Precomputed top completions for short prefixes, which match too many
+-- keys to rank per keystroke. slot 0 is the best completion.
+CREATE TABLE IF NOT EXISTS autocomplete_top (
+    prefix TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    lang TEXT NOT NULL,
+    display TEXT NOT NULL,
+    detail TEXT,
+    rank_score INTEGER NOT NULL,
+    PRIMARY KEY (prefix, slot)
+) WITHOUT ROWID;
+
+-- Complete JSON responses of the likeliest queries at the default result
+-- count, keyed by the normalized query (see data/hot_results.py). A hit
+-- answers a lookup with one primary-key read.
+CREATE TABLE IF NOT EXISTS hot_results (
+    query_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL
+) WITHOUT ROWID;
+
 -- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_japanese_headword ON japanese_words(headword);
-CREATE INDEX IF NOT EXISTS idx_japanese_reading ON japanese_words(reading);
+-- Lookup indexes carry rank_score so "WHERE x = ? ORDER BY rank_score DESC LIMIT k"
+-- reads the top-k rows straight off the index without a sort step
+CREATE INDEX IF NOT EXISTS idx_japanese_reading_romaji_rank ON japanese_words(reading_romaji, rank_score DESC);
+CREATE INDEX IF NOT EXISTS idx_japanese_script_key_rank ON japanese_words(script_key, rank_score DESC);
+CREATE INDEX IF NOT EXISTS idx_japanese_forms_word ON japanese_forms(word_id);
 CREATE INDEX IF NOT EXISTS idx_japanese_common_freq ON japanese_words(is_common, frequency_rank);
 CREATE INDEX IF NOT EXISTS idx_japanese_def_word ON japanese_definitions(word_id);
-CREATE INDEX IF NOT EXISTS idx_japanese_def_gloss ON japanese_definitions(english_gloss);
+CREATE INDEX IF NOT EXISTS idx_japanese_def_gloss ON japanese_definitions(gloss_id);
 
-CREATE INDEX IF NOT EXISTS idx_chinese_simplified ON chinese_words(simplified);
-CREATE INDEX IF NOT EXISTS idx_chinese_traditional ON chinese_words(traditional);
+CREATE INDEX IF NOT EXISTS idx_chinese_pinyin_key_rank ON chinese_words(pinyin_key, rank_score DESC);
+CREATE INDEX IF NOT EXISTS idx_chinese_script_key_rank ON chinese_words(script_key, rank_score DESC);
 CREATE INDEX IF NOT EXISTS idx_chinese_common_freq ON chinese_words(is_common, frequency_rank);
 CREATE INDEX IF NOT EXISTS idx_chinese_def_word ON chinese_definitions(word_id);
-CREATE INDEX IF NOT EXISTS idx_chinese_def_gloss ON chinese_definitions(english_gloss);
+CREATE INDEX IF NOT EXISTS idx_chinese_def_gloss ON chinese_definitions(gloss_id);
 
-CREATE INDEX IF NOT EXISTS idx_examples_lang_word ON examples(language, word_id);
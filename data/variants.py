@@ -0,0 +1,133 @@
+"""Cross-script character variants and the script-folded search key.
+
+Japanese shinjitai (学, 図), traditional hanzi (學, 圖) and simplified hanzi
+(学, 图) are spellings of the same characters. Ingest aligns them
+character by character from two sources:
+
+- CC-CEDICT: every entry's simplified and traditional spellings
+- JMdict: old-kanji (oK) forms against the closest current kanji form of
+  the same entry
+
+A character aligned with more than one partner within a source is
+ambiguous and left out: simplified 干 stands for traditional 乾 and 幹,
+and 发 for 發 and 髮, so folding them would merge unrelated words. The
+remaining one-to-one pairs are merged with union-find into variant
+classes, and each class folds to one canonical character (its lowest
+code point).
+char_variants stores the non-canonical members, and both word tables
+get a script_key column (headword / simplified, folded), indexed with
+rank_score. A query folded the same way then finds a word in any script
+with one probe. Must stay in sync with ScriptKey in
+core/database/variants.go.
+"""
+
+from collections import defaultdict
+
+from char_index import is_cjk
+
+
+class _UnionFind:
+    """Minimal union-find over characters."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, char: str) -> str:
+        parent = self.parent.setdefault(char, char)
+        if parent != char:
+            parent = self.parent[char] = self.find(parent)
+        return parent
+
+    def union(self, a: str, b: str):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def _aligned_chars(spellings) -> set:
+    """(left, right) pairs of differing CJK characters of equal-length spellings."""
+    pairs = set()
+    for left, right in spellings:
+        if len(left) != len(right):
+            continue
+        for a, b in zip(left, right):
+            if a != b and is_cjk(a) and is_cjk(b):
+                pairs.add((a, b))
+    return pairs
+
+
+def _one_to_one(pairs: set) -> set:
+    """The pairs whose characters align with no other partner on their side."""
+    lefts, rights = defaultdict(set), defaultdict(set)
+    for a, b in pairs:
+        lefts[a].add(b)
+        rights[b].add(a)
+    return {(a, b) for a, b in pairs if len(lefts[a]) == 1 and len(rights[b]) == 1}
+
+
+def _chinese_spellings(cursor):
+    """Yield (simplified, traditional) spellings that differ."""
+    cursor.execute('SELECT simplified, traditional FROM chinese_words WHERE simplified != traditional')
+    yield from cursor.fetchall()
+
+
+def _japanese_spellings(cursor):
+    """Yield (current, old) kanji spellings of the same JMdict entry."""
+    cursor.execute('''
+        SELECT word_id, form, is_outdated FROM japanese_forms
+        WHERE kind = 'k'
+        ORDER BY word_id
+    ''')
+    current, outdated, last_word = [], [], None
+    for word_id, form, is_outdated in cursor.fetchall() + [(None, None, 0)]:
+        if word_id != last_word:
+            # Pair each old form with the current form it differs from least,
+            # so alternate spellings (呑む/飲む) are never merged
+            for old in outdated:
+                candidates = [c for c in current if len(c) == len(old)]
+                if candidates:
+                    closest = min(candidates, key=lambda c: sum(a != b for a, b in zip(c, old)))
+                    yield closest, old
+            current, outdated, last_word = [], [], word_id
+        if form is not None:
+            (outdated if is_outdated else current).append(form)
+
+
+def fold(text: str, variants: dict) -> str:
+    """Fold every character of text to its canonical variant."""
+    return ''.join(variants.get(char, char) for char in text)
+
+
+def load_variants(cursor) -> dict:
+    """Load char_variants as {char: canonical}."""
+    cursor.execute('SELECT char, canonical FROM char_variants')
+    return dict(cursor.fetchall())
+
+
+def build_variants(cursor) -> int:
+    """(Re)build char_variants and the script_key columns.
+
+    Returns the number of variant characters stored.
+    """
+    sets = _UnionFind()
+    for spellings in (_chinese_spellings(cursor), _japanese_spellings(cursor)):
+        for a, b in _one_to_one(_aligned_chars(spellings)):
+            sets.union(a, b)
+
+    variants = {char: sets.find(char) for char in sets.parent if sets.find(char) != char}
+
+    cursor.execute('DELETE FROM char_variants')
+    cursor.executemany('INSERT INTO char_variants (char, canonical) VALUES (?, ?)',
+                       sorted(variants.items()))
+
+    cursor.execute('SELECT id, headword FROM japanese_words')
+    cursor.executemany('UPDATE japanese_words SET script_key = ? WHERE id = ?', [
+        (fold(headword, variants), word_id) for word_id, headword in cursor.fetchall()
+    ])
+
+    cursor.execute('SELECT id, simplified FROM chinese_words')
+    cursor.executemany('UPDATE chinese_words SET script_key = ? WHERE id = ?', [
+        (fold(simplified, variants), word_id) for word_id, simplified in cursor.fetchall()
+    ])
+
+    return len(variants)
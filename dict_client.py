@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Batch driver for the dict CLI.
+
+Forking `dict --json word` per word spends most of its time starting the
+process and opening the database. DictPool instead keeps a few
+`dict --jsonl` processes open, each answering one word per stdin line
+with one JSON line, and fans words out to them from a thread pool:
+
+    with DictPool(DICT_CLI) as pool:
+        responses = pool.query_words(words)
+"""
+
+import json
+import os
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+DICT_CLI = Path(__file__).parent / "cmd/dict/dict"
+
+# Seconds to wait for one answer before the process is restarted
+QUERY_TIMEOUT = 5
+
+
+class DictProcess:
+    """One long-lived `dict --jsonl` process, used by one thread at a time."""
+
+    def __init__(self, cli=DICT_CLI, args=(), timeout=QUERY_TIMEOUT):
+        self.command = [str(cli), "--jsonl", *args]
+        self.timeout = timeout
+        self.process = None
+        self.lines = None
+
+    def _start(self):
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        # readline() can't time out, so a thread reads and query() waits
+        # on the queue; None marks the end of output
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read, args=(self.process.stdout, self.lines), daemon=True).start()
+
+    @staticmethod
+    def _read(stdout, lines):
+        for line in stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def query(self, word):
+        """Parsed JSON response for word, or None if the lookup failed."""
+        if "\n" in word:
+            return None
+        try:
+            if self.process is None or self.process.poll() is not None:
+                self._start()
+            self.process.stdin.write(word + "\n")
+            self.process.stdin.flush()
+            line = self.lines.get(timeout=self.timeout)
+        except (OSError, queue.Empty):
+            line = None
+        try:
+            response = json.loads(line) if line else None
+        except ValueError:
+            response = None
+        if response is None:
+            # The process died, hung or wrote something other than a
+            # result; the next query starts a fresh one
+            self.close()
+            return None
+        if isinstance(response, dict) and "error" in response:
+            return None
+        return response
+
+    def close(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=self.timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+        self.lines = None
+
+
+class DictPool:
+    """A pool of DictProcess workers shared by a thread pool."""
+
+    def __init__(self, cli=DICT_CLI, size=None, args=()):
+        self.size = size or min(8, os.cpu_count() or 1)
+        self.idle = queue.Queue()
+        self.processes = [DictProcess(cli, args) for _ in range(self.size)]
+        for process in self.processes:
+            self.idle.put(process)
+
+    def query(self, word):
+        """Look up one word on whichever process is free."""
+        process = self.idle.get()
+        try:
+            return process.query(word)
+        finally:
+            self.idle.put(process)
+
+    def query_words(self, words):
+        """Look up words concurrently; responses come back in input order."""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(self.query, words))
+
+    def close(self):
+        for process in self.processes:
+            process.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
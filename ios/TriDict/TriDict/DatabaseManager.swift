@@ -105,9 +105,15 @@ struct Example: Codable {
 
 // MARK: - Database Manager
 
+// Tells SQLite to copy bound text, for values computed just before binding
+private let SQLITE_TRANSIENT = unsafeBitCast(-1, to: sqlite3_destructor_type.self)
+
 class DatabaseManager: ObservableObject {
     private var db: OpaquePointer?
 
+    // char_variants (character → canonical variant), loaded on first use
+    private lazy var variants: [Character: Character] = loadVariants()
+
     init() {
         openDatabase()
     }
@@ -136,6 +142,10 @@ class DatabaseManager: ObservableObject {
     }
 
     func search(query: String) -> DictionaryResponse? {
+        if let hot = hotResult(query) {
+            return hot
+        }
+
         let language = detectLanguage(query)
 
         var outputs: [LanguageOutput] = []
@@ -210,8 +220,8 @@ class DatabaseManager: ObservableObject {
     private func searchFromJapanese(_ query: String) -> [LanguageOutput] {
         var outputs: [LanguageOutput] = []
 
-        // Direct Japanese lookup
-        if let jaOutput = queryJapanese(query) {
+        // Direct Japanese lookup, then conjugated input (食べました → 食べる)
+        if let jaOutput = queryJapanese(query) ?? queryJapaneseByInflection(query) {
             outputs.append(jaOutput)
 
             // Pivot to Chinese via English
@@ -250,15 +260,99 @@ class DatabaseManager: ObservableObject {
 
     // MARK: - Query Helpers
 
+    private func loadVariants() -> [Character: Character] {
+        guard let db = db else { return [:] }
+
+        var statement: OpaquePointer?
+        defer {
+            if statement != nil {
+                sqlite3_finalize(statement)
+            }
+        }
+
+        guard sqlite3_prepare_v2(db, "SELECT char, canonical FROM char_variants", -1, &statement, nil) == SQLITE_OK else {
+            print("Error preparing variants query")
+            return [:]
+        }
+
+        var variants: [Character: Character] = [:]
+        while sqlite3_step(statement) == SQLITE_ROW {
+            if let char = sqlite3_column_text(statement, 0).flatMap({ String(cString: $0).first }),
+               let canonical = sqlite3_column_text(statement, 1).flatMap({ String(cString: $0).first }) {
+                variants[char] = canonical
+            }
+        }
+        return variants
+    }
+
+    /// Response precomputed at build time for a common query (see
+    /// data/hot_results.py), keyed like hot_key there: trimmed, and lowercased
+    /// if ASCII. Stored responses hold the CLI's top 5 per language, ordered
+    /// like the LIMIT 1 queries below (exact spelling first, then rank_score,
+    /// then id), so the first of each is what a cold lookup returns; only it
+    /// is kept. Databases without hot_results fail to prepare the query and
+    /// report a miss.
+    private func hotResult(_ query: String) -> DictionaryResponse? {
+        guard let db = db else { return nil }
+
+        var statement: OpaquePointer?
+        defer {
+            if statement != nil {
+                sqlite3_finalize(statement)
+            }
+        }
+
+        guard sqlite3_prepare_v2(db, "SELECT payload FROM hot_results WHERE query_key = ?", -1, &statement, nil) == SQLITE_OK else {
+            return nil
+        }
+
+        var key = query.trimmingCharacters(in: .whitespacesAndNewlines)
+        if key.allSatisfy({ $0.isASCII }) {
+            key = key.lowercased()
+        }
+        sqlite3_bind_text(statement, 1, key, -1, SQLITE_TRANSIENT)
+
+        guard sqlite3_step(statement) == SQLITE_ROW,
+              let payload = sqlite3_column_text(statement, 0).map({ String(cString: $0) }),
+              let stored = try? JSONDecoder().decode(DictionaryResponse.self, from: Data(payload.utf8)) else {
+            return nil
+        }
+
+        var languages = Set<String>()
+        return DictionaryResponse(
+            meta: MetaInfo(inputLanguage: stored.meta.inputLanguage, query: query),
+            outputs: stored.outputs.filter { languages.insert($0.language).inserted }
+        )
+    }
+
+    /// Fold shinjitai / traditional / simplified characters to the canonical
+    /// variant used by the script_key columns (see data/variants.py)
+    private func scriptKey(_ text: String) -> String {
+        return String(text.map { variants[$0] ?? $0 })
+    }
+
+    /// Fold katakana to hiragana (ネコ → ねこ), like ToHiragana in core/kana
+    private func toHiragana(_ text: String) -> String {
+        let scalars = text.unicodeScalars.map { scalar -> Unicode.Scalar in
+            guard (0x30A1...0x30F6).contains(scalar.value) else { return scalar }
+            return Unicode.Scalar(scalar.value - 0x60) ?? scalar
+        }
+        return String(String.UnicodeScalarView(scalars))
+    }
+
     private func queryJapanese(_ input: String) -> LanguageOutput? {
         guard let db = db else { return nil }
 
         let query = """
             SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
-                   stroke_count, components, stroke_svg
+                   stroke_count
             FROM japanese_words
-            WHERE headword = ? OR reading = ?
-            ORDER BY is_common DESC, frequency_rank ASC
+            WHERE id IN (
+                SELECT word_id FROM japanese_forms WHERE form IN (?, ?)
+                UNION
+                SELECT id FROM japanese_words WHERE script_key = ?
+            )
+            ORDER BY headword = ? DESC, rank_score DESC, id
             LIMIT 1
             """
 
@@ -275,7 +369,43 @@ class DatabaseManager: ObservableObject {
         }
 
         sqlite3_bind_text(statement, 1, input, -1, nil)
-        sqlite3_bind_text(statement, 2, input, -1, nil)
+        sqlite3_bind_text(statement, 2, toHiragana(input), -1, SQLITE_TRANSIENT)
+        sqlite3_bind_text(statement, 3, scriptKey(input), -1, SQLITE_TRANSIENT)
+        sqlite3_bind_text(statement, 4, input, -1, nil)
+
+        guard sqlite3_step(statement) == SQLITE_ROW else {
+            return nil
+        }
+
+        return buildJapaneseOutput(from: statement!)
+    }
+
+    private func queryJapaneseByInflection(_ surface: String) -> LanguageOutput? {
+        guard let db = db else { return nil }
+
+        let query = """
+            SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
+                   stroke_count
+            FROM japanese_words
+            WHERE id IN (SELECT word_id FROM japanese_inflections WHERE surface IN (?, ?))
+            ORDER BY rank_score DESC, id
+            LIMIT 1
+            """
+
+        var statement: OpaquePointer?
+        defer {
+            if statement != nil {
+                sqlite3_finalize(statement)
+            }
+        }
+
+        guard sqlite3_prepare_v2(db, query, -1, &statement, nil) == SQLITE_OK else {
+            print("Error preparing Japanese inflection query")
+            return nil
+        }
+
+        sqlite3_bind_text(statement, 1, surface, -1, nil)
+        sqlite3_bind_text(statement, 2, toHiragana(surface), -1, SQLITE_TRANSIENT)
 
         guard sqlite3_step(statement) == SQLITE_ROW else {
             return nil
@@ -291,22 +421,24 @@ class DatabaseManager: ObservableObject {
         // Phase 1: Return only primary/exact matches
         let query = """
             SELECT DISTINCT w.id, w.headword, w.reading, w.is_common, w.frequency_rank,
-                   w.jlpt_level, w.stroke_count, w.components, w.stroke_svg
+                   w.jlpt_level, w.stroke_count
             FROM japanese_words w
             JOIN japanese_definitions d ON w.id = d.word_id
-            WHERE LOWER(d.english_gloss) = LOWER(?)
-               OR LOWER(d.english_gloss) LIKE LOWER(?) || ' (%'
-               OR LOWER(d.english_gloss) LIKE LOWER(?) || ';%'
-               OR LOWER(d.english_gloss) LIKE '%;' || LOWER(?)
-               OR LOWER(d.english_gloss) LIKE '%; ' || LOWER(?) || ';%'
+            JOIN glosses g ON g.id = d.gloss_id
+            WHERE LOWER(g.text) = LOWER(?)
+               OR LOWER(g.text) LIKE LOWER(?) || ' (%'
+               OR LOWER(g.text) LIKE LOWER(?) || ';%'
+               OR LOWER(g.text) LIKE '%;' || LOWER(?)
+               OR LOWER(g.text) LIKE '%; ' || LOWER(?) || ';%'
             ORDER BY
+               w.rank_score DESC,
                CASE
-                 WHEN LOWER(d.english_gloss) = LOWER(?) THEN 0
-                 WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ' (%' THEN 1
-                 WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ';%' THEN 2
+                 WHEN LOWER(g.text) = LOWER(?) THEN 0
+                 WHEN LOWER(g.text) LIKE LOWER(?) || ' (%' THEN 1
+                 WHEN LOWER(g.text) LIKE LOWER(?) || ';%' THEN 2
                  ELSE 3
                END,
-               w.is_common DESC, w.frequency_rank ASC
+               w.id
             LIMIT 1
             """
 
@@ -338,11 +470,11 @@ class DatabaseManager: ObservableObject {
         guard let db = db else { return nil }
 
         let query = """
-            SELECT id, simplified, traditional, pinyin, is_common, frequency_rank,
-                   hsk_level, stroke_count, components, decomposition, stroke_svg
+            SELECT id, simplified, traditional, COALESCE(pinyin_marked, pinyin), is_common, frequency_rank,
+                   hsk_level, stroke_count
             FROM chinese_words
-            WHERE simplified = ?
-            ORDER BY is_common DESC, frequency_rank ASC
+            WHERE script_key = ?
+            ORDER BY (simplified = ? OR traditional = ?) DESC, rank_score DESC, id
             LIMIT 1
             """
 
@@ -358,7 +490,9 @@ class DatabaseManager: ObservableObject {
             return nil
         }
 
-        sqlite3_bind_text(statement, 1, input, -1, nil)
+        sqlite3_bind_text(statement, 1, scriptKey(input), -1, SQLITE_TRANSIENT)
+        sqlite3_bind_text(statement, 2, input, -1, nil)
+        sqlite3_bind_text(statement, 3, input, -1, nil)
 
         guard sqlite3_step(statement) == SQLITE_ROW else {
             return nil
@@ -373,24 +507,25 @@ class DatabaseManager: ObservableObject {
         // Strict word boundary matching - only exact matches or definitions starting with the word
         // Phase 1: Return only primary/exact matches
         let query = """
-            SELECT DISTINCT w.id, w.simplified, w.traditional, w.pinyin, w.is_common,
-                   w.frequency_rank, w.hsk_level, w.stroke_count, w.components,
-                   w.decomposition, w.stroke_svg
+            SELECT DISTINCT w.id, w.simplified, w.traditional, COALESCE(w.pinyin_marked, w.pinyin), w.is_common,
+                   w.frequency_rank, w.hsk_level, w.stroke_count
             FROM chinese_words w
             JOIN chinese_definitions d ON w.id = d.word_id
-            WHERE LOWER(d.english_gloss) = LOWER(?)
-               OR LOWER(d.english_gloss) LIKE LOWER(?) || ' (%'
-               OR LOWER(d.english_gloss) LIKE LOWER(?) || ';%'
-               OR LOWER(d.english_gloss) LIKE '%;' || LOWER(?)
-               OR LOWER(d.english_gloss) LIKE '%; ' || LOWER(?) || ';%'
+            JOIN glosses g ON g.id = d.gloss_id
+            WHERE LOWER(g.text) = LOWER(?)
+               OR LOWER(g.text) LIKE LOWER(?) || ' (%'
+               OR LOWER(g.text) LIKE LOWER(?) || ';%'
+               OR LOWER(g.text) LIKE '%;' || LOWER(?)
+               OR LOWER(g.text) LIKE '%; ' || LOWER(?) || ';%'
             ORDER BY
+               w.rank_score DESC,
                CASE
-                 WHEN LOWER(d.english_gloss) = LOWER(?) THEN 0
-                 WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ' (%' THEN 1
-                 WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ';%' THEN 2
+                 WHEN LOWER(g.text) = LOWER(?) THEN 0
+                 WHEN LOWER(g.text) LIKE LOWER(?) || ' (%' THEN 1
+                 WHEN LOWER(g.text) LIKE LOWER(?) || ';%' THEN 2
                  ELSE 3
                END,
-               w.is_common DESC, w.frequency_rank ASC
+               w.id
             LIMIT 1
             """
 
@@ -433,7 +568,7 @@ class DatabaseManager: ObservableObject {
 
         var jlptLevel: String? = nil
         if sqlite3_column_type(statement, 5) != SQLITE_NULL {
-            jlptLevel = String(cString: sqlite3_column_text(statement, 5))
+            jlptLevel = "N\(sqlite3_column_int(statement, 5))"
         }
 
         var strokeCount: Int? = nil
@@ -445,8 +580,13 @@ class DatabaseManager: ObservableObject {
         let definitions = getJapaneseDefinitions(wordId: id)
         let definition = definitions.joined(separator: "; ")
 
-        // Get examples
+        // Get examples and side-table details
         let examples = getExamples(language: "ja", wordId: id)
+        let details = getWordDetails(
+            table: "japanese_word_details",
+            columns: ["components", "stroke_svg"],
+            wordId: id
+        )
 
         // Calculate rank (simplified - just use frequency rank or 100 if common)
         let rank = frequencyRank ?? (isCommon ? 100 : 1000)
@@ -461,8 +601,8 @@ class DatabaseManager: ObservableObject {
             meta: KanjiMeta(
                 jlptLevel: jlptLevel,
                 strokeCount: strokeCount,
-                components: nil,
-                strokeSVG: nil
+                components: details["components"],
+                strokeSVG: details["stroke_svg"]
             ),
             examples: examples
         )
@@ -482,7 +622,7 @@ class DatabaseManager: ObservableObject {
 
         var hskLevel: String? = nil
         if sqlite3_column_type(statement, 6) != SQLITE_NULL {
-            hskLevel = String(cString: sqlite3_column_text(statement, 6))
+            hskLevel = String(sqlite3_column_int(statement, 6))
         }
 
         var strokeCount: Int? = nil
@@ -494,8 +634,13 @@ class DatabaseManager: ObservableObject {
         let definitions = getChineseDefinitions(wordId: id)
         let definition = definitions.joined(separator: "; ")
 
-        // Get examples
+        // Get examples and side-table details
         let examples = getExamples(language: "zh", wordId: id)
+        let details = getWordDetails(
+            table: "chinese_word_details",
+            columns: ["components", "decomposition", "stroke_svg"],
+            wordId: id
+        )
 
         // Calculate rank
         let rank = frequencyRank ?? (isCommon ? 100 : 1000)
@@ -511,18 +656,56 @@ class DatabaseManager: ObservableObject {
                 traditional: traditional != simplified ? traditional : nil,
                 hskLevel: hskLevel,
                 strokeCount: strokeCount,
-                components: nil,
-                decomposition: nil,
-                strokeSVG: nil
+                components: details["components"],
+                decomposition: details["decomposition"],
+                strokeSVG: details["stroke_svg"]
             ),
             examples: examples
         )
     }
 
+    // Components, decomposition and stroke SVG live in side tables so the
+    // word tables stay narrow; read them only for words being displayed
+    // (a column is missing from the result when the word has no row or it is NULL)
+    private func getWordDetails(table: String, columns: [String], wordId: Int) -> [String: String] {
+        guard let db = db else { return [:] }
+
+        let query = "SELECT \(columns.joined(separator: ", ")) FROM \(table) WHERE word_id = ?"
+
+        var statement: OpaquePointer?
+        defer {
+            if statement != nil {
+                sqlite3_finalize(statement)
+            }
+        }
+
+        guard sqlite3_prepare_v2(db, query, -1, &statement, nil) == SQLITE_OK else {
+            return [:]
+        }
+
+        sqlite3_bind_int(statement, 1, Int32(wordId))
+
+        var details: [String: String] = [:]
+        if sqlite3_step(statement) == SQLITE_ROW {
+            for (index, column) in columns.enumerated() {
+                if let value = sqlite3_column_text(statement, Int32(index)) {
+                    details[column] = String(cString: value)
+                }
+            }
+        }
+
+        return details
+    }
+
     private func getJapaneseDefinitions(wordId: Int) -> [String] {
         guard let db = db else { return [] }
 
-        let query = "SELECT english_gloss FROM japanese_definitions WHERE word_id = ?"
+        let query = """
+            SELECT g.text FROM japanese_definitions d
+            JOIN glosses g ON g.id = d.gloss_id
+            WHERE d.word_id = ?
+            ORDER BY d.id
+            """
 
         var statement: OpaquePointer?
         defer {
@@ -549,7 +732,12 @@ class DatabaseManager: ObservableObject {
     private func getChineseDefinitions(wordId: Int) -> [String] {
         guard let db = db else { return [] }
 
-        let query = "SELECT english_gloss FROM chinese_definitions WHERE word_id = ?"
+        let query = """
+            SELECT g.text FROM chinese_definitions d
+            JOIN glosses g ON g.id = d.gloss_id
+            WHERE d.word_id = ?
+            ORDER BY d.id
+            """
 
         var statement: OpaquePointer?
         defer {
@@ -577,9 +765,11 @@ class DatabaseManager: ObservableObject {
         guard let db = db else { return nil }
 
         let query = """
-            SELECT source_text, english_text
-            FROM examples
-            WHERE language = ? AND word_id = ?
+            SELECT s.text, COALESCE(s.english, '')
+            FROM example_links l
+            JOIN sentences s ON s.id = l.sentence_id
+            WHERE l.lang = ? AND l.word_id = ?
+            ORDER BY l.score DESC
             LIMIT 5
             """
 
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Concurrent load generator with a Zipf-distributed query mix.
+
+Real traffic is dominated by a few thousand common words. The vocabulary
+here is each language's words in popularity order:
+
+- Japanese headwords and Chinese simplified forms, by is_common, then
+  frequency_rank, then rank_score
+- English gloss terms (fuzzy_terms), by rank_score
+
+The three lists are interleaved, and the word at popularity rank r is
+drawn with weight 1 / r^s.
+
+N client threads send those queries at a combined target rate (open
+loop). Latency is measured from when each request was scheduled, not
+when it was sent. A backend that falls behind therefore shows up as tail
+latency, instead of silently lowering the offered load. Every --interval
+seconds, and once at the end, the tool prints throughput, p50/p95/p99
+and the error rate.
+
+Backends:
+- cli:  a DictPool of `dict --jsonl` processes (see dict_client.py)
+- http: GET on a URL template with {} replaced by the quoted word
+
+The popular words are mostly hot_results keys, which the CLI answers
+with one stored read (see data/hot_results.py). The total therefore
+splits into a hot and a live line for the cli backend; --no-hot makes
+the CLI look every word up live.
+
+Usage:
+    python3 load_test.py --clients 16 --qps 500 --duration 30
+    python3 load_test.py --no-hot --qps 0
+    python3 load_test.py --backend http --url 'http://localhost:8080/lookup?q={}'
+"""
+
+import argparse
+import itertools
+import random
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from benchmark import percentile
+from dict_client import DICT_CLI, DictPool
+
+DATABASE = Path(__file__).parent / "data/dictionary.db"
+
+
+def load_vocabulary(db_path, size):
+    """Up to size query words, most popular first, languages interleaved."""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    cursor = conn.cursor()
+    lists = []
+    for table, column in (('japanese_words', 'headword'), ('chinese_words', 'simplified')):
+        cursor.execute(f'''
+            SELECT {column} FROM {table}
+            ORDER BY is_common DESC, frequency_rank IS NULL, frequency_rank, rank_score DESC
+            LIMIT ?
+        ''', (size,))
+        lists.append([row[0] for row in cursor.fetchall()])
+    cursor.execute('SELECT term FROM fuzzy_terms ORDER BY rank_score DESC LIMIT ?', (size,))
+    lists.append([row[0] for row in cursor.fetchall()])
+    conn.close()
+
+    vocabulary = []
+    seen = set()
+    for word in itertools.chain.from_iterable(itertools.zip_longest(*lists)):
+        if word and word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary[:size]
+
+
+def hot_words(db_path, words):
+    """The words answered from hot_results, keyed like hot_key in
+    data/hot_results.py (none before hot_results existed)."""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        keys = {row[0] for row in conn.execute('SELECT query_key FROM hot_results')}
+    except sqlite3.OperationalError:
+        keys = set()
+    conn.close()
+    return {word for word in words if (word.strip().lower() if word.isascii() else word.strip()) in keys}
+
+
+def zipf_weights(count, exponent):
+    """Cumulative weights of ranks 1..count under Zipf's law."""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def http_backend(url, timeout):
+    def query(word):
+        try:
+            with urllib.request.urlopen(url.format(urllib.parse.quote(word)), timeout=timeout) as response:
+                response.read()
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+    return query
+
+
+class Recorder:
+    """Thread-safe (latency ms, ok, hot) samples, drained per interval."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = []
+        self.all = []
+
+    def add(self, latency, ok, hot):
+        with self.lock:
+            self.pending.append((latency, ok, hot))
+
+    def drain(self):
+        with self.lock:
+            samples, self.pending = self.pending, []
+        self.all.extend(samples)
+        return samples
+
+
+def report(label, samples, seconds):
+    if not samples:
+        print(f"  {label:>8}  no completed requests")
+        return
+    latencies = [latency for latency, _, _ in samples]
+    errors = sum(not ok for _, ok, _ in samples)
+    print(f"  {label:>8}  {len(samples) / seconds:>8.1f} qps  "
+          f"p50 {percentile(latencies, 50):>8.2f}  p95 {percentile(latencies, 95):>8.2f}  "
+          f"p99 {percentile(latencies, 99):>8.2f} ms  errors {errors * 100 / len(samples):.2f}%")
+
+
+def client(query, words, weights, hot, rng_seed, start, period, offset, deadline, recorder):
+    """Send requests at start + offset + k * period until deadline.
+
+    period 0 sends back to back (closed loop). Words in hot are recorded as
+    hot samples.
+    """
+    rng = random.Random(rng_seed)
+    for k in itertools.count():
+        scheduled = start + offset + k * period if period else time.perf_counter()
+        if scheduled >= deadline:
+            return
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        word = rng.choices(words, cum_weights=weights)[0]
+        ok = query(word)
+        recorder.add((time.perf_counter() - scheduled) * 1000, ok, word in hot)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Zipf-distributed concurrent load test')
+    parser.add_argument('--db', type=Path, default=DATABASE,
+                        help=f'Database to build the query mix from (default: {DATABASE})')
+    parser.add_argument('--backend', choices=('cli', 'http'), default='cli',
+                        help='What to load (default: cli)')
+    parser.add_argument('--cli', type=Path, default=DICT_CLI, help=f'dict binary (default: {DICT_CLI})')
+    parser.add_argument('--processes', type=int, help='CLI processes (default: one per client, up to 8)')
+    parser.add_argument('--no-hot', action='store_true',
+                        help='Run the CLI with --no-hot, looking every word up live')
+    parser.add_argument('--url', help="HTTP URL template, e.g. 'http://localhost:8080/lookup?q={}'")
+    parser.add_argument('--timeout', type=float, default=5, help='HTTP timeout in seconds (default: 5)')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent clients (default: 8)')
+    parser.add_argument('--qps', type=float, default=100,
+                        help='Combined target rate (default: 100, 0 = as fast as possible)')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run (default: 30)')
+    parser.add_argument('--interval', type=float, default=5, help='Seconds between reports (default: 5)')
+    parser.add_argument('--vocabulary', type=int, default=20000,
+                        help='Distinct words in the mix (default: 20000)')
+    parser.add_argument('--zipf', type=float, default=1.0, help='Zipf exponent s (default: 1.0)')
+    parser.add_argument('--seed', type=int, default=0, help='Query mix seed (default: 0)')
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Error: Database not found: {args.db}")
+        return 1
+    if args.backend == 'http' and not args.url:
+        parser.error('--backend http needs --url')
+    if args.backend == 'cli' and not args.cli.exists():
+        print(f"Error: CLI not found at {args.cli}")
+        print("Please build it first: cd cmd/dict && go build -o dict")
+        return 1
+
+    words = load_vocabulary(args.db, args.vocabulary)
+    if not words:
+        print('Error: no words to query')
+        return 1
+    weights = zipf_weights(len(words), args.zipf)
+
+    # Only the CLI reads hot_results; the tridict server always looks up live
+    hot = set()
+    pool = None
+    if args.backend == 'cli':
+        if not args.no_hot:
+            hot = hot_words(args.db, words)
+        pool = DictPool(args.cli, size=args.processes or min(args.clients, 8),
+                        args=['--no-hot'] if args.no_hot else [])
+        query = lambda word: pool.query(word) is not None  # noqa: E731
+        # Start every process before the clock starts
+        for process in pool.processes:
+            process.query(words[0])
+    else:
+        query = http_backend(args.url, args.timeout)
+
+    print(f"Load test: {args.backend} backend, {args.clients} clients, "
+          f"{'max' if not args.qps else f'{args.qps:g}'} qps target, {args.duration:g}s")
+    print(f"  Vocabulary: {len(words)} words, Zipf s={args.zipf:g} "
+          f"(top 100 words = {weights[min(99, len(words) - 1)] * 100 / weights[-1]:.0f}% of queries)")
+    if hot:
+        share = sum(weights[i] - (weights[i - 1] if i else 0) for i, word in enumerate(words) if word in hot)
+        print(f"  Hot: {len(hot)} words in hot_results = {share * 100 / weights[-1]:.0f}% of queries")
+
+    recorder = Recorder()
+    period = args.clients / args.qps if args.qps else 0
+    start = time.perf_counter() + 0.1
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=client, daemon=True, args=(
+            query, words, weights, hot, args.seed * 1000 + i, start, period,
+            i * period / args.clients, deadline, recorder))
+        for i in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        last = start
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(max(0, min(last + args.interval, deadline) - time.perf_counter()))
+            now = time.perf_counter()
+            if now - last >= args.interval or now >= deadline:
+                report(f"{now - start:.0f}s", recorder.drain(), now - last)
+                last = now
+            if now >= deadline:
+                for thread in threads:
+                    thread.join()
+        recorder.drain()
+    finally:
+        if pool:
+            pool.close()
+
+    print("\nTotal:")
+    report('all', recorder.all, args.duration)
+    if hot:
+        report('hot', [sample for sample in recorder.all if sample[2]], args.duration)
+        report('live', [sample for sample in recorder.all if not sample[2]], args.duration)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,19 +6,17 @@ local M = {}
 M.config = {
     dict_binary = 'dict',
     db_path = nil, -- Auto-detect
+    artifact = nil, -- Lookup artifact (tridict/artifact.py); used instead of dict when set
+    python = 'python3',
+    timeout = 5000, -- Milliseconds to wait for the artifact reader's answer
 }
 
 function M.setup(opts)
     M.config = vim.tbl_deep_extend('force', M.config, opts or {})
 end
 
-function M.search(word)
-    if not word or word == '' then
-        vim.notify('No word provided', vim.log.levels.ERROR)
-        return
-    end
-
-    -- Find dict binary
+-- Find dict binary
+local function dict_binary()
     local dict_cmd = M.config.dict_binary
     local handle = io.popen('which ' .. dict_cmd .. ' 2>/dev/null')
     if handle then
@@ -30,13 +28,125 @@ function M.search(word)
             dict_cmd = project_root .. '/cmd/dict/dict'
         end
     end
+    return dict_cmd
+end
 
-    -- Execute dict command with JSON output
-    local cmd = string.format('%s --json "%s"', dict_cmd, word)
-    local output = vim.fn.system(cmd)
+-- Repository root (tridict Python package), three levels above lua/tridict/
+local function repo_root()
+    local source = debug.getinfo(1, 'S').source:sub(2)
+    return vim.fn.fnamemodify(source, ':p:h:h:h:h')
+end
+
+-- Artifact reader: one `tridict.artifact serve` process kept open for the
+-- session, answering each word written to it with one JSON line. Starting
+-- Python costs more than a lookup, so it is started once, on first use
+local reader = { job = nil, artifact = nil, lines = {}, partial = '', errors = {} }
+
+local function start_reader(artifact)
+    reader.artifact = artifact
+    reader.lines, reader.partial, reader.errors = {}, '', {}
+    local job = vim.fn.jobstart({ M.config.python, '-m', 'tridict.artifact', 'serve', artifact }, {
+        cwd = repo_root(),
+        on_stdout = function(id, data)
+            -- Late output of a stopped reader must not answer the next word
+            if id ~= reader.job then
+                return
+            end
+            -- data holds the output split at newlines; its last item is the
+            -- start of a line still to come
+            data[1] = reader.partial .. data[1]
+            for i = 1, #data - 1 do
+                table.insert(reader.lines, data[i])
+            end
+            reader.partial = data[#data]
+        end,
+        on_stderr = function(id, data)
+            if id == reader.job then
+                vim.list_extend(reader.errors, data)
+            end
+        end,
+        on_exit = function(id)
+            if reader.job == id then
+                reader.job = nil
+            end
+        end,
+    })
+    reader.job = job > 0 and job or nil
+    return reader.job
+end
+
+-- Look word up in the artifact; returns the JSON line, or nil and an error
+local function artifact_lookup(word)
+    local artifact = vim.fn.fnamemodify(vim.fn.expand(M.config.artifact), ':p')
+    if reader.job and reader.artifact ~= artifact then
+        vim.fn.jobstop(reader.job)
+        reader.job = nil
+    end
+    local job = reader.job or start_reader(artifact)
+    if not job then
+        return nil, 'could not start ' .. M.config.python
+    end
+
+    reader.lines = {}
+    vim.fn.chansend(job, word:gsub('\n', ' ') .. '\n')
+    vim.wait(M.config.timeout, function()
+        return #reader.lines > 0 or reader.job ~= job
+    end, 5)
+    if #reader.lines > 0 then
+        return table.remove(reader.lines, 1)
+    end
+    if reader.job == job then
+        vim.fn.jobstop(job)
+        reader.job = nil
+        return nil, 'no answer from tridict.artifact serve'
+    end
+    return nil, 'tridict.artifact serve exited: ' .. vim.trim(table.concat(reader.errors, '\n'))
+end
+
+-- Typeahead suggestions for a prefix (used for :Dict command-line completion)
+function M.complete(prefix)
+    if not prefix or prefix == '' then
+        return {}
+    end
 
+    local cmd = string.format('%s --complete --json -n 10 "%s"', dict_binary(), prefix)
+    local output = vim.fn.system(cmd)
     if vim.v.shell_error ~= 0 then
-        vim.notify('Dictionary lookup failed: ' .. output, vim.log.levels.ERROR)
+        return {}
+    end
+
+    local ok, data = pcall(vim.json.decode, output)
+    if not ok or type(data) ~= 'table' then
+        return {}
+    end
+
+    local items = {}
+    for _, completion in ipairs(data) do
+        table.insert(items, completion.text)
+    end
+    return items
+end
+
+function M.search(word)
+    if not word or word == '' then
+        vim.notify('No word provided', vim.log.levels.ERROR)
+        return
+    end
+
+    -- Execute lookup with JSON output: the artifact reader if configured,
+    -- else dict
+    local output, err
+    if M.config.artifact then
+        output, err = artifact_lookup(word)
+    else
+        output = vim.fn.system(string.format('%s --json "%s"', dict_binary(), word))
+        if vim.v.shell_error ~= 0 then
+            output, err = nil, output
+        end
+    end
+
+    if not output then
+        vim.notify('Dictionary lookup failed: ' .. err, vim.log.levels.ERROR)
         return
     end
 
@@ -46,6 +156,10 @@ function M.search(word)
         vim.notify('Failed to parse dictionary output', vim.log.levels.ERROR)
         return
     end
+    if data.error then
+        vim.notify('Dictionary lookup failed: ' .. data.error, vim.log.levels.ERROR)
+        return
+    end
 
     -- Show UI
     require('tridict.ui').show(data)
@@ -5,6 +5,9 @@ vim.api.nvim_create_user_command('Dict', function(opts)
     require('tridict').search(opts.args)
 end, {
     nargs = 1,
+    complete = function(arglead)
+        return require('tridict').complete(arglead)
+    end,
     desc = 'Search trilingual dictionary'
 })
 
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Test conjugated forms written to japanese_inflections."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "data"))
+
+from deinflect import inflect  # noqa: E402
+
+
+def test_verb_forms():
+    surfaces = inflect("食べる", "v1")
+    assert surfaces["食べました"] == "polite past"
+    assert surfaces["食べない"] == "negative"
+    assert "食べる" not in surfaces
+
+    surfaces = inflect("のむ", "v5m")
+    assert surfaces["のんで"] == "te"
+    assert surfaces["のまない"] == "negative"
+
+
+def test_adjective_seems():
+    assert inflect("高い", "adj-i")["高そう"] == "seems"
+    assert inflect("いい", "adj-ix")["よさそう"] == "seems"
+    assert inflect("良い", "adj-ix")["良さそう"] == "seems"
+    assert inflect("ない", "adj-i")["なさそう"] == "seems"
+
+    for word, conjugation, wrong in (("いい", "adj-ix", "よそう"), ("良い", "adj-ix", "良そう"),
+                                     ("ない", "adj-i", "なそう")):
+        assert wrong not in inflect(word, conjugation)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Test DictProcess against stub `dict --jsonl` executables."""
+
+import sys
+
+from dict_client import DictProcess
+
+ECHO = """
+import json, sys
+for line in sys.stdin:
+    print(json.dumps({"meta": {"query": line.strip()}, "outputs": []}), flush=True)
+"""
+
+# What dict printed to stdout before startup errors went to stderr
+BROKEN = """
+print("Error: dictionary.db not found", flush=True)
+"""
+
+HUNG = """
+import sys, time
+sys.stdin.readline()
+time.sleep(60)
+"""
+
+
+def stub(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(f"#!{sys.executable}\n{body}")
+    path.chmod(0o755)
+    return path
+
+
+def test_answers(tmp_path):
+    process = DictProcess(stub(tmp_path, "echo", ECHO))
+    try:
+        assert process.query("cat")["meta"]["query"] == "cat"
+        assert process.query("猫")["meta"]["query"] == "猫"
+        assert process.query("two\nlines") is None
+    finally:
+        process.close()
+
+
+def test_non_json_output(tmp_path):
+    process = DictProcess(stub(tmp_path, "broken", BROKEN))
+    for _ in range(3):
+        assert process.query("cat") is None
+    assert process.process is None
+
+
+def test_timeout(tmp_path):
+    process = DictProcess(stub(tmp_path, "hung", HUNG), timeout=0.5)
+    assert process.query("cat") is None
+    assert process.process is None
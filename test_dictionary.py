@@ -1,78 +1,107 @@
 #!/usr/bin/env python3
 """Comprehensive test of dictionary queries across all three languages."""
 
+import hashlib
 import json
 import random
 import sqlite3
-import subprocess
 import sys
 from pathlib import Path
 
+from dict_client import DICT_CLI, DictPool
+
 # Test configuration
 NUM_TESTS_PER_LANGUAGE = 30
-DICT_CLI = Path(__file__).parent / "cmd/dict/dict"
 DATABASE = Path(__file__).parent / "data/dictionary.db"
-
-def get_sample_words(db_path, language, count):
-    """Get sample words from the database for testing."""
-    conn = sqlite3.connect(db_path)
+CACHE_DIR = Path(__file__).parent / ".test_cache"
+SAMPLE_SEED = 0
+
+# English glosses worth querying: single words that fit a CLI test
+GLOSS_FILTER = """
+    text NOT LIKE '%(%' AND text NOT LIKE '%;%' AND text NOT LIKE '% %'
+    AND LENGTH(text) < 15 AND LENGTH(text) > 2
+"""
+
+# language → (candidate IDs, text of chosen IDs)
+SAMPLE_QUERIES = {
+    "en": (None, "SELECT text FROM glosses WHERE id IN ({})"),
+    "ja": ("""
+        SELECT id FROM japanese_words
+        WHERE is_common = 1 AND headword NOT LIKE '%/%'
+    """, "SELECT headword FROM japanese_words WHERE id IN ({})"),
+    "zh": ("""
+        SELECT id FROM chinese_words
+        WHERE is_common = 1 AND simplified NOT LIKE '%/%'
+    """, "SELECT simplified FROM chinese_words WHERE id IN ({})"),
+}
+
+def db_fingerprint(db_path):
+    """Cheap cache key for a database file.
+
+    SQLite bumps the file change counter in the header (bytes 24-27) on
+    every committed write, so with size and mtime it identifies the
+    contents without hashing the whole file.
+    """
+    stat = Path(db_path).stat()
+    with open(db_path, "rb") as f:
+        header = f.read(100)
+    key = f"{stat.st_size}:{stat.st_mtime_ns}:{header[24:28].hex()}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+def shared_gloss_ids(cursor):
+    """IDs of single-word glosses used by both Japanese and Chinese words."""
+    cursor.execute(f"""
+        SELECT id, LOWER(text) FROM glosses
+        WHERE {GLOSS_FILTER} AND id IN (SELECT gloss_id FROM japanese_definitions)
+    """)
+    japanese = cursor.fetchall()
+    cursor.execute(f"""
+        SELECT LOWER(text) FROM glosses
+        WHERE {GLOSS_FILTER} AND id IN (SELECT gloss_id FROM chinese_definitions)
+    """)
+    chinese = {row[0] for row in cursor.fetchall()}
+    return sorted(gloss_id for gloss_id, text in japanese if text in chinese)
+
+def sample_pools(db_path):
+    """Candidate IDs per language, computed once per database and cached.
+
+    The English pool is a cross-language gloss intersection that takes
+    a while on the full database, so all pools are written to
+    CACHE_DIR keyed by db_fingerprint.
+    """
+    cache_file = CACHE_DIR / f"samples-{db_fingerprint(db_path)}.json"
+    if cache_file.exists():
+        return json.loads(cache_file.read_text())
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
     cursor = conn.cursor()
+    pools = {"en": shared_gloss_ids(cursor)}
+    for language in ("ja", "zh"):
+        cursor.execute(SAMPLE_QUERIES[language][0])
+        pools[language] = [row[0] for row in cursor.fetchall()]
+    conn.close()
 
-    if language == "en":
-        # Get common single-word English glosses that appear in both JA and ZH
-        cursor.execute("""
-            SELECT DISTINCT j.english_gloss
-            FROM japanese_definitions j
-            JOIN chinese_definitions c ON LOWER(j.english_gloss) = LOWER(c.english_gloss)
-            WHERE j.english_gloss NOT LIKE '%(%'
-            AND j.english_gloss NOT LIKE '%;%'
-            AND j.english_gloss NOT LIKE '% %'
-            AND LENGTH(j.english_gloss) < 15
-            AND LENGTH(j.english_gloss) > 2
-            ORDER BY RANDOM()
-            LIMIT ?
-        """, (count,))
-        words = [row[0] for row in cursor.fetchall()]
-    elif language == "ja":
-        # Get Japanese headwords
-        cursor.execute("""
-            SELECT headword FROM japanese_words
-            WHERE is_common = 1
-            AND headword NOT LIKE '%/%'
-            ORDER BY RANDOM()
-            LIMIT ?
-        """, (count,))
-        words = [row[0] for row in cursor.fetchall()]
-    elif language == "zh":
-        # Get Chinese simplified words
-        cursor.execute("""
-            SELECT simplified FROM chinese_words
-            WHERE is_common = 1
-            AND simplified NOT LIKE '%/%'
-            ORDER BY RANDOM()
-            LIMIT ?
-        """, (count,))
-        words = [row[0] for row in cursor.fetchall()]
+    CACHE_DIR.mkdir(exist_ok=True)
+    for stale in CACHE_DIR.glob("samples-*.json"):
+        stale.unlink()
+    cache_file.write_text(json.dumps(pools))
+    return pools
 
+def get_sample_words(db_path, language, count, seed=SAMPLE_SEED):
+    """Get sample words from the database for testing.
+
+    The same seed and database always give the same words.
+    """
+    ids = sample_pools(db_path)[language]
+    chosen = random.Random(f"{seed}:{language}").sample(ids, min(count, len(ids)))
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    cursor = conn.cursor()
+    cursor.execute(SAMPLE_QUERIES[language][1].format(", ".join("?" * len(chosen))), chosen)
+    words = [row[0] for row in cursor.fetchall()]
     conn.close()
     return words
 
-def query_word(word):
-    """Query a word using the CLI and return parsed JSON response."""
-    try:
-        result = subprocess.run(
-            [str(DICT_CLI), "--json", word],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode != 0:
-            return None
-        return json.loads(result.stdout)
-    except Exception as e:
-        print(f"Error querying '{word}': {e}")
-        return None
-
 def validate_response(word, response, expected_language):
     """Validate that a response is reasonable."""
     issues = []
@@ -162,6 +191,8 @@ def run_tests():
     print(f"  Japanese: {len(japanese_words)} words")
     print(f"  Chinese: {len(chinese_words)} words\n")
 
+    pool = DictPool(DICT_CLI)
+
     # Test results tracking
     results = {
         'en': {'total': 0, 'passed': 0, 'failed': 0, 'errors': [], 'samples': []},
@@ -171,12 +202,8 @@ def run_tests():
 
     # Test English words
     print("Testing English words...")
-    for i, word in enumerate(english_words, 1):
-        if i % 20 == 0:
-            print(f"  Progress: {i}/{len(english_words)}")
-
+    for word, response in zip(english_words, pool.query_words(english_words)):
         results['en']['total'] += 1
-        response = query_word(word)
         issues = validate_response(word, response, 'en')
 
         if issues:
@@ -191,12 +218,8 @@ def run_tests():
 
     # Test Japanese words
     print("Testing Japanese words...")
-    for i, word in enumerate(japanese_words, 1):
-        if i % 20 == 0:
-            print(f"  Progress: {i}/{len(japanese_words)}")
-
+    for word, response in zip(japanese_words, pool.query_words(japanese_words)):
         results['ja']['total'] += 1
-        response = query_word(word)
         issues = validate_response(word, response, 'ja')
 
         if issues:
@@ -211,12 +234,8 @@ def run_tests():
 
     # Test Chinese words
     print("Testing Chinese words...")
-    for i, word in enumerate(chinese_words, 1):
-        if i % 20 == 0:
-            print(f"  Progress: {i}/{len(chinese_words)}")
-
+    for word, response in zip(chinese_words, pool.query_words(chinese_words)):
         results['zh']['total'] += 1
-        response = query_word(word)
         issues = validate_response(word, response, 'zh')
 
         if issues:
@@ -229,6 +248,8 @@ def run_tests():
 
     print(f"  ✓ Completed: {results['zh']['passed']}/{results['zh']['total']} passed\n")
 
+    pool.close()
+
     # Print summary
     print("=" * 70)
     print("TEST SUMMARY")
@@ -1,12 +1,9 @@
 #!/usr/bin/env python3
 """Test dictionary with expected results for common words."""
 
-import json
-import subprocess
 import sys
-from pathlib import Path
 
-DICT_CLI = Path(__file__).parent / "cmd/dict/dict"
+from dict_client import DICT_CLI, DictPool
 
 # Test cases: English input with expected Japanese and Chinese outputs
 ENGLISH_TESTS = [
@@ -182,20 +179,14 @@ CHINESE_TESTS = [
     {"input": "昨天", "expected_pinyin": "zuó tiān", "expected_en": "yesterday"},
 ]
 
-def query_word(word):
-    """Query a word using the CLI and return parsed JSON response."""
-    try:
-        result = subprocess.run(
-            [str(DICT_CLI), "--json", word],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode != 0:
-            return None
-        return json.loads(result.stdout)
-    except Exception as e:
-        return None
+_pool = None
+
+def query_words(words):
+    """Query words concurrently over a shared pool of CLI processes."""
+    global _pool
+    if _pool is None:
+        _pool = DictPool(DICT_CLI)
+    return _pool.query_words(words)
 
 def normalize_reading(reading):
     """Normalize reading by removing spaces and converting to lowercase."""
@@ -213,9 +204,9 @@ def test_english_words():
     failed = 0
     errors = []
 
-    for i, test in enumerate(ENGLISH_TESTS, 1):
+    responses = query_words([test["input"] for test in ENGLISH_TESTS])
+    for test, response in zip(ENGLISH_TESTS, responses):
         word = test["input"]
-        response = query_word(word)
 
         if not response or 'outputs' not in response:
             failed += 1
@@ -287,9 +278,9 @@ def test_japanese_words():
     failed = 0
     errors = []
 
-    for test in JAPANESE_TESTS:
+    responses = query_words([test["input"] for test in JAPANESE_TESTS])
+    for test, response in zip(JAPANESE_TESTS, responses):
         word = test["input"]
-        response = query_word(word)
 
         if not response or 'outputs' not in response or len(response['outputs']) == 0:
             failed += 1
@@ -341,9 +332,9 @@ def test_chinese_words():
     failed = 0
     errors = []
 
-    for test in CHINESE_TESTS:
+    responses = query_words([test["input"] for test in CHINESE_TESTS])
+    for test, response in zip(CHINESE_TESTS, responses):
         word = test["input"]
-        response = query_word(word)
 
         if not response or 'outputs' not in response or len(response['outputs']) == 0:
             failed += 1
@@ -403,6 +394,8 @@ def main():
     en_passed, en_failed = test_english_words()
     ja_passed, ja_failed = test_japanese_words()
     zh_passed, zh_failed = test_chinese_words()
+    if _pool is not None:
+        _pool.close()
 
     # Summary
     total_passed = en_passed + ja_passed + zh_passed
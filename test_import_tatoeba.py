@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""Test the example sentence score used by import_tatoeba.py."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "data"))
+
+from import_tatoeba import example_score  # noqa: E402
+from ranker import rank_score  # noqa: E402
+
+
+def test_translation_beats_length():
+    # A very long translated sentence among rare words still outranks a
+    # short untranslated one among the most common words
+    best_rank = rank_score("猫", True, 1)
+    translated = example_score("猫" * 200, "A cat.", 0)
+    untranslated = example_score("猫" * 12, None, best_rank)
+    assert translated > untranslated
+
+
+def test_length_near_ideal():
+    assert example_score("猫" * 12, "A cat.", 0) > example_score("猫" * 20, "A cat.", 0)
+    assert example_score("猫" * 12, "A cat.", 0) > example_score("猫" * 4, "A cat.", 0)
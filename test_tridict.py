@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Test the native Python lookups (tridict) on the sample database."""
+
+import asyncio
+import io
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from tridict import ConnectionPool, Dictionary, LRUCache
+from tridict.artifact import Artifact, build_artifact, serve_jsonl
+from tridict.server import LookupService
+from tridict.text import romaji_key
+
+SAMPLES = Path(__file__).parent / "data/sample/generate_samples.py"
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("tridict") / "dictionary.db"
+    subprocess.run([sys.executable, str(SAMPLES), str(path)], cwd=SAMPLES.parent,
+                   check=True, capture_output=True)
+    return path
+
+
+@pytest.fixture
+def dictionary(db_path):
+    with Dictionary(db_path) as dictionary:
+        yield dictionary
+
+
+def headwords(response, language):
+    return [output["headword"] for output in response["outputs"] if output["language"] == language]
+
+
+def test_exact(dictionary):
+    response = dictionary.lookup("猫")
+    assert response["meta"] == {"input_language": "ambiguous", "query": "猫"}
+    assert headwords(response, "ja") == ["猫"]
+    assert headwords(response, "zh") == ["猫"]
+
+
+def test_form(dictionary):
+    for query in ("ねこ", "ネコ"):
+        response = dictionary.lookup(query)
+        assert response["meta"]["input_language"] == "ja"
+        assert headwords(response, "ja") == ["猫"]
+
+
+def test_script_key(dictionary):
+    response = dictionary.lookup("學校")
+    assert headwords(response, "ja") == ["学校"]
+    assert headwords(response, "zh") == ["学校"]
+
+
+def test_inflection(dictionary):
+    assert headwords(dictionary.lookup("食べました"), "ja") == ["食べる"]
+    assert headwords(dictionary.lookup("よさそう"), "ja") == ["良い"]
+
+
+def test_romaji(dictionary):
+    for query in ("neko", "NEKO"):
+        assert headwords(dictionary.lookup(query), "ja") == ["猫"]
+    assert headwords(dictionary.lookup("ookii"), "ja") == ["大きい"]
+
+
+def test_romaji_key_macrons():
+    assert romaji_key("kōhī") == romaji_key("koohii") == "kohi"
+    assert romaji_key("tōkyō") == "tokyo"
+    assert romaji_key("obaasan") == "obasan"
+
+
+def test_pinyin(dictionary):
+    for query in ("māo", "mao"):
+        assert headwords(dictionary.lookup(query), "zh") == ["猫"]
+    assert headwords(dictionary.lookup("shi2jian1"), "zh") == ["时间"]
+
+
+def test_english(dictionary):
+    for query in ("cat", "CAT", " cat "):
+        response = dictionary.lookup(query)
+        assert response["meta"] == {"input_language": "en", "query": query.strip()}
+        assert headwords(response, "ja") == ["猫"]
+        assert headwords(response, "zh") == ["猫"]
+    assert dictionary.lookup("xyz")["outputs"] == []
+
+
+def test_empty_input(dictionary):
+    assert dictionary.lookup("") is None
+    assert dictionary.lookup("   ") is None
+    assert dictionary.lookup_many(["", "cat"])[0] is None
+    assert list(dictionary.lookup_bulk(["", "cat"]))[0] is None
+
+
+def test_lookup_many_matches_lookup(dictionary):
+    queries = ["cat", "猫", "ねこ", "食べました", "mao", "", "xyz"]
+    assert dictionary.lookup_many(queries, 1) == [dictionary.lookup(query, 1) for query in queries]
+    assert list(dictionary.lookup_bulk(queries, 1, chunk_size=3)) == dictionary.lookup_many(queries, 1)
+
+
+def test_cache_eviction():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.info() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.info() == {"hits": 0, "misses": 1, "size": 0, "maxsize": 2}
+
+    disabled = LRUCache(0)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None and len(disabled) == 0
+
+
+def test_cache_keys(db_path):
+    with Dictionary(db_path, cache_size=2) as dictionary:
+        first = dictionary.lookup("cat")
+        assert dictionary.lookup("cat") is first
+        assert dictionary.cache_info()["hits"] == 1
+
+        # max_results is part of the key
+        assert dictionary.lookup("cat", 1) is not first
+        dictionary.lookup("dog")
+        assert dictionary.lookup("cat") is not first
+        assert dictionary.cache_info()["size"] == 2
+
+        dictionary.cache.clear()
+        assert dictionary.lookup("dog", 1) == dictionary.lookup("dog", 1)
+        assert dictionary.cache_info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+
+def test_pool_exhaustion(db_path):
+    pool = ConnectionPool(db_path, size=1)
+    borrowed = threading.Event()
+
+    def borrow():
+        with pool.connection() as conn:
+            conn.execute("SELECT 1").fetchall()
+            borrowed.set()
+
+    with pool.connection() as conn:
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        assert not borrowed.wait(0.2)
+        first = conn
+    thread.join(5)
+    assert borrowed.is_set()
+
+    # The released connection is reused, not reopened
+    with pool.connection() as conn:
+        assert conn is first
+    pool.close()
+
+
+def test_missing_database(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Dictionary(tmp_path / "missing.db")
+
+
+def test_server_coalesces(db_path):
+    async def run():
+        service = LookupService(db_path, workers=2, cache_size=0)
+        try:
+            first = asyncio.ensure_future(service.lookup("cat", 5))
+            second = asyncio.ensure_future(service.lookup("cat", 5))
+            await asyncio.sleep(0)
+            assert service.metrics.coalesced == 1
+
+            # The first waiter leaving doesn't cancel the shared lookup
+            first.cancel()
+            response = await second
+            assert first.cancelled()
+            assert headwords(response, "ja") == ["猫"]
+            assert service.inflight == {}
+        finally:
+            service.close()
+
+    asyncio.run(run())
+
+
+def test_server_reload(db_path, tmp_path):
+    path = tmp_path / "dictionary.db"
+    shutil.copy(db_path, path)
+
+    async def run():
+        service = LookupService(path, workers=1, cache_size=10)
+        try:
+            before = service.generation
+            assert not await service.reload()
+
+            # A swapped-in file gets a new generation, so new lookups
+            # neither join old in-flight ones nor read the old cache
+            shutil.copy(db_path, tmp_path / "new.db")
+            os.replace(tmp_path / "new.db", path)
+            assert await service.reload()
+            assert service.generation.number > before.number
+            assert before.retired
+            assert headwords(await service.lookup("cat", 5), "ja") == ["猫"]
+            assert service.metrics.reloads == 1
+        finally:
+            service.close()
+
+    asyncio.run(run())
+
+
+def test_bulk_holds_no_lock(db_path, tmp_path):
+    path = tmp_path / "dictionary.db"
+    shutil.copy(db_path, path)
+    with Dictionary(path) as dictionary:
+        responses = dictionary.lookup_bulk(["cat", "dog", "猫"], chunk_size=2)
+        assert headwords(next(responses), "ja") == ["猫"]
+
+        # Suspended between chunks, the generator keeps its connection
+        # but no open transaction, so writers aren't locked out
+        writer = sqlite3.connect(path, timeout=0)
+        writer.execute("UPDATE japanese_words SET rank_score = rank_score WHERE id = 1")
+        writer.commit()
+        writer.close()
+
+        assert [headwords(response, "ja") for response in responses] == [["犬"], ["猫"]]
+
+
+def test_hot_results_lead_with_single_lookups(db_path, dictionary):
+    # The web and iOS apps keep the first stored output per language, which
+    # must be what their cold LIMIT 1 lookups (max_results=1) return
+    conn = sqlite3.connect(db_path)
+    keys = [key for key, in conn.execute("SELECT query_key FROM hot_results")]
+    conn.close()
+    assert keys
+    for key in keys:
+        first = {}
+        for output in dictionary.lookup(key, 5)["outputs"]:
+            first.setdefault(output["language"], output)
+        assert list(first.values()) == dictionary.lookup(key, 1)["outputs"], key
+
+
+def test_artifact_serve(db_path, tmp_path):
+    path = tmp_path / "dictionary.artifact"
+    build_artifact(db_path, path)
+    out = io.StringIO()
+    with Artifact(path) as artifact:
+        serve_jsonl(artifact, ["cat\n", "\n", "한국\n", "猫\n"], out, 1)
+        answers = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert answers[0] == artifact.lookup("cat", 1)
+    assert answers[1:3] == [{"query": "", "error": "empty query"},
+                            {"query": "한국", "error": "unsupported language: unknown"}]
+    assert headwords(answers[3], "ja") == ["猫"]
+
+
+def test_artifact_skips_sqlite():
+    # A reader started per editor session shouldn't pay for the SQL lookups
+    code = "import sys, tridict.artifact; print('sqlite3' in sys.modules, 'tridict.lookup' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent,
+                            check=True, capture_output=True, text=True)
+    assert result.stdout.split() == ["False", "False"]
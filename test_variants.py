@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Test the cross-script variant classes and script-folded lookups."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "data"))
+
+from variants import build_variants, load_variants  # noqa: E402
+
+from tridict import Dictionary  # noqa: E402
+
+SCHEMA = Path(__file__).parent / "data/schema.sql"
+
+
+def make_db(path, chinese=(), japanese=()):
+    """Schema-only database with (simplified, traditional) Chinese words and
+    (headword, rank_score, old forms) Japanese words."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA.read_text())
+    for simplified, traditional in chinese:
+        conn.execute("INSERT INTO chinese_words (simplified, traditional, pinyin) VALUES (?, ?, '')",
+                     (simplified, traditional))
+    for headword, rank_score, old_forms in japanese:
+        word_id = conn.execute("INSERT INTO japanese_words (headword, reading, rank_score) VALUES (?, '', ?)",
+                               (headword, rank_score)).lastrowid
+        conn.execute("INSERT INTO japanese_forms (form, word_id, kind) VALUES (?, ?, 'k')", (headword, word_id))
+        conn.executemany("INSERT INTO japanese_forms (form, word_id, kind, is_outdated) VALUES (?, ?, 'k', 1)",
+                         [(old, word_id) for old in old_forms])
+    return conn
+
+
+def test_ambiguous_characters_not_folded(tmp_path):
+    conn = make_db(tmp_path / "variants.db", chinese=[
+        ("干", "乾"), ("干", "幹"), ("干杯", "乾杯"), ("树干", "樹幹"),
+        ("发", "發"), ("发", "髮"), ("头发", "頭髮"),
+        ("学校", "學校"), ("图", "圖"),
+    ], japanese=[("図", 0, ["圖"])])
+    cursor = conn.cursor()
+    build_variants(cursor)
+    variants = load_variants(cursor)
+
+    for char in "干乾幹发發髮":
+        assert char not in variants
+    # One-to-one pairs still fold, across sources too
+    assert variants["學"] == "学"
+    assert variants["圖"] == variants["图"] == "図"
+
+
+def test_exact_spelling_ranks_first(tmp_path):
+    path = tmp_path / "dictionary.db"
+    conn = make_db(path, japanese=[("幹", 10, []), ("乾", 900, [])])
+    # Fold 幹 into 乾 as if the sources paired them one to one
+    conn.execute("INSERT INTO char_variants (char, canonical) VALUES ('幹', '乾')")
+    conn.execute("UPDATE japanese_words SET script_key = '乾'")
+    conn.commit()
+    conn.close()
+
+    with Dictionary(path) as dictionary:
+        outputs = dictionary.lookup("幹")["outputs"]
+        assert [output["headword"] for output in outputs] == ["幹", "乾"]
+        outputs = dictionary.lookup("乾")["outputs"]
+        assert [output["headword"] for output in outputs] == ["乾", "幹"]
@@ -0,0 +1,32 @@
+"""Native Python lookups on dictionary.db.
+
+The same triangulation as the Go core (detect the input language, look it
+up directly, pivot through English, rank), without shelling out to the
+dict CLI:
+
+    from tridict import Dictionary
+
+    with Dictionary('data/dictionary.db') as dictionary:
+        response = dictionary.lookup('猫')
+        responses = dictionary.lookup_many(['cat', 'ねこ', 'māo'])
+
+Responses have the shape of `dict --json` output. A Dictionary can be
+shared between threads: it holds a pool of read-only connections and an
+LRU cache of responses (see cache_info()).
+"""
+
+import importlib
+
+from .text import detect_language
+
+__all__ = ['ConnectionPool', 'Dictionary', 'LRUCache', 'detect_language']
+
+# Loaded on first use, so importing tridict.artifact or tridict.text
+# doesn't load sqlite3 and the SQL lookups
+_LAZY = {'ConnectionPool': '.pool', 'Dictionary': '.lookup', 'LRUCache': '.cache'}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
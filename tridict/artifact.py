@@ -0,0 +1,417 @@
+"""Memory-mapped lookup artifact: dictionary.db packed for instant opens.
+
+    python3 -m tridict.artifact build data/dictionary.db data/dictionary.artifact
+    python3 -m tridict.artifact lookup data/dictionary.artifact 猫
+    python3 -m tridict.artifact serve data/dictionary.artifact < words
+
+A one-off `dict --json` spends most of its time opening SQLite and
+planning queries. The artifact holds everything the triangulation reads,
+laid out so a reader can mmap the file and binary-search it in place:
+
+- ja_words, zh_words:  one record per word (by id): the word's columns,
+                       definitions, examples and details as compact JSON
+- ja_forms, ja_script, ja_inflections, ja_romaji, zh_script, zh_pinyin:
+                       the lookup columns of the word tables, each a sorted
+                       key array whose values are record indexes
+- en_ja, en_zh:        every term a gloss matches under (see gloss_heads),
+                       valued by the record indexes it finds
+- variants:            char_variants, character → canonical character
+
+Postings are stored in the order the SQL lookups sort them (rank_score
+descending, then match class for glosses, then id), so a lookup cut to
+max_results reads a prefix. Opening reads the fixed-size section table
+only; a lookup decodes the keys it compares and the records it returns.
+
+Layout (little-endian): a header (magic, version, section count), one
+table entry per section (name, count, and the offsets of its key offset
+array, key bytes, value offset array and value bytes), then the sections.
+Offset arrays are uint64, count + 1 entries, relative to their bytes;
+postings are uint32 arrays. Keys sort by UTF-8 bytes.
+
+Artifact.lookup() runs the same steps as Dictionary.lookup() (resolve() in
+resolve.py), one binary search per key. Gloss terms are matched literally,
+where the SQL lookups treat % and _ as LIKE wildcards. Reading an artifact
+never imports sqlite3 or lookup.py; only build_artifact() does.
+
+A new Python process costs more than the lookup itself, so an editor
+keeps one `serve` process open and writes one word per line to it, like
+`dict --jsonl`: each line is answered by one compact JSON line, the
+response or {"query", "error"}.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import defaultdict
+from pathlib import Path
+
+from .resolve import ASCII_LOWER, gloss_heads, resolve, top
+from .text import detect_language, to_hiragana
+
+MAGIC = b'TRIDICT\0'
+VERSION = 1
+
+HEADER = struct.Struct('<8sII')
+# name, count, key offsets, key bytes, value offsets, value bytes
+SECTION = struct.Struct('<16sQQQQQ')
+
+# Keyed sections: (name, language, SQL selecting (key, word_id))
+KEYED = (
+    ('ja_forms', 'ja', 'SELECT form, word_id FROM japanese_forms'),
+    ('ja_script', 'ja', 'SELECT script_key, id FROM japanese_words'),
+    ('ja_inflections', 'ja', 'SELECT surface, word_id FROM japanese_inflections'),
+    ('ja_romaji', 'ja', 'SELECT reading_romaji, id FROM japanese_words'),
+    ('zh_script', 'zh', 'SELECT script_key, id FROM chinese_words'),
+    ('zh_pinyin', 'zh', 'SELECT pinyin_key, id FROM chinese_words'),
+)
+
+
+class _Writer:
+    """Writes sections to out after a placeholder header, then the header."""
+
+    def __init__(self, out, sections):
+        self.out = out
+        self.table = []
+        out.write(bytes(HEADER.size + SECTION.size * sections))
+
+    def _align(self):
+        self.out.write(bytes(-self.out.tell() % 8))
+        return self.out.tell()
+
+    def _bytes(self, chunks):
+        start = self._align()
+        offsets = array('Q', [0])
+        for chunk in chunks:
+            self.out.write(chunk)
+            offsets.append(offsets[-1] + len(chunk))
+        return start, offsets
+
+    def _offsets(self, offsets):
+        start = self._align()
+        self.out.write(offsets.tobytes())
+        return start
+
+    def section(self, name, values, keys=None):
+        key_index = key_bytes = 0
+        if keys is not None:
+            key_bytes, key_offsets = self._bytes(keys)
+            key_index = self._offsets(key_offsets)
+        value_bytes, value_offsets = self._bytes(values)
+        value_index = self._offsets(value_offsets)
+        self.table.append(SECTION.pack(name.encode(), len(value_offsets) - 1,
+                                       key_index, key_bytes, value_index, value_bytes))
+
+    def keyed(self, name, postings):
+        """Section of {key: [record index]} sorted by key bytes."""
+        items = sorted((key.encode(), indexes) for key, indexes in postings.items())
+        self.section(name, (array('I', indexes).tobytes() for _, indexes in items),
+                     [key for key, _ in items])
+
+    def finish(self):
+        self.out.seek(0)
+        self.out.write(HEADER.pack(MAGIC, VERSION, len(self.table)))
+        self.out.write(b''.join(self.table))
+
+
+def _records(conn, lang, ids, ranks):
+    """Yield the JSON record of every lang word, by id, filling ids
+    ({id: record index}) and ranks (rank_score per record index)."""
+    from .lookup import BULK_CHUNK, TABLES, _Batch, _columns
+
+    table = TABLES[lang]
+    all_ids = [row[0] for row in conn.execute(f'SELECT id FROM {table}_words ORDER BY id')]
+    for start in range(0, len(all_ids), BULK_CHUNK):
+        chunk = all_ids[start:start + BULK_CHUNK]
+        batch = _Batch(conn, {}, 0, temp_keys=True)
+        words = [batch._word(lang, row) for row in conn.execute(f'''
+            SELECT {_columns(lang)} FROM {table}_words w
+            WHERE w.id BETWEEN ? AND ? ORDER BY w.id
+        ''', (chunk[0], chunk[-1]))]
+        batch.load(lang, words)
+        # End the transaction filling temp.batch_keys opened (see lookup_bulk)
+        conn.rollback()
+        for word in words:
+            ids[word['id']] = len(ranks)
+            ranks.append(word['rank_score'])
+            yield json.dumps(word, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def build_artifact(db_path, path) -> int:
+    """Write the artifact for the database at db_path to path; returns its size.
+
+    The file is written next to path and renamed over it, so readers that
+    have the old one mapped keep a consistent view.
+    """
+    # Only building reads SQLite; lookups load without it
+    from .lookup import TABLES
+    from .pool import ConnectionPool
+
+    path = Path(path)
+    partial = path.with_name(path.name + '.partial')
+    pool = ConnectionPool(db_path, 1)
+    try:
+        with pool.connection() as conn, open(partial, 'wb') as out:
+            writer = _Writer(out, 2 + len(KEYED) + 3)
+            ids = {'ja': {}, 'zh': {}}
+            ranks = {'ja': [], 'zh': []}
+            for lang in ('ja', 'zh'):
+                writer.section(f'{lang}_words', _records(conn, lang, ids[lang], ranks[lang]))
+
+            for name, lang, sql in KEYED:
+                postings = defaultdict(set)
+                for key, word_id in conn.execute(sql):
+                    if key:
+                        postings[key].add(ids[lang][word_id])
+                rank = ranks[lang]
+                writer.keyed(name, {key: sorted(indexes, key=lambda i: (-rank[i], i))
+                                    for key, indexes in postings.items()})
+
+            heads = {}
+            for gloss_id, text in conn.execute('SELECT id, text FROM glosses'):
+                matches = {}
+                for term, match in gloss_heads(text.translate(ASCII_LOWER)):
+                    matches[term] = min(match, matches.get(term, match))
+                heads[gloss_id] = matches
+            for lang, table in TABLES.items():
+                terms = defaultdict(dict)
+                for word_id, gloss_id in conn.execute(f'SELECT word_id, gloss_id FROM {table}_definitions'):
+                    index = ids[lang][word_id]
+                    for term, match in heads[gloss_id].items():
+                        found = terms[term]
+                        found[index] = min(match, found.get(index, match))
+                rank = ranks[lang]
+                writer.keyed(f'en_{lang}', {term: sorted(found, key=lambda i: (-rank[i], found[i], i))
+                                            for term, found in terms.items()})
+
+            variants = sorted((char.encode(), canonical.encode())
+                              for char, canonical in conn.execute('SELECT char, canonical FROM char_variants'))
+            writer.section('variants', [canonical for _, canonical in variants], [char for char, _ in variants])
+            writer.finish()
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        pool.close()
+
+    os.replace(partial, path)
+    return path.stat().st_size
+
+
+class _Section:
+    """One section of a mapped artifact; every array is a view of the map."""
+
+    def __init__(self, view, count, key_index, key_bytes, value_index, value_bytes):
+        self.count = count
+        self.key_offsets = view[key_index:key_index + 8 * (count + 1)].cast('Q') if key_index else None
+        self.keys = view[key_bytes:]
+        self.value_offsets = view[value_index:value_index + 8 * (count + 1)].cast('Q')
+        self.values = view[value_bytes:]
+
+    def value(self, i):
+        return self.values[self.value_offsets[i]:self.value_offsets[i + 1]]
+
+    def _key(self, i):
+        return self.keys[self.key_offsets[i]:self.key_offsets[i + 1]].tobytes()
+
+    def find(self, key):
+        """Value of key (str), or None."""
+        key = key.encode()
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._key(lo) == key:
+            return self.value(lo)
+        return None
+
+    def postings(self, key):
+        """Record indexes of key, best first."""
+        value = self.find(key)
+        return value.cast('I') if value is not None else ()
+
+    def release(self):
+        for view in (self.key_offsets, self.keys, self.value_offsets, self.values):
+            if view is not None:
+                view.release()
+
+
+class _ArtifactBatch:
+    """The _Batch steps _resolve() calls, answered from an Artifact.
+
+    Records hold definitions, examples and details already, so load() has
+    nothing to do.
+    """
+
+    def __init__(self, sections, max_results):
+        self.sections = sections
+        self.limit = max_results
+        self.words = {'ja': {}, 'zh': {}}
+
+    def _top(self, words, order):
+        return top(words, order, self.limit)
+
+    def _word(self, lang, index):
+        registry = self.words[lang]
+        word = registry.get(index)
+        if word is None:
+            word = registry[index] = json.loads(self.sections[f'{lang}_words'].value(index).tobytes())
+        return word
+
+    def _head(self, lang, section, key):
+        """Words of a single ranked postings list, cut to the limit."""
+        indexes = self.sections[section].postings(key)
+        if self.limit > 0:
+            indexes = indexes[:self.limit]
+        return [self._word(lang, index) for index in indexes]
+
+    def _words(self, lang, probes):
+        return [self._word(lang, index)
+                for section, key in probes for index in self.sections[section].postings(key)]
+
+    def script_key(self, text):
+        variants = self.sections['variants']
+        return ''.join(bytes(canonical).decode() if (canonical := variants.find(char)) is not None else char
+                       for char in text)
+
+    def japanese(self, forms):
+        return {form: self._top(
+            self._words('ja', [('ja_forms', form), ('ja_forms', to_hiragana(form)),
+                               ('ja_script', self.script_key(form))]),
+            lambda word: (word['headword'] != form, -word['rank_score']),
+        ) for form in forms}
+
+    def japanese_by_inflection(self, surfaces):
+        return {surface: self._top(
+            self._words('ja', [('ja_inflections', surface), ('ja_inflections', to_hiragana(surface))]),
+            lambda word: -word['rank_score'],
+        ) for surface in surfaces}
+
+    def japanese_by_romaji(self, keys):
+        return {key: self._head('ja', 'ja_romaji', key) for key in keys}
+
+    def chinese(self, texts):
+        return {text: self._top(
+            self._words('zh', [('zh_script', self.script_key(text))]),
+            lambda word: (text not in (word['simplified'], word['traditional']), -word['rank_score']),
+        ) for text in texts}
+
+    def chinese_by_pinyin(self, keys):
+        return {key: self._head('zh', 'zh_pinyin', key) for key in keys}
+
+    def by_english(self, lang, terms):
+        return {term: self._head(lang, f'en_{lang}', term.translate(ASCII_LOWER)) for term in terms}
+
+    def load(self, lang, words):
+        pass
+
+
+class Artifact:
+    """Lookups on an artifact written by build_artifact, memory-mapped.
+
+        with Artifact('data/dictionary.artifact') as artifact:
+            response = artifact.lookup('猫')
+
+    Responses are the same as Dictionary.lookup() on the database the
+    artifact was built from. Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise OSError('tridict artifacts are read in place and need a little-endian host')
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version, count = HEADER.unpack_from(self._view)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a version {VERSION} tridict artifact: {path}")
+        self.sections = {}
+        for i in range(count):
+            name, *layout = SECTION.unpack_from(self._view, HEADER.size + i * SECTION.size)
+            self.sections[name.rstrip(b'\0').decode()] = _Section(self._view, *layout)
+
+    def lookup(self, word, max_results=5):
+        """Response for word, or None for empty or unsupported input."""
+        return self.lookup_many([word], max_results)[0]
+
+    def lookup_many(self, words, max_results=5):
+        """Responses for words, in input order (None where lookup() gives None)."""
+        queries = [word.strip() for word in words]
+        known = [query for query in dict.fromkeys(queries) if detect_language(query) != 'unknown']
+        responses = resolve(_ArtifactBatch(self.sections, max_results), known)
+        return [responses.get(query) for query in queries]
+
+    def close(self):
+        for section in getattr(self, 'sections', {}).values():
+            section.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def serve_jsonl(artifact, lines, out, max_results=5):
+    """Answer each of lines with one compact JSON line on out, flushed at
+    once (serveJSONL in cmd/dict): the response, or {"query", "error"}."""
+    for line in lines:
+        query = line.strip()
+        if not query:
+            response = {'query': query, 'error': 'empty query'}
+        else:
+            response = artifact.lookup(query, max_results)
+            if response is None:
+                response = {'query': query, 'error': f'unsupported language: {detect_language(query)}'}
+        out.write(json.dumps(response, ensure_ascii=False, separators=(',', ':')) + '\n')
+        out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query a memory-mapped lookup artifact')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='Pack a database into an artifact')
+    build.add_argument('db', type=Path, help='Source database')
+    build.add_argument('output', type=Path, help='Artifact to write')
+    lookup = commands.add_parser('lookup', help='Look up a word, printed like dict --json')
+    lookup.add_argument('artifact', type=Path, help='Artifact to read')
+    lookup.add_argument('word', help='Word to look up')
+    serve = commands.add_parser('serve', help='Answer one word per stdin line with one JSON line, like dict --jsonl')
+    serve.add_argument('artifact', type=Path, help='Artifact to read')
+    for command in (lookup, serve):
+        command.add_argument('-n', '--max-results', type=int, default=5,
+                             help='Results per language (default: 5, 0 = unlimited)')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        size = build_artifact(args.db, args.output)
+        print(f"✓ Wrote {args.output} ({size / (1024 * 1024):.1f} MB) in {time.perf_counter() - start:.1f}s")
+        return 0
+
+    if args.command == 'serve':
+        with Artifact(args.artifact) as artifact:
+            serve_jsonl(artifact, sys.stdin, sys.stdout, args.max_results)
+        return 0
+
+    with Artifact(args.artifact) as artifact:
+        response = artifact.lookup(args.word, args.max_results)
+    if response is None:
+        print(f"Error: unsupported language: {detect_language(args.word.strip())}")
+        return 1
+    print(json.dumps(response, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Bulk translation of word lists, e.g. for flashcard export.
+
+    python3 -m tridict.bulk vocabulary.txt --format csv > cards.csv
+    python3 -m tridict.bulk vocabulary.txt --compare > /dev/null
+
+Reads one word per line (from a file or stdin) and streams one result per
+word, in input order, as the words are resolved:
+
+- ndjson: one `dict --json` response per line; unsupported input gives
+  {"query": ..., "error": ...} like `dict --jsonl`
+- csv:    one row per result (query, input_language, language, headword,
+          reading, definition, rank); a word with no results gets a row
+          with only query and input_language
+
+Words are resolved with Dictionary.lookup_bulk: a few thousand at a time,
+each step of the triangulation as a join against a temp table of their
+keys. The throughput goes to stderr. --compare also times
+Dictionary.lookup on each word, uncached, and reports the speedup.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+from .lookup import BULK_CHUNK, Dictionary
+from .text import detect_language
+
+DATABASE = Path(__file__).parent.parent / 'data/dictionary.db'
+
+CSV_FIELDS = ('query', 'input_language', 'language', 'headword', 'reading', 'definition', 'rank')
+
+
+def read_words(stream):
+    """Non-blank lines of stream, stripped."""
+    return [line.strip() for line in stream if line.strip()]
+
+
+def write_ndjson(out, word, response):
+    if response is None:
+        response = {'query': word, 'error': f'unsupported language: {detect_language(word)}'}
+    out.write(json.dumps(response, ensure_ascii=False) + '\n')
+
+
+def csv_rows(word, response):
+    if response is None:
+        return [{'query': word, 'input_language': detect_language(word)}]
+    base = {'query': word, 'input_language': response['meta']['input_language']}
+    if not response['outputs']:
+        return [base]
+    return [dict(base, **{field: output.get(field, '') for field in CSV_FIELDS[2:]})
+            for output in response['outputs']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Translate a word list in bulk')
+    parser.add_argument('input', nargs='?', type=argparse.FileType('r', encoding='utf-8'), default=sys.stdin,
+                        help='Word list, one per line (default: stdin)')
+    parser.add_argument('--db', type=Path, default=DATABASE, help=f'Database (default: {DATABASE})')
+    parser.add_argument('-n', '--max-results', type=int, default=5,
+                        help='Results per language (default: 5, 0 = unlimited)')
+    parser.add_argument('--format', choices=('ndjson', 'csv'), default='ndjson',
+                        help='Output format (default: ndjson)')
+    parser.add_argument('--chunk-size', type=int, default=BULK_CHUNK,
+                        help=f'Words resolved per round (default: {BULK_CHUNK})')
+    parser.add_argument('--compare', action='store_true',
+                        help='Also time one lookup per word and report the speedup')
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Error: Database not found: {args.db}", file=sys.stderr)
+        return 1
+
+    words = read_words(args.input)
+    dictionary = Dictionary(args.db, pool_size=1, cache_size=0)
+    try:
+        writer = None
+        if args.format == 'csv':
+            writer = csv.DictWriter(sys.stdout, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+
+        start = time.perf_counter()
+        for word, response in zip(words, dictionary.lookup_bulk(words, args.max_results, args.chunk_size)):
+            if writer:
+                writer.writerows(csv_rows(word, response))
+            else:
+                write_ndjson(sys.stdout, word, response)
+        sys.stdout.flush()
+        elapsed = time.perf_counter() - start
+        print(f"Bulk: {len(words)} words in {elapsed:.2f}s "
+              f"({len(words) / max(elapsed, 1e-9):,.0f} words/sec)", file=sys.stderr)
+
+        if args.compare:
+            start = time.perf_counter()
+            for word in words:
+                dictionary.lookup(word, args.max_results)
+            single = time.perf_counter() - start
+            print(f"One at a time: {len(words)} words in {single:.2f}s "
+                  f"({len(words) / max(single, 1e-9):,.0f} words/sec), "
+                  f"bulk is {single / max(elapsed, 1e-9):.1f}x faster", file=sys.stderr)
+    finally:
+        dictionary.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
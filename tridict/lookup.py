@@ -0,0 +1,381 @@
+"""Triangulation lookup over dictionary.db, mirroring core/query/triangulate.go.
+
+Each input takes the same path as query.Query:
+
+- en:        gloss match in both languages; if nothing matches, romaji
+             (unless the input has tones) and then pinyin
+- ja:        any spelling (japanese_forms, hiragana-folded, script-folded),
+             else conjugated form (japanese_inflections); then the top
+             result's first gloss finds the Chinese side
+- ambiguous: Japanese spelling first, else Chinese script_key; then the
+             English pivot to the other language
+
+The steps are resolve() in resolve.py; _Batch answers them with SQL.
+lookup_many() resolves a whole batch together: every step runs as one
+query joined against the keys of all inputs that reached it, instead
+of one query per input, and definitions, examples and details are loaded
+once for every word in the batch. Responses have the shape of the Go JSON
+output (types.Response).
+"""
+
+import itertools
+import threading
+from collections import defaultdict
+
+from .cache import LRUCache
+from .pool import ConnectionPool
+from .resolve import ASCII_LOWER, gloss_heads, resolve, top
+from .text import detect_language, to_hiragana
+
+# Keys per VALUES list, well under SQLite's host parameter limit
+BATCH_SIZE = 500
+
+# Distinct English terms from which by_english() makes one pass over
+# glosses instead of one LIKE scan per term
+GLOSS_SCAN_MIN = 20
+
+# Words per lookup_bulk() round
+BULK_CHUNK = 5000
+
+# Examples shown per result, as in GetExamples
+EXAMPLES_PER_WORD = 5
+
+JAPANESE_FIELDS = ('id', 'headword', 'reading', 'is_common', 'frequency_rank',
+                   'rank_score', 'jlpt_level', 'stroke_count')
+CHINESE_FIELDS = ('id', 'simplified', 'traditional', 'pinyin', 'pinyin_marked', 'is_common',
+                  'frequency_rank', 'rank_score', 'hsk_level', 'stroke_count')
+FIELDS = {'ja': JAPANESE_FIELDS, 'zh': CHINESE_FIELDS}
+TABLES = {'ja': 'japanese', 'zh': 'chinese'}
+
+# Word-boundary gloss match of QueryJapaneseByEnglish / QueryChineseByEnglish:
+# "cat" matches "cat", "cat (animal)", "cat; feline" but not "wildcat".
+# match orders exact < parenthesized < first of a list < elsewhere in a list
+GLOSS_MATCH = '''
+    LOWER(g.text) = LOWER(t.term)
+    OR LOWER(g.text) LIKE LOWER(t.term) || ' (%'
+    OR LOWER(g.text) LIKE LOWER(t.term) || ';%'
+    OR LOWER(g.text) LIKE '%;' || LOWER(t.term)
+    OR LOWER(g.text) LIKE '%; ' || LOWER(t.term) || ';%'
+'''
+GLOSS_MATCH_CLASS = '''
+    CASE
+      WHEN LOWER(g.text) = LOWER(t.term) THEN 0
+      WHEN LOWER(g.text) LIKE LOWER(t.term) || ' (%' THEN 1
+      WHEN LOWER(g.text) LIKE LOWER(t.term) || ';%' THEN 2
+      ELSE 3
+    END
+'''
+
+
+def _columns(lang):
+    return ', '.join(f'w.{field}' for field in FIELDS[lang])
+
+
+class _Batch:
+    """One lookup_many() call on one connection.
+
+    Words are kept once per (language, id), so a word reached by several
+    inputs has its definitions and examples loaded once.
+
+    Each step's keys reach SQL as a VALUES list of BATCH_SIZE parameters
+    at a time, or with temp_keys as one temp table holding all of them
+    (see Dictionary.lookup_bulk).
+    """
+
+    def __init__(self, conn, variants, max_results, temp_keys=False):
+        self.conn = conn
+        self.variants = variants
+        self.limit = max_results
+        self.temp_keys = temp_keys
+        self.words = {'ja': {}, 'zh': {}}
+        self.gloss_matches = {}
+        if temp_keys:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS batch_keys (key PRIMARY KEY) WITHOUT ROWID')
+
+    def _key_sets(self, keys):
+        """Yield (subquery, params) selecting the distinct keys, in as many
+        parts as the SQL parameter limit needs."""
+        keys = sorted(set(keys), key=str)
+        if not keys:
+            return
+        if self.temp_keys:
+            self.conn.execute('DELETE FROM temp.batch_keys')
+            self.conn.executemany('INSERT INTO temp.batch_keys (key) VALUES (?)', ((key,) for key in keys))
+            yield 'SELECT key FROM temp.batch_keys', []
+            return
+        for start in range(0, len(keys), BATCH_SIZE):
+            part = keys[start:start + BATCH_SIZE]
+            yield 'VALUES ' + ', '.join(['(?)'] * len(part)), part
+
+    def _word(self, lang, row):
+        registry = self.words[lang]
+        word = registry.get(row['id'])
+        if word is None:
+            word = registry[row['id']] = {field: row[field] for field in FIELDS[lang]}
+        return word
+
+    def _probe(self, lang, sql, keys):
+        """{probe: [word]} for sql selecting `probe` and the word columns,
+        with {keys} standing for the key subquery."""
+        found = defaultdict(list)
+        for subquery, params in self._key_sets(keys):
+            for row in self.conn.execute(sql.format(keys=subquery), params):
+                found[row['probe']].append(self._word(lang, row))
+        return found
+
+    def _top(self, words, order):
+        return top(words, order, self.limit)
+
+    def script_key(self, text):
+        return ''.join(self.variants.get(char, char) for char in text)
+
+    def japanese(self, forms):
+        """QueryJapanese: any spelling, hiragana- or script-folded."""
+        by_form = self._probe('ja', f'''
+            SELECT f.form AS probe, {_columns('ja')}
+            FROM japanese_forms f JOIN japanese_words w ON w.id = f.word_id
+            WHERE f.form IN ({{keys}})
+        ''', [key for form in forms for key in (form, to_hiragana(form))])
+        by_script = self._probe('ja', f'''
+            SELECT w.script_key AS probe, {_columns('ja')}
+            FROM japanese_words w WHERE w.script_key IN ({{keys}})
+        ''', [self.script_key(form) for form in forms])
+        return {form: self._top(
+            by_form[form] + by_form[to_hiragana(form)] + by_script[self.script_key(form)],
+            lambda word: (word['headword'] != form, -word['rank_score']),
+        ) for form in forms}
+
+    def japanese_by_inflection(self, surfaces):
+        """QueryJapaneseByInflection: conjugated forms to dictionary form."""
+        found = self._probe('ja', f'''
+            SELECT i.surface AS probe, {_columns('ja')}
+            FROM japanese_inflections i JOIN japanese_words w ON w.id = i.word_id
+            WHERE i.surface IN ({{keys}})
+        ''', [key for surface in surfaces for key in (surface, to_hiragana(surface))])
+        return {surface: self._top(found[surface] + found[to_hiragana(surface)],
+                                   lambda word: -word['rank_score'])
+                for surface in surfaces}
+
+    def japanese_by_romaji(self, keys):
+        found = self._probe('ja', f'''
+            SELECT w.reading_romaji AS probe, {_columns('ja')}
+            FROM japanese_words w WHERE w.reading_romaji IN ({{keys}})
+        ''', keys)
+        return {key: self._top(found[key], lambda word: -word['rank_score']) for key in keys}
+
+    def chinese(self, texts):
+        """QueryChinese: any script via script_key, exact spelling first."""
+        found = self._probe('zh', f'''
+            SELECT w.script_key AS probe, {_columns('zh')}
+            FROM chinese_words w WHERE w.script_key IN ({{keys}})
+        ''', [self.script_key(text) for text in texts])
+        return {text: self._top(
+            found[self.script_key(text)],
+            lambda word: (text not in (word['simplified'], word['traditional']), -word['rank_score']),
+        ) for text in texts}
+
+    def chinese_by_pinyin(self, keys):
+        found = self._probe('zh', f'''
+            SELECT w.pinyin_key AS probe, {_columns('zh')}
+            FROM chinese_words w WHERE w.pinyin_key IN ({{keys}})
+        ''', keys)
+        return {key: self._top(found[key], lambda word: -word['rank_score']) for key in keys}
+
+    def _gloss_matches(self, terms):
+        """{term: {gloss_id: match}} from one pass over glosses (see gloss_heads)."""
+        missing = {term.translate(ASCII_LOWER) for term in terms} - self.gloss_matches.keys()
+        if missing:
+            for lowered in missing:
+                self.gloss_matches[lowered] = {}
+            for gloss_id, text in self.conn.execute('SELECT id, text FROM glosses'):
+                for head, match in gloss_heads(text.translate(ASCII_LOWER)):
+                    if head in missing:
+                        matches = self.gloss_matches[head]
+                        matches[gloss_id] = min(match, matches.get(gloss_id, match))
+        return {term: self.gloss_matches[term.translate(ASCII_LOWER)] for term in terms}
+
+    def by_english(self, lang, terms):
+        """Query*ByEnglish for every term.
+
+        A few terms are joined against glosses with the LIKE patterns, which
+        scans glosses once per term; from GLOSS_SCAN_MIN terms up, glosses
+        are matched in one pass and their words fetched by gloss_id.
+        """
+        table = TABLES[lang]
+        terms = set(terms)
+        found = defaultdict(list)
+        match = {}
+
+        scanned = set()
+        if len(terms) >= GLOSS_SCAN_MIN:
+            scanned = {term for term in terms if '%' not in term and '_' not in term}
+        if scanned:
+            glosses = self._gloss_matches(scanned)
+            by_gloss = self._probe(lang, f'''
+                SELECT d.gloss_id AS probe, {_columns(lang)}
+                FROM {table}_definitions d JOIN {table}_words w ON w.id = d.word_id
+                WHERE d.gloss_id IN ({{keys}})
+            ''', {gloss_id for matches in glosses.values() for gloss_id in matches})
+            for term in scanned:
+                for gloss_id, gloss_match in glosses[term].items():
+                    for word in by_gloss[gloss_id]:
+                        key = (term, word['id'])
+                        if key not in match:
+                            found[term].append(word)
+                        match[key] = min(gloss_match, match.get(key, gloss_match))
+
+        for subquery, params in self._key_sets(terms - scanned):
+            rows = self.conn.execute(f'''
+                WITH t(term) AS ({subquery})
+                SELECT t.term AS probe, MIN({GLOSS_MATCH_CLASS}) AS match, {_columns(lang)}
+                FROM t
+                JOIN glosses g ON {GLOSS_MATCH}
+                JOIN {table}_definitions d ON d.gloss_id = g.id
+                JOIN {table}_words w ON w.id = d.word_id
+                GROUP BY t.term, w.id
+            ''', params)
+            for row in rows:
+                found[row['probe']].append(self._word(lang, row))
+                match[row['probe'], row['id']] = row['match']
+        return {term: self._top(found[term],
+                                lambda word: (-word['rank_score'], match[term, word['id']]))
+                for term in terms}
+
+    def load(self, lang, words):
+        """Fill definitions, examples and details of words not loaded yet."""
+        pending = {word['id']: word for word in words if 'definitions' not in word}
+        if not pending:
+            return
+        table = TABLES[lang]
+        for word in pending.values():
+            word['definitions'] = []
+            word['examples'] = []
+            word['details'] = {}
+
+        detail_columns = ('components, stroke_svg' if lang == 'ja'
+                          else 'components, decomposition, stroke_svg')
+        for keys, params in self._key_sets(pending):
+            for word_id, text in self.conn.execute(f'''
+                SELECT d.word_id, g.text
+                FROM {table}_definitions d JOIN glosses g ON g.id = d.gloss_id
+                WHERE d.word_id IN ({keys})
+                ORDER BY d.id
+            ''', params):
+                pending[word_id]['definitions'].append(text)
+
+            for word_id, text, english in self.conn.execute(f'''
+                SELECT word_id, text, english FROM (
+                    SELECT l.word_id, s.text, COALESCE(s.english, '') AS english,
+                           ROW_NUMBER() OVER (PARTITION BY l.word_id ORDER BY l.score DESC) AS n
+                    FROM example_links l JOIN sentences s ON s.id = l.sentence_id
+                    WHERE l.lang = ? AND l.word_id IN ({keys})
+                )
+                WHERE n <= ?
+                ORDER BY word_id, n
+            ''', [lang, *params, EXAMPLES_PER_WORD]):
+                pending[word_id]['examples'].append({'source_text': text, 'english_text': english})
+
+            for row in self.conn.execute(f'''
+                SELECT word_id, {detail_columns}
+                FROM {table}_word_details WHERE word_id IN ({keys})
+            ''', params):
+                pending[row['word_id']]['details'] = dict(row)
+
+
+class Dictionary:
+    """Triangulation lookups on a dictionary.db, safe to share between threads.
+
+        dictionary = Dictionary('data/dictionary.db')
+        response = dictionary.lookup('cat')
+        responses = dictionary.lookup_many(['cat', '猫', 'māo'])
+
+    Responses are cached per (query, max_results) in an LRU of cache_size
+    entries and shared between callers, so treat them as read-only.
+    """
+
+    def __init__(self, db_path, pool_size=4, cache_size=1024):
+        self.pool = ConnectionPool(db_path, pool_size)
+        self.cache = LRUCache(cache_size)
+        self._variants = None
+        self._variants_lock = threading.Lock()
+
+    def _load_variants(self, conn):
+        """char_variants as {char: canonical}, read once (the database is read-only)."""
+        with self._variants_lock:
+            if self._variants is None:
+                self._variants = dict(conn.execute('SELECT char, canonical FROM char_variants').fetchall())
+            return self._variants
+
+    def lookup(self, word, max_results=5):
+        """Response for word, or None for empty or unsupported input."""
+        return self.lookup_many([word], max_results)[0]
+
+    def lookup_many(self, words, max_results=5):
+        """Responses for words, in input order (None where lookup() gives None).
+
+        Cached inputs are answered from the cache; the rest are resolved
+        together on one connection.
+        """
+        queries = [word.strip() for word in words]
+        responses = {}
+        missing = []
+        for query in dict.fromkeys(queries):
+            if detect_language(query) == 'unknown':
+                responses[query] = None
+                continue
+            cached = self.cache.get((query, max_results))
+            if cached is None:
+                missing.append(query)
+            else:
+                responses[query] = cached
+
+        if missing:
+            with self.pool.connection() as conn:
+                batch = _Batch(conn, self._load_variants(conn), max_results)
+                resolved = resolve(batch, missing)
+            for query, response in resolved.items():
+                self.cache.put((query, max_results), response)
+            responses.update(resolved)
+
+        return [responses[query] for query in queries]
+
+    def lookup_bulk(self, words, max_results=5, chunk_size=BULK_CHUNK):
+        """Yield the response (or None) for each of words, in order.
+
+        For long lists such as vocabulary exports: words are resolved
+        chunk_size at a time, each step as a join against a temp table of
+        the chunk's keys. The cache is bypassed, so a big list doesn't
+        evict hot entries. One pooled connection is held until the
+        generator is exhausted or closed.
+        """
+        words = iter(words)
+        with self.pool.connection() as conn:
+            variants = self._load_variants(conn)
+            while True:
+                chunk = [word.strip() for word in itertools.islice(words, chunk_size)]
+                if not chunk:
+                    return
+                queries = [query for query in dict.fromkeys(chunk) if detect_language(query) != 'unknown']
+                batch = _Batch(conn, variants, max_results, temp_keys=True)
+                try:
+                    resolved = resolve(batch, queries)
+                finally:
+                    # Filling temp.batch_keys opened a transaction, which
+                    # would hold the read lock while the caller consumes
+                    # the chunk; the keys are refilled next chunk anyway
+                    conn.rollback()
+                for query in chunk:
+                    yield resolved.get(query)
+
+    def cache_info(self):
+        """Cache {hits, misses, size, maxsize}."""
+        return self.cache.info()
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,58 @@
+"""Thread-safe pool of read-only SQLite connections."""
+
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class ConnectionPool:
+    """size read-only connections to db_path, shared between threads.
+
+    Connections are opened lazily, up to size, and each is used by one
+    thread at a time:
+
+        with pool.connection() as conn:
+            conn.execute(...)
+    """
+
+    def __init__(self, db_path, size=4):
+        path = Path(db_path)
+        if not path.exists():
+            raise FileNotFoundError(f"Database not found: {path}")
+        self.uri = f'file:{path.resolve()}?mode=ro'
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+        self._all = []
+
+    def _open(self):
+        conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        self._all.append(conn)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, blocking while all size are in use."""
+        self._slots.get()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                conn = self._open()
+            except sqlite3.Error:
+                self._slots.put(None)
+                raise
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+            self._slots.put(None)
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+        self._all.clear()
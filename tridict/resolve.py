@@ -0,0 +1,181 @@
+"""The steps of a lookup, on any source of words.
+
+resolve() runs the triangulation of core/query/triangulate.go over a
+batch object that answers its queries: _Batch (lookup.py) from SQL,
+_ArtifactBatch (artifact.py) from a mapped artifact. Nothing here touches
+SQLite, so artifact lookups load without it.
+"""
+
+import string
+from collections import defaultdict
+
+from .text import detect_language, has_tones, pinyin_key, romaji_key
+
+# SQLite's LOWER() and LIKE fold ASCII letters only
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Columns a word is spelled in, for putting exact spellings first
+SPELLING_FIELDS = {'ja': ('headword',), 'zh': ('simplified', 'traditional')}
+
+
+def gloss_heads(text):
+    """Yield (term, match) for every term GLOSS_MATCH (lookup.py) finds text under.
+
+    text must be ASCII-lowercased; a term may come more than once, and its
+    GLOSS_MATCH_CLASS is the smallest match. Only valid for terms without
+    LIKE wildcards (% and _).
+    """
+    yield text, 0
+    i = text.find(' (')
+    while i != -1:
+        yield text[:i], 1
+        i = text.find(' (', i + 1)
+    semicolons = [i for i, char in enumerate(text) if char == ';']
+    for i in semicolons:
+        yield text[:i], 2
+        yield text[i + 1:], 3
+        if text[i + 1:i + 2] == ' ':
+            for j in semicolons:
+                if j > i + 1:
+                    yield text[i + 2:j], 3
+
+
+def top(words, order, limit):
+    """Distinct words sorted by order, then id as the Go queries break ties,
+    cut to limit (0 = no limit) as by SQL LIMIT."""
+    unique = list({word['id']: word for word in words}.values())
+    unique.sort(key=lambda word: (order(word), word['id']))
+    return unique[:limit] if limit > 0 else unique
+
+
+def japanese_output(word):
+    """LanguageOutput for a Japanese word (japaneseToOutput)."""
+    meta = {}
+    if word['jlpt_level'] is not None:
+        meta['jlpt_level'] = f"N{word['jlpt_level']}"
+    if word['stroke_count']:
+        meta['stroke_count'] = word['stroke_count']
+    for field in ('components', 'stroke_svg'):
+        if word['details'].get(field):
+            meta[field] = word['details'][field]
+    return _output('ja', word['headword'], word['reading'], word, 'ja-JP', meta)
+
+
+def chinese_output(word):
+    """LanguageOutput for a Chinese word (chineseToOutput).
+
+    Rows without pinyin_marked (built before ingest stored it) show the
+    numbered pinyin as is.
+    """
+    meta = {}
+    if word['traditional']:
+        meta['traditional'] = word['traditional']
+    if word['hsk_level'] is not None:
+        meta['hsk_level'] = str(word['hsk_level'])
+    if word['stroke_count']:
+        meta['stroke_count'] = word['stroke_count']
+    for field in ('components', 'decomposition', 'stroke_svg'):
+        if word['details'].get(field):
+            meta[field] = word['details'][field]
+    reading = word['pinyin_marked'] or word['pinyin']
+    return _output('zh', word['simplified'], reading, word, 'zh-CN', meta)
+
+
+def _output(lang, headword, reading, word, locale, meta):
+    output = {'language': lang, 'headword': headword}
+    if reading:
+        output['reading'] = reading
+    output['definition'] = '; '.join(word['definitions'])
+    if word['frequency_rank']:
+        output['rank'] = word['frequency_rank']
+    output['audio'] = {'type': 'tts', 'text': headword, 'locale': locale}
+    output['meta'] = meta
+    if word['examples']:
+        output['examples'] = word['examples']
+    return output
+
+
+def resolve(batch, queries):
+    """{query: response} for queries, each step batched across them."""
+    languages = {query: detect_language(query) for query in queries}
+    by_lang = defaultdict(list)
+    for query, lang in languages.items():
+        by_lang[lang].append(query)
+
+    # Results per query: (language, ranked words) groups in output order,
+    # and the group whose top word's first gloss finds the other language
+    groups = defaultdict(list)
+    pivots = {}
+
+    def found(query, lang, words, pivot, spelling=None):
+        # Best stored rank_score first (data/ranker.py), as RankJapanese /
+        # RankChinese order them, then words spelled exactly spelling ahead
+        # of script-folded ones (ExactJapaneseFirst / ExactChineseFirst)
+        words = sorted(words, key=lambda word: -word['rank_score'])
+        if batch.limit > 0:
+            words = words[:batch.limit]
+        if spelling is not None:
+            spellings = SPELLING_FIELDS[lang]
+            words.sort(key=lambda word: all(word[field] != spelling for field in spellings))
+        if words:
+            groups[query].append((lang, words))
+            if pivot:
+                pivots[query] = lang
+        return bool(words)
+
+    english = by_lang['en']
+    japanese_en = batch.by_english('ja', english)
+    chinese_en = batch.by_english('zh', english)
+    romanized = []
+    for query in english:
+        matched = found(query, 'ja', japanese_en[query], False)
+        matched = found(query, 'zh', chinese_en[query], False) or matched
+        if not matched:
+            romanized.append(query)
+
+    # Romaji first unless tones make it pinyin; then pinyin
+    romaji = {query: romaji_key(query) for query in romanized if not has_tones(query)}
+    japanese_romaji = batch.japanese_by_romaji([key for key in romaji.values() if key])
+    pinyin = []
+    for query in romanized:
+        if not (romaji.get(query) and found(query, 'ja', japanese_romaji[romaji[query]], True)):
+            pinyin.append(query)
+    pinyin_keys = {query: pinyin_key(query) for query in pinyin}
+    chinese_pinyin = batch.chinese_by_pinyin([key for key in pinyin_keys.values() if key])
+    for query, key in pinyin_keys.items():
+        if key:
+            found(query, 'zh', chinese_pinyin[key], True)
+
+    # Kana and Han input: Japanese spelling, then inflection or Chinese
+    direct = batch.japanese(by_lang['ja'] + by_lang['ambiguous'])
+    inflected = [query for query in by_lang['ja'] if not found(query, 'ja', direct[query], True, query)]
+    for query, words in batch.japanese_by_inflection(inflected).items():
+        found(query, 'ja', words, True, query)
+    chinese = [query for query in by_lang['ambiguous'] if not found(query, 'ja', direct[query], True, query)]
+    for query, words in batch.chinese(chinese).items():
+        found(query, 'zh', words, True, query)
+
+    for lang in ('ja', 'zh'):
+        batch.load(lang, [word for query_groups in groups.values()
+                          for group_lang, words in query_groups if group_lang == lang
+                          for word in words])
+
+    # English pivot from the top word's first gloss
+    glosses = {}
+    for query, lang in pivots.items():
+        definitions = dict(groups[query])[lang][0]['definitions']
+        if definitions:
+            glosses[query] = ('zh' if lang == 'ja' else 'ja', definitions[0])
+    for target in ('ja', 'zh'):
+        terms = {gloss for lang, gloss in glosses.values() if lang == target}
+        pivoted = batch.by_english(target, terms)
+        for query, (lang, gloss) in glosses.items():
+            if lang == target:
+                found(query, target, pivoted[gloss], False)
+        batch.load(target, [word for words in pivoted.values() for word in words])
+
+    outputs = {'ja': japanese_output, 'zh': chinese_output}
+    return {query: {
+        'meta': {'input_language': languages[query], 'query': query},
+        'outputs': [outputs[lang](word) for lang, words in groups[query] for word in words],
+    } for query in queries}
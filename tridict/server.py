@@ -0,0 +1,418 @@
+"""Asyncio HTTP lookup service over a Dictionary.
+
+    python3 -m tridict.server --db data/dictionary.db --port 8080
+
+One process serves many clients without forking per request. SQLite work
+runs on a bounded thread pool, one pooled connection per worker.
+Identical lookups already in flight are coalesced: a burst of "cat"
+requests runs one query and every waiter gets its result.
+
+Endpoints (JSON in and out):
+
+- GET  /lookup?q=cat&n=5   one response, as `dict --json cat -n 5`
+- POST /batch              {"queries": ["cat", "猫"], "n": 5}
+                           → {"results": [response or null, ...]}
+- GET  /metrics            request rate, latency histograms, cache hit
+                           rate, coalesced lookups, reloads
+- GET  /health
+
+Hot reload: the database file is checked every --reload-interval seconds
+(and on SIGHUP). When a new dictionary.db has been swapped in, e.g. with
+`mv new.db dictionary.db`, it is opened and probed, and then new requests
+go to it. Requests already running finish on the old one, which is closed
+once they have. If the new file fails the probe, the old one stays in
+service.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from .lookup import Dictionary
+
+DATABASE = Path(__file__).parent.parent / 'data/dictionary.db'
+
+# Upper bounds of the latency histogram buckets, in ms (plus +Inf)
+LATENCY_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Seconds of history behind the reported request rate
+RATE_WINDOW = 60
+
+ENDPOINTS = ('/lookup', '/batch', '/metrics', '/health')
+
+MAX_BODY = 1 << 20
+MAX_BATCH = 1000
+MAX_RESULTS = 50
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Metrics:
+    """Request counts, latency histograms and recent rate per endpoint."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.endpoints = {}
+        self.recent = deque()  # (second, count), newest last
+        self.coalesced = 0
+        self.reloads = 0
+        self.failed_reloads = 0
+
+    def record(self, endpoint, seconds, status):
+        stats = self.endpoints.setdefault(endpoint, {
+            'requests': 0, 'errors': 0, 'total_ms': 0.0,
+            'buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+        })
+        ms = seconds * 1000
+        stats['requests'] += 1
+        stats['errors'] += status >= 400
+        stats['total_ms'] += ms
+        stats['buckets'][next((i for i, bound in enumerate(LATENCY_BUCKETS) if ms <= bound),
+                              len(LATENCY_BUCKETS))] += 1
+
+        second = int(time.monotonic())
+        if self.recent and self.recent[-1][0] == second:
+            self.recent[-1] = (second, self.recent[-1][1] + 1)
+        else:
+            self.recent.append((second, 1))
+        while self.recent[0][0] <= second - RATE_WINDOW:
+            self.recent.popleft()
+
+    def snapshot(self, cache):
+        now = time.monotonic()
+        window = min(RATE_WINDOW, max(now - self.started, 1))
+        recent = sum(count for second, count in self.recent if second > now - RATE_WINDOW)
+        lookups = cache['hits'] + cache['misses']
+        endpoints = {}
+        for endpoint, stats in self.endpoints.items():
+            cumulative, histogram = 0, {}
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), stats['buckets']):
+                cumulative += count
+                histogram[f'le_{bound}'] = cumulative
+            endpoints[endpoint] = {
+                'requests': stats['requests'],
+                'errors': stats['errors'],
+                'mean_ms': round(stats['total_ms'] / stats['requests'], 3),
+                'latency_ms': histogram,
+            }
+        return {
+            'uptime_s': round(now - self.started, 1),
+            'qps': round(recent / window, 2),
+            'endpoints': endpoints,
+            'cache': dict(cache, hit_rate=round(cache['hits'] / lookups, 4) if lookups else 0.0),
+            'coalesced': self.coalesced,
+            'reloads': self.reloads,
+            'failed_reloads': self.failed_reloads,
+        }
+
+
+class Generation:
+    """One opened database file and the requests running on it."""
+
+    # Unlike id(), never reused once an old generation is freed
+    _numbers = itertools.count(1)
+
+    def __init__(self, dictionary, signature):
+        self.dictionary = dictionary
+        self.signature = signature
+        self.number = next(Generation._numbers)
+        self.active = 0
+        self.retired = False
+
+    def acquire(self):
+        self.active += 1
+        return self.dictionary
+
+    def release(self):
+        self.active -= 1
+        if self.retired and self.active == 0:
+            self.dictionary.close()
+
+    def retire(self):
+        self.retired = True
+        if self.active == 0:
+            self.dictionary.close()
+
+
+def file_signature(path):
+    """(inode, size, mtime) of path, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def open_generation(db_path, workers, cache_size):
+    """Open db_path and probe it; raises if it is not a usable dictionary."""
+    signature = file_signature(db_path)
+    dictionary = Dictionary(db_path, pool_size=workers, cache_size=cache_size)
+    try:
+        with dictionary.pool.connection() as conn:
+            conn.execute('SELECT 1 FROM japanese_words LIMIT 1').fetchall()
+            conn.execute('SELECT 1 FROM chinese_words LIMIT 1').fetchall()
+    except sqlite3.Error:
+        dictionary.close()
+        raise
+    return Generation(dictionary, signature)
+
+
+class LookupService:
+    def __init__(self, db_path, workers=4, cache_size=10000):
+        self.db_path = Path(db_path)
+        self.workers = workers
+        self.cache_size = cache_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tridict')
+        self.generation = open_generation(self.db_path, workers, cache_size)
+        self.metrics = Metrics()
+        self.inflight = {}
+        self.reload_lock = asyncio.Lock()
+
+    async def _run(self, function, *args):
+        generation = self.generation
+        dictionary = generation.acquire()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, function, dictionary, *args)
+        finally:
+            generation.release()
+
+    async def lookup(self, query, max_results):
+        key = (self.generation.number, query.strip(), max_results)
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(Dictionary.lookup, query, max_results))
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._landed(key, done))
+        else:
+            self.metrics.coalesced += 1
+        # Every waiter, the first included, awaits through its own shield:
+        # a cancelled request (client gone) stops waiting, but the lookup
+        # keeps running for the others
+        return await asyncio.shield(task)
+
+    def _landed(self, key, task):
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a burst whose waiters all left logs nothing
+            task.exception()
+
+    async def batch(self, queries, max_results):
+        return await self._run(Dictionary.lookup_many, queries, max_results)
+
+    async def reload(self):
+        """Swap in the database file if it changed; True if it was swapped."""
+        async with self.reload_lock:
+            signature = file_signature(self.db_path)
+            if signature is None or signature == self.generation.signature:
+                return False
+            try:
+                generation = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, open_generation, self.db_path, self.workers, self.cache_size)
+            except (OSError, sqlite3.Error) as error:
+                self.metrics.failed_reloads += 1
+                # Don't retry the same broken file until it changes again
+                self.generation.signature = signature
+                print(f"Reload of {self.db_path} failed, keeping the old database: {error}", flush=True)
+                return False
+            old, self.generation = self.generation, generation
+            old.retire()
+            self.metrics.reloads += 1
+            print(f"Reloaded {self.db_path}", flush=True)
+            return True
+
+    async def watch(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            await self.reload()
+
+    def close(self):
+        self.generation.retire()
+        self.executor.shutdown(wait=True)
+
+    async def route(self, method, target, body):
+        """(status, payload) for one request."""
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+
+        if url.path == '/lookup':
+            if method != 'GET':
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, 'use GET')
+            query = params.get('q', [''])[0]
+            max_results = parse_max_results(params.get('n', [5])[0])
+            response = await self.lookup(query, max_results)
+            if response is None:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f'unsupported query: {query!r}')
+            return HTTPStatus.OK, response
+
+        if url.path == '/batch':
+            if method != 'POST':
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, 'use POST')
+            try:
+                request = json.loads(body)
+                queries = request['queries']
+                max_results = parse_max_results(request.get('n', 5))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'expected {"queries": [...], "n": 5}')
+            if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'queries must be a list of strings')
+            if len(queries) > MAX_BATCH:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f'at most {MAX_BATCH} queries')
+            return HTTPStatus.OK, {'results': await self.batch(queries, max_results)}
+
+        if url.path == '/metrics':
+            return HTTPStatus.OK, self.metrics.snapshot(self.generation.dictionary.cache_info())
+
+        if url.path == '/health':
+            return HTTPStatus.OK, {'status': 'ok', 'db': str(self.db_path)}
+
+        raise HTTPError(HTTPStatus.NOT_FOUND, f'no such endpoint: {url.path}')
+
+    async def handle(self, reader, writer):
+        """Serve one connection, keeping it alive between requests."""
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as error:
+                    await write_response(writer, error.status, {'error': str(error)}, False)
+                    return
+                if request is None:
+                    return
+                method, target, headers, body = request
+
+                start = time.perf_counter()
+                try:
+                    status, payload = await self.route(method, target, body)
+                except HTTPError as error:
+                    status, payload = error.status, {'error': str(error)}
+                except Exception as error:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)}
+                path = urlsplit(target).path
+                self.metrics.record(path if path in ENDPOINTS else 'other',
+                                    time.perf_counter() - start, status)
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def parse_max_results(value):
+    try:
+        max_results = int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'n must be an integer')
+    if not 1 <= max_results <= MAX_RESULTS:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f'n must be between 1 and {MAX_RESULTS}')
+    return max_results
+
+
+async def read_request(reader):
+    """(method, target, headers, body) of the next request, or None at EOF."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'malformed request line')
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'bad Content-Length')
+    if length > MAX_BODY:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f'body over {MAX_BODY} bytes')
+    body = await reader.readexactly(length) if length else b''
+    return method, target, headers, body
+
+
+async def write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    status = HTTPStatus(status)
+    writer.write(
+        f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+        f'Content-Type: application/json; charset=utf-8\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+        f'\r\n'.encode('latin-1') + body
+    )
+    await writer.drain()
+
+
+async def serve(args):
+    service = LookupService(args.db, workers=args.workers, cache_size=args.cache_size)
+    server = await asyncio.start_server(service.handle, args.host, args.port)
+    print(f"Serving {args.db} on http://{args.host}:{args.port} "
+          f"({args.workers} workers, cache {args.cache_size})", flush=True)
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    if hasattr(signal, 'SIGHUP'):
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(service.reload()))
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    watcher = asyncio.ensure_future(service.watch(args.reload_interval)) if args.reload_interval else None
+    try:
+        await stop.wait()
+    finally:
+        if watcher:
+            watcher.cancel()
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve dictionary lookups over HTTP')
+    parser.add_argument('--db', type=Path, default=DATABASE, help=f'Database (default: {DATABASE})')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port (default: 8080)')
+    parser.add_argument('--workers', type=int, default=min(8, os.cpu_count() or 1),
+                        help='SQLite worker threads and connections (default: CPUs, up to 8)')
+    parser.add_argument('--cache-size', type=int, default=10000,
+                        help='Cached responses (default: 10000, 0 = off)')
+    parser.add_argument('--reload-interval', type=float, default=2,
+                        help='Seconds between database file checks (default: 2, 0 = SIGHUP only)')
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Error: Database not found: {args.db}")
+        return 1
+
+    asyncio.run(serve(args))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Language detection and search-key normalization for lookups.
+
+Ports of the Go helpers the query engine uses on its input:
+
+- detect_language: DetectLanguage in core/detector/detect.go
+- to_hiragana / romaji_key: ToHiragana / RomajiKey in core/kana/kana.go
+- pinyin_key / has_tones: SearchKey / HasTones in core/pinyin/convert.go
+
+Must stay in sync with those. The ingest pipeline builds its keys with
+these same functions (data/kana.py, data/pinyin.py), so the Python
+engine probes exactly the keys ingest stored.
+"""
+
+import re
+
+# Katakana ァ..ヶ sit exactly 0x60 above hiragana ぁ..ゖ
+KATAKANA_TO_HIRAGANA = str.maketrans({chr(c): chr(c - 0x60) for c in range(0x30A1, 0x30F7)})
+
+# Macron/circumflex long vowels in typed Hepburn input fold to the base vowel
+LONG_VOWEL_TABLE = str.maketrans('āīūēōâîûêô', 'aiueoaiueo')
+
+# Tone mark of each vowel (index 0 = tone 1, index 4 = neutral)
+TONE_MARKS = {
+    'a': 'āáǎàa', 'e': 'ēéěèe', 'i': 'īíǐìi', 'o': 'ōóǒòo', 'u': 'ūúǔùu', 'ü': 'ǖǘǚǜü',
+    'A': 'ĀÁǍÀA', 'E': 'ĒÉĚÈE', 'I': 'ĪÍǏÌI', 'O': 'ŌÓǑÒO', 'U': 'ŪÚǓÙU', 'Ü': 'ǕǗǙǛÜ',
+}
+
+# Tone-marked vowels fold to their base letter, every form of ü to "v"
+# (the usual IME spelling)
+PINYIN_KEY_TABLE = str.maketrans({
+    marked: ('v' if base in 'üÜ' else base.lower())
+    for base, marks in TONE_MARKS.items()
+    for marked in marks
+})
+
+# Non-ASCII tone-marked vowels; plain ü/Ü carry no tone
+TONE_MARKED = frozenset(
+    marked for marks in TONE_MARKS.values() for marked in marks
+    if not marked.isascii() and marked not in 'üÜ'
+)
+
+NON_KEY_PATTERN = re.compile(r'[^a-z]')
+SYLLABIC_M_PATTERN = re.compile(r'm([bpm])')
+
+# Runs of one vowel: long vowels typed doubled (koohii) or stored doubled
+DOUBLED_VOWEL_PATTERN = re.compile(r'([aiueo])\1+')
+
+
+def detect_language(text: str) -> str:
+    """'ja' for any kana, 'en' for ASCII only, 'ambiguous' for Han without kana.
+
+    Returns 'unknown' for empty or other input.
+    """
+    if not text:
+        return 'unknown'
+
+    has_kana = has_cjk = has_ascii = False
+    for char in text:
+        if '぀' <= char <= 'ヿ':
+            has_kana = True
+        elif '一' <= char <= '鿿':
+            has_cjk = True
+        elif ' ' <= char <= '~':
+            has_ascii = True
+
+    if has_kana:
+        return 'ja'
+    if has_ascii and not has_cjk:
+        return 'en'
+    if has_cjk:
+        return 'ambiguous'
+    return 'unknown'
+
+
+def to_hiragana(text: str) -> str:
+    """Fold katakana to hiragana, leaving every other character untouched."""
+    return text.translate(KATAKANA_TO_HIRAGANA)
+
+
+def romaji_key(romaji: str) -> str:
+    """Normalize romaji (typed or generated) to the reading_romaji search key.
+
+    Lowercase letters only; syllabic m before b/p/m becomes n (shimbun →
+    shinbun); long vowels are collapsed so tōkyō, toukyou and tokyo all
+    match, and so do kōhī, koohii and the stored key of コーヒー.
+    """
+    key = NON_KEY_PATTERN.sub('', romaji.lower().translate(LONG_VOWEL_TABLE))
+    key = SYLLABIC_M_PATTERN.sub(r'n\1', key)
+    return DOUBLED_VOWEL_PATTERN.sub(r'\1', key.replace('ou', 'o'))
+
+
+def pinyin_key(pinyin: str) -> str:
+    """Normalize pinyin in any spelling to the toneless, spaceless pinyin_key.
+
+    "ni3 hao3", "nǐ hǎo", "Ni3hao3" and "nihao" all become "nihao".
+    """
+    text = pinyin.replace('u:', 'v').replace('U:', 'v')
+    return NON_KEY_PATTERN.sub('', text.translate(PINYIN_KEY_TABLE).lower())
+
+
+def has_tones(text: str) -> bool:
+    """True if text carries tone numbers or tone marks ("ni3hao3", "nǐ hǎo")."""
+    return any('1' <= char <= '5' or char in TONE_MARKED for char in text)
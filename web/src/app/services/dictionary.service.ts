@@ -29,16 +29,26 @@ export interface Example {
   english_text: string;
 }
 
+export interface Completion {
+  language: string;
+  text: string;
+  detail?: string;
+  rank: number;
+}
+
+// Autocomplete tuning, must match data/autocomplete.py
+const HOT_PREFIX_CHARS = 2;
+const TOP_COMPLETIONS = 10;
+const PREFIX_UPPER_BOUND = '\u{10FFFF}';
+
 interface JapaneseWord {
   id: number;
   headword: string;
   reading: string;
   is_common: boolean;
   frequency_rank: number | null;
-  jlpt_level: string | null;
+  jlpt_level: number | null;  // N-level number (5 = N5)
   stroke_count: number | null;
-  components: string | null;
-  stroke_svg: string | null;
   definitions: string[];
   examples: Example[];
 }
@@ -50,13 +60,21 @@ interface ChineseWord {
   pinyin: string;
   is_common: boolean;
   frequency_rank: number | null;
-  hsk_level: string | null;
+  hsk_level: number | null;
   stroke_count: number | null;
+  definitions: string[];
+  examples: Example[];
+}
+
+interface JapaneseDetails {
+  components: string | null;
+  stroke_svg: string | null;
+}
+
+interface ChineseDetails {
   components: string | null;
   decomposition: string | null;
   stroke_svg: string | null;
-  definitions: string[];
-  examples: Example[];
 }
 
 @Injectable({
@@ -65,6 +83,8 @@ interface ChineseWord {
 export class DictionaryService {
   private db: Database | null = null;
   private initPromise: Promise<void> | null = null;
+  private variants: Map<string, string> | null = null;
+  private hasHotResults: boolean | null = null;
 
   async initialize(): Promise<void> {
     if (this.initPromise) {
@@ -99,6 +119,11 @@ export class DictionaryService {
       throw new Error('Database not initialized. Call initialize() first.');
     }
 
+    const hot = this.hotResult(query);
+    if (hot) {
+      return hot;
+    }
+
     const lang = this.detectLanguage(query);
 
     const response: DictionaryResponse = {
@@ -127,6 +152,87 @@ export class DictionaryService {
     return response;
   }
 
+  /**
+   * Words containing a character with the given radical (水, 氵 or a
+   * Kangxi number), best rank first. Runs as indexed joins:
+   * radicals → kanji_components → char_index → words.
+   */
+  searchByRadical(radical: string, limit: number = 20): DictionaryResponse {
+    if (!this.db) {
+      throw new Error('Database not initialized. Call initialize() first.');
+    }
+
+    const response: DictionaryResponse = {
+      meta: {
+        input_language: 'radical',
+        query: radical
+      },
+      outputs: []
+    };
+
+    const key = radical.trim();
+    if (!key) {
+      return response;
+    }
+
+    for (const word of this.queryJapaneseByRadical(key, limit)) {
+      response.outputs.push(this.japaneseToOutput(word));
+    }
+    for (const word of this.queryChineseByRadical(key, limit)) {
+      response.outputs.push(this.chineseToOutput(word));
+    }
+
+    return response;
+  }
+
+  /**
+   * Typeahead suggestions for a prefix, best rank first.
+   * Short prefixes read precomputed slots; longer ones are a single
+   * range scan over the autocomplete_keys primary key.
+   */
+  complete(prefix: string, limit: number = TOP_COMPLETIONS): Completion[] {
+    if (!this.db) {
+      throw new Error('Database not initialized. Call initialize() first.');
+    }
+
+    const key = this.toHiragana(prefix.trim().toLowerCase());
+    if (!key) {
+      return [];
+    }
+
+    const hot = Array.from(key).length <= HOT_PREFIX_CHARS && limit <= TOP_COMPLETIONS;
+    const stmt = hot
+      ? this.db.prepare(`
+          SELECT lang, display, detail, rank_score
+          FROM autocomplete_top
+          WHERE prefix = ?
+          ORDER BY slot
+          LIMIT ?
+        `)
+      : this.db.prepare(`
+          SELECT lang, display, detail, rank_score
+          FROM autocomplete_keys
+          WHERE key >= ? AND key < ?
+          ORDER BY rank_score DESC, key
+          LIMIT ?
+        `);
+    stmt.bind(hot ? [key, limit] : [key, key + PREFIX_UPPER_BOUND, limit]);
+
+    const completions: Completion[] = [];
+    while (stmt.step()) {
+      const row = stmt.getAsObject();
+      completions.push({
+        language: row.lang as string,
+        text: row.display as string,
+        detail: (row.detail as string) || undefined,
+        rank: row.rank_score as number
+      });
+    }
+    stmt.free();
+
+    return completions;
+  }
+
   private detectLanguage(input: string): string {
     let hasHiragana = false;
     let hasKatakana = false;
@@ -163,11 +269,15 @@ export class DictionaryService {
     }
   }
 
-  private queryFromJapanese(query: string, response: DictionaryResponse): void {
-    const jaWords = this.queryJapanese(query);
+  private queryFromJapanese(query: string, response: DictionaryResponse): boolean {
+    let jaWords = this.queryJapanese(query);
+    if (jaWords.length === 0) {
+      // Conjugated input (食べました) resolves to its dictionary form
+      jaWords = this.queryJapaneseByInflection(query);
+    }
     const topJa = this.rankJapanese(jaWords);
 
-    if (topJa.length === 0) return;
+    if (topJa.length === 0) return false;
 
     const jaWord = topJa[0];
     response.outputs.push(this.japaneseToOutput(jaWord));
@@ -180,6 +290,7 @@ export class DictionaryService {
         response.outputs.push(this.chineseToOutput(topZh[0]));
       }
     }
+    return true;
   }
 
   private queryFromChinese(query: string, response: DictionaryResponse): void {
@@ -202,29 +313,99 @@ export class DictionaryService {
   }
 
   private queryAmbiguous(query: string, response: DictionaryResponse): void {
-    // Try Japanese first
-    const jaWords = this.queryJapanese(query);
-    if (jaWords.length > 0) {
-      this.queryFromJapanese(query, response);
-      return;
+    // Lookups are script-folded, so each is a single probe in any script;
+    // Japanese wins when both match
+    if (!this.queryFromJapanese(query, response)) {
+      this.queryFromChinese(query, response);
     }
+  }
 
-    // Try Chinese
-    const zhWords = this.queryChinese(query);
-    if (zhWords.length > 0) {
-      this.queryFromChinese(query, response);
+  /**
+   * Response precomputed at build time for a common query (see
+   * data/hot_results.py), keyed like hot_key there: trimmed, and lowercased
+   * if ASCII. Stored responses hold the CLI's top 5 per language, ordered
+   * like the LIMIT 1 queries below (exact spelling first, then rank_score,
+   * then id), so the first of each is what a cold lookup returns; only it
+   * is kept.
+   */
+  private hotResult(query: string): DictionaryResponse | null {
+    if (this.hasHotResults === null) {
+      const tables = this.db!.exec(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'hot_results'"
+      );
+      this.hasHotResults = tables.length > 0;
+    }
+    if (!this.hasHotResults) {
+      return null;
+    }
+
+    let key = query.trim();
+    if (/^[\x00-\x7f]*$/.test(key)) {
+      key = key.toLowerCase();
     }
+
+    const stmt = this.db!.prepare('SELECT payload FROM hot_results WHERE query_key = ?');
+    stmt.bind([key]);
+    const payload = stmt.step() ? stmt.getAsObject().payload as string : null;
+    stmt.free();
+    if (payload === null) {
+      return null;
+    }
+
+    const stored: DictionaryResponse = JSON.parse(payload);
+    const languages = new Set<string>();
+    return {
+      meta: { input_language: stored.meta.input_language, query: query },
+      outputs: stored.outputs.filter(output => {
+        if (languages.has(output.language)) {
+          return false;
+        }
+        languages.add(output.language);
+        return true;
+      })
+    };
+  }
+
+  /**
+   * Fold katakana to hiragana (ネコ → ねこ), like ToHiragana in core/kana.
+   */
+  private toHiragana(text: string): string {
+    return text.replace(/[\u30A1-\u30F6]/g, ch => String.fromCharCode(ch.charCodeAt(0) - 0x60));
+  }
+
+  /**
+   * Fold shinjitai / traditional / simplified characters to the canonical
+   * variant used by the script_key columns (see data/variants.py).
+   * char_variants is loaded on first use.
+   */
+  private scriptKey(text: string): string {
+    if (!this.variants) {
+      this.variants = new Map();
+      const stmt = this.db!.prepare('SELECT char, canonical FROM char_variants');
+      while (stmt.step()) {
+        const row = stmt.getAsObject();
+        this.variants.set(row.char as string, row.canonical as string);
+      }
+      stmt.free();
+    }
+
+    return Array.from(text, ch => this.variants!.get(ch) ?? ch).join('');
   }
 
   private queryJapanese(input: string): JapaneseWord[] {
     const stmt = this.db!.prepare(`
       SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
-             stroke_count, components, stroke_svg
+             stroke_count
       FROM japanese_words
-      WHERE headword = ? OR reading = ?
-      ORDER BY is_common DESC, frequency_rank ASC
+      WHERE id IN (
+        SELECT word_id FROM japanese_forms WHERE form IN (?, ?)
+        UNION
+        SELECT id FROM japanese_words WHERE script_key = ?
+      )
+      ORDER BY headword = ? DESC, rank_score DESC, id
+      LIMIT 1
     `);
-    stmt.bind([input, input]);
+    stmt.bind([input, this.toHiragana(input), this.scriptKey(input), input]);
 
     const words: JapaneseWord[] = [];
     while (stmt.step()) {
@@ -235,10 +416,39 @@ export class DictionaryService {
         reading: row.reading as string,
         is_common: row.is_common === 1,
         frequency_rank: row.frequency_rank as number | null,
-        jlpt_level: row.jlpt_level as string | null,
+        jlpt_level: row.jlpt_level as number | null,
+        stroke_count: row.stroke_count as number | null,
+        definitions: this.getJapaneseDefinitions(row.id as number),
+        examples: this.getExamples('ja', row.id as number)
+      });
+    }
+    stmt.free();
+
+    return words;
+  }
+
+  private queryJapaneseByInflection(surface: string): JapaneseWord[] {
+    const stmt = this.db!.prepare(`
+      SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
+             stroke_count
+      FROM japanese_words
+      WHERE id IN (SELECT word_id FROM japanese_inflections WHERE surface IN (?, ?))
+      ORDER BY rank_score DESC, id
+      LIMIT 1
+    `);
+    stmt.bind([surface, this.toHiragana(surface)]);
+
+    const words: JapaneseWord[] = [];
+    while (stmt.step()) {
+      const row = stmt.getAsObject();
+      words.push({
+        id: row.id as number,
+        headword: row.headword as string,
+        reading: row.reading as string,
+        is_common: row.is_common === 1,
+        frequency_rank: row.frequency_rank as number | null,
+        jlpt_level: row.jlpt_level as number | null,
         stroke_count: row.stroke_count as number | null,
-        components: row.components as string | null,
-        stroke_svg: row.stroke_svg as string | null,
         definitions: this.getJapaneseDefinitions(row.id as number),
         examples: this.getExamples('ja', row.id as number)
       });
@@ -253,22 +463,25 @@ export class DictionaryService {
     // Phase 1: Return only primary/exact matches
     const stmt = this.db!.prepare(`
       SELECT DISTINCT w.id, w.headword, w.reading, w.is_common, w.frequency_rank,
-             w.jlpt_level, w.stroke_count, w.components, w.stroke_svg
+             w.jlpt_level, w.stroke_count
       FROM japanese_words w
       JOIN japanese_definitions d ON w.id = d.word_id
-      WHERE LOWER(d.english_gloss) = LOWER(?)
-         OR LOWER(d.english_gloss) LIKE LOWER(?) || ' (%'
-         OR LOWER(d.english_gloss) LIKE LOWER(?) || ';%'
-         OR LOWER(d.english_gloss) LIKE '%;' || LOWER(?)
-         OR LOWER(d.english_gloss) LIKE '%; ' || LOWER(?) || ';%'
+      JOIN glosses g ON g.id = d.gloss_id
+      WHERE LOWER(g.text) = LOWER(?)
+         OR LOWER(g.text) LIKE LOWER(?) || ' (%'
+         OR LOWER(g.text) LIKE LOWER(?) || ';%'
+         OR LOWER(g.text) LIKE '%;' || LOWER(?)
+         OR LOWER(g.text) LIKE '%; ' || LOWER(?) || ';%'
       ORDER BY
+         w.rank_score DESC,
          CASE
-           WHEN LOWER(d.english_gloss) = LOWER(?) THEN 0
-           WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ' (%' THEN 1
-           WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ';%' THEN 2
+           WHEN LOWER(g.text) = LOWER(?) THEN 0
+           WHEN LOWER(g.text) LIKE LOWER(?) || ' (%' THEN 1
+           WHEN LOWER(g.text) LIKE LOWER(?) || ';%' THEN 2
            ELSE 3
          END,
-         w.is_common DESC, w.frequency_rank ASC
+         w.id
+      LIMIT 1
     `);
     stmt.bind([gloss, gloss, gloss, gloss, gloss, gloss, gloss, gloss]);
 
@@ -281,10 +494,45 @@ export class DictionaryService {
         reading: row.reading as string,
         is_common: row.is_common === 1,
         frequency_rank: row.frequency_rank as number | null,
-        jlpt_level: row.jlpt_level as string | null,
+        jlpt_level: row.jlpt_level as number | null,
+        stroke_count: row.stroke_count as number | null,
+        definitions: this.getJapaneseDefinitions(row.id as number),
+        examples: this.getExamples('ja', row.id as number)
+      });
+    }
+    stmt.free();
+
+    return words;
+  }
+
+  private queryJapaneseByRadical(radical: string, limit: number): JapaneseWord[] {
+    const byNumber = /^\d+$/.test(radical);
+    const stmt = this.db!.prepare(`
+      SELECT id, headword, reading, is_common, frequency_rank, jlpt_level,
+             stroke_count
+      FROM japanese_words
+      WHERE id IN (
+        SELECT ci.word_id
+        FROM kanji_components kc
+        JOIN char_index ci ON ci.char = kc.kanji AND ci.lang = 'ja'
+        WHERE kc.radical_number = ${byNumber ? '?' : '(SELECT number FROM radicals WHERE form = ?)'}
+      )
+      ORDER BY rank_score DESC, id
+      LIMIT ?
+    `);
+    stmt.bind([byNumber ? Number(radical) : radical, limit]);
+
+    const words: JapaneseWord[] = [];
+    while (stmt.step()) {
+      const row = stmt.getAsObject();
+      words.push({
+        id: row.id as number,
+        headword: row.headword as string,
+        reading: row.reading as string,
+        is_common: row.is_common === 1,
+        frequency_rank: row.frequency_rank as number | null,
+        jlpt_level: row.jlpt_level as number | null,
         stroke_count: row.stroke_count as number | null,
-        components: row.components as string | null,
-        stroke_svg: row.stroke_svg as string | null,
         definitions: this.getJapaneseDefinitions(row.id as number),
         examples: this.getExamples('ja', row.id as number)
       });
@@ -296,13 +544,15 @@ export class DictionaryService {
 
   private queryChinese(input: string): ChineseWord[] {
     const stmt = this.db!.prepare(`
-      SELECT id, simplified, traditional, pinyin, is_common, frequency_rank,
-             hsk_level, stroke_count, components, decomposition, stroke_svg
+      SELECT id, simplified, traditional, COALESCE(pinyin_marked, pinyin) AS pinyin,
+             is_common, frequency_rank,
+             hsk_level, stroke_count
       FROM chinese_words
-      WHERE simplified = ?
-      ORDER BY is_common DESC, frequency_rank ASC
+      WHERE script_key = ?
+      ORDER BY (simplified = ? OR traditional = ?) DESC, rank_score DESC, id
+      LIMIT 1
     `);
-    stmt.bind([input]);
+    stmt.bind([this.scriptKey(input), input, input]);
 
     const words: ChineseWord[] = [];
     while (stmt.step()) {
@@ -314,11 +564,47 @@ export class DictionaryService {
         pinyin: row.pinyin as string,
         is_common: row.is_common === 1,
         frequency_rank: row.frequency_rank as number | null,
-        hsk_level: row.hsk_level as string | null,
+        hsk_level: row.hsk_level as number | null,
+        stroke_count: row.stroke_count as number | null,
+        definitions: this.getChineseDefinitions(row.id as number),
+        examples: this.getExamples('zh', row.id as number)
+      });
+    }
+    stmt.free();
+
+    return words;
+  }
+
+  private queryChineseByRadical(radical: string, limit: number): ChineseWord[] {
+    const byNumber = /^\d+$/.test(radical);
+    const stmt = this.db!.prepare(`
+      SELECT id, simplified, traditional, COALESCE(pinyin_marked, pinyin) AS pinyin,
+             is_common, frequency_rank,
+             hsk_level, stroke_count
+      FROM chinese_words
+      WHERE id IN (
+        SELECT ci.word_id
+        FROM kanji_components kc
+        JOIN char_index ci ON ci.char = kc.kanji AND ci.lang = 'zh'
+        WHERE kc.radical_number = ${byNumber ? '?' : '(SELECT number FROM radicals WHERE form = ?)'}
+      )
+      ORDER BY rank_score DESC, id
+      LIMIT ?
+    `);
+    stmt.bind([byNumber ? Number(radical) : radical, limit]);
+
+    const words: ChineseWord[] = [];
+    while (stmt.step()) {
+      const row = stmt.getAsObject();
+      words.push({
+        id: row.id as number,
+        simplified: row.simplified as string,
+        traditional: row.traditional as string,
+        pinyin: row.pinyin as string,
+        is_common: row.is_common === 1,
+        frequency_rank: row.frequency_rank as number | null,
+        hsk_level: row.hsk_level as number | null,
         stroke_count: row.stroke_count as number | null,
-        components: row.components as string | null,
-        decomposition: row.decomposition as string | null,
-        stroke_svg: row.stroke_svg as string | null,
         definitions: this.getChineseDefinitions(row.id as number),
         examples: this.getExamples('zh', row.id as number)
       });
@@ -332,24 +618,27 @@ export class DictionaryService {
     // Strict word boundary matching - only exact matches or definitions starting with the word
     // Phase 1: Return only primary/exact matches
     const stmt = this.db!.prepare(`
-      SELECT DISTINCT w.id, w.simplified, w.traditional, w.pinyin, w.is_common,
-             w.frequency_rank, w.hsk_level, w.stroke_count, w.components,
-             w.decomposition, w.stroke_svg
+      SELECT DISTINCT w.id, w.simplified, w.traditional,
+             COALESCE(w.pinyin_marked, w.pinyin) AS pinyin, w.is_common,
+             w.frequency_rank, w.hsk_level, w.stroke_count
       FROM chinese_words w
       JOIN chinese_definitions d ON w.id = d.word_id
-      WHERE LOWER(d.english_gloss) = LOWER(?)
-         OR LOWER(d.english_gloss) LIKE LOWER(?) || ' (%'
-         OR LOWER(d.english_gloss) LIKE LOWER(?) || ';%'
-         OR LOWER(d.english_gloss) LIKE '%;' || LOWER(?)
-         OR LOWER(d.english_gloss) LIKE '%; ' || LOWER(?) || ';%'
+      JOIN glosses g ON g.id = d.gloss_id
+      WHERE LOWER(g.text) = LOWER(?)
+         OR LOWER(g.text) LIKE LOWER(?) || ' (%'
+         OR LOWER(g.text) LIKE LOWER(?) || ';%'
+         OR LOWER(g.text) LIKE '%;' || LOWER(?)
+         OR LOWER(g.text) LIKE '%; ' || LOWER(?) || ';%'
       ORDER BY
+         w.rank_score DESC,
          CASE
-           WHEN LOWER(d.english_gloss) = LOWER(?) THEN 0
-           WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ' (%' THEN 1
-           WHEN LOWER(d.english_gloss) LIKE LOWER(?) || ';%' THEN 2
+           WHEN LOWER(g.text) = LOWER(?) THEN 0
+           WHEN LOWER(g.text) LIKE LOWER(?) || ' (%' THEN 1
+           WHEN LOWER(g.text) LIKE LOWER(?) || ';%' THEN 2
            ELSE 3
          END,
-         w.is_common DESC, w.frequency_rank ASC
+         w.id
+      LIMIT 1
     `);
     stmt.bind([gloss, gloss, gloss, gloss, gloss, gloss, gloss, gloss]);
 
@@ -363,11 +652,8 @@ export class DictionaryService {
         pinyin: row.pinyin as string,
         is_common: row.is_common === 1,
         frequency_rank: row.frequency_rank as number | null,
-        hsk_level: row.hsk_level as string | null,
+        hsk_level: row.hsk_level as number | null,
         stroke_count: row.stroke_count as number | null,
-        components: row.components as string | null,
-        decomposition: row.decomposition as string | null,
-        stroke_svg: row.stroke_svg as string | null,
         definitions: this.getChineseDefinitions(row.id as number),
         examples: this.getExamples('zh', row.id as number)
       });
@@ -379,14 +665,17 @@ export class DictionaryService {
 
   private getJapaneseDefinitions(wordId: number): string[] {
     const stmt = this.db!.prepare(`
-      SELECT english_gloss FROM japanese_definitions WHERE word_id = ?
+      SELECT g.text FROM japanese_definitions d
+      JOIN glosses g ON g.id = d.gloss_id
+      WHERE d.word_id = ?
+      ORDER BY d.id
     `);
     stmt.bind([wordId]);
 
     const defs: string[] = [];
     while (stmt.step()) {
       const row = stmt.getAsObject();
-      defs.push(row.english_gloss as string);
+      defs.push(row.text as string);
     }
     stmt.free();
 
@@ -395,25 +684,66 @@ export class DictionaryService {
 
   private getChineseDefinitions(wordId: number): string[] {
     const stmt = this.db!.prepare(`
-      SELECT english_gloss FROM chinese_definitions WHERE word_id = ?
+      SELECT g.text FROM chinese_definitions d
+      JOIN glosses g ON g.id = d.gloss_id
+      WHERE d.word_id = ?
+      ORDER BY d.id
     `);
     stmt.bind([wordId]);
 
     const defs: string[] = [];
     while (stmt.step()) {
       const row = stmt.getAsObject();
-      defs.push(row.english_gloss as string);
+      defs.push(row.text as string);
     }
     stmt.free();
 
     return defs;
   }
 
+  // Components, decomposition and stroke SVG live in side tables so the
+  // word tables stay narrow; read them only for words being displayed
+  // (null when the word has no row or the column is NULL)
+  private getJapaneseDetails(wordId: number): JapaneseDetails {
+    const stmt = this.db!.prepare(`
+      SELECT components, stroke_svg FROM japanese_word_details
+      WHERE word_id = ?
+    `);
+    stmt.bind([wordId]);
+
+    const row: Record<string, unknown> = stmt.step() ? stmt.getAsObject() : {};
+    stmt.free();
+
+    return {
+      components: (row.components ?? null) as string | null,
+      stroke_svg: (row.stroke_svg ?? null) as string | null
+    };
+  }
+
+  private getChineseDetails(wordId: number): ChineseDetails {
+    const stmt = this.db!.prepare(`
+      SELECT components, decomposition, stroke_svg FROM chinese_word_details
+      WHERE word_id = ?
+    `);
+    stmt.bind([wordId]);
+
+    const row: Record<string, unknown> = stmt.step() ? stmt.getAsObject() : {};
+    stmt.free();
+
+    return {
+      components: (row.components ?? null) as string | null,
+      decomposition: (row.decomposition ?? null) as string | null,
+      stroke_svg: (row.stroke_svg ?? null) as string | null
+    };
+  }
+
   private getExamples(language: string, wordId: number): Example[] {
     const stmt = this.db!.prepare(`
-      SELECT source_text, english_text
-      FROM examples
-      WHERE language = ? AND word_id = ?
+      SELECT s.text AS source_text, COALESCE(s.english, '') AS english_text
+      FROM example_links l
+      JOIN sentences s ON s.id = l.sentence_id
+      WHERE l.lang = ? AND l.word_id = ?
+      ORDER BY l.score DESC
       LIMIT 5
     `);
     stmt.bind([language, wordId]);
@@ -488,10 +818,9 @@ export class DictionaryService {
         locale: 'ja-JP'
       },
       meta: {
-        jlpt_level: word.jlpt_level,
+        jlpt_level: word.jlpt_level !== null ? `N${word.jlpt_level}` : null,
         stroke_count: word.stroke_count,
-        components: word.components,
-        stroke_svg: word.stroke_svg
+        ...this.getJapaneseDetails(word.id)
       },
       examples: word.examples
     };
@@ -511,11 +840,9 @@ export class DictionaryService {
       },
       meta: {
         traditional: word.traditional,
-        hsk_level: word.hsk_level,
+        hsk_level: word.hsk_level !== null ? String(word.hsk_level) : null,
         stroke_count: word.stroke_count,
-        components: word.components,
-        decomposition: word.decomposition,
-        stroke_svg: word.stroke_svg
+        ...this.getChineseDetails(word.id)
       },
       examples: word.examples
     };